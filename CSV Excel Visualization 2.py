@@ -4,12 +4,15 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from chart_recommendation import SAMPLE_SIZE, estimate_nunique, sample_positions
+
 root = tk.Tk()
 root.title("Data Visualizer")
 root.geometry("800x600")
 
 df = None
 selected_fields = []  # Store selected fields globally
+column_types = {}  # Inferred type per column of the loaded file, so selecting fields never rescans them
 chart_type = tk.StringVar()
 
 def load_file():
@@ -21,6 +24,7 @@ def load_file():
                 df = pd.read_csv(file_path)
             elif file_path.lower().endswith(('.xlsx', '.xls')):
                 df = pd.read_excel(file_path)
+            column_types.clear()
             update_listbox()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load file: {e}")
@@ -31,12 +35,17 @@ def update_listbox():
         listbox_fields.insert(tk.END, column)
 
 def infer_data_type(col):
+    if col not in column_types:
+        column_types[col] = profile_data_type(col)
+    return column_types[col]
+
+def profile_data_type(col):
     if pd.api.types.is_numeric_dtype(df[col]):
         if pd.api.types.is_integer_dtype(df[col]):
             return 'Integer'
         elif pd.api.types.is_float_dtype(df[col]):
             return 'Decimal'
-    elif pd.api.types.is_categorical_dtype(df[col]) or df[col].nunique() < len(df[col]) / 2:
+    elif pd.api.types.is_categorical_dtype(df[col]) or estimate_nunique(df[col].iloc[sample_positions(len(df), SAMPLE_SIZE)], len(df)) < len(df[col]) / 2:
         return 'Categorical'
     elif pd.api.types.is_string_dtype(df[col]):
         return 'String'
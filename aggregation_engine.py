@@ -0,0 +1,216 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+AGGREGATION_METHODS = ('mean', 'sum', 'median', 'min', 'max', 'count')
+# Grouped summaries kept per loaded dataset
+CACHE_SIZE = 64
+# Box plot whiskers reach the furthest value within this many IQRs of the box, like Matplotlib
+WHISKER_RANGE = 1.5
+# Values per group used for approximate quartiles; smaller groups are always exact
+APPROX_SAMPLE_SIZE = 10_000
+
+
+def group_codes(keys):
+    """Factorize group keys once, sorted like groupby(sort=True); missing keys get code -1."""
+    codes, uniques = pd.factorize(keys, sort=True, use_na_sentinel=True)
+    return codes, pd.Index(uniques, name=keys.name)
+
+
+def summarize_column(codes, group_count, values):
+    """All aggregation methods of one Y column over pre-computed group codes.
+
+    Sums and counts come from np.bincount; one sort by (group, value) then gives
+    min, max and median of every group by position. Missing Y values are skipped
+    like pandas does, so an all-missing group has count 0, sum 0 and NaN elsewhere.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = (codes >= 0) & ~np.isnan(values)
+    group = codes[valid]
+    values = values[valid]
+
+    count = np.bincount(group, minlength=group_count)
+    total = np.bincount(group, weights=values, minlength=group_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+    minimum = np.full(group_count, np.nan)
+    maximum = np.full(group_count, np.nan)
+    median = np.full(group_count, np.nan)
+    if len(values):
+        # Sort by value, then stable-sort by group; small integer codes let NumPy use a radix sort
+        by_value = np.argsort(values)
+        narrow_group = group[by_value].astype(np.min_scalar_type(group_count))
+        ordered = values[by_value[np.argsort(narrow_group, kind='stable')]]
+        starts = np.concatenate(([0], np.cumsum(count)[:-1]))
+        present = count > 0
+        first = starts[present]
+        last = first + count[present] - 1
+        minimum[present] = ordered[first]
+        maximum[present] = ordered[last]
+        median[present] = (ordered[first + (count[present] - 1) // 2] + ordered[first + count[present] // 2]) / 2
+
+    return {'mean': mean, 'sum': total, 'median': median, 'min': minimum, 'max': maximum, 'count': count}
+
+
+def sorted_quantile(ordered, first, count, q):
+    """Linearly interpolated quantile q of groups stored contiguously and sorted in `ordered`."""
+    position = (count - 1) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, count - 1)
+    fraction = position - lower
+    return ordered[first + lower] * (1 - fraction) + ordered[first + upper] * fraction
+
+
+def box_statistics(codes, group_count, values, whis=WHISKER_RANGE, approximate=False, sample_size=APPROX_SAMPLE_SIZE, seed=0):
+    """Quartiles, whiskers and outliers of every group in one pass over pre-computed group codes.
+
+    Values are ordered by group once; quartiles are then read by position and
+    whiskers, min/max and outlier counts come from reduceat over each group's
+    slice. With approximate=True, groups larger than sample_size take their
+    quartiles from a uniform random sample of about sample_size values, which
+    avoids sorting every value; everything else stays exact. Groups without
+    values get NaN statistics and no outliers.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = (codes >= 0) & ~np.isnan(values)
+    group = codes[valid]
+    values = values[valid]
+
+    count = np.bincount(group, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(count)[:-1]))
+    present = count > 0
+    first = starts[present]
+    sizes = count[present]
+    stats = {key: np.full(group_count, np.nan) for key in ('min', 'q1', 'med', 'q3', 'max', 'whislo', 'whishi')}
+    stats['count'] = count
+    stats['outliers'] = np.zeros(group_count, dtype=np.int64)
+    stats['fliers'] = [np.empty(0) for _ in range(group_count)]
+    if not len(values):
+        return stats
+
+    narrow_group = group.astype(np.min_scalar_type(group_count))
+    if approximate:
+        # Keep each row with probability sample_size / group size, then sort only the sample
+        rng = np.random.default_rng(seed)
+        keep = rng.random(len(values)) * np.maximum(count[group], sample_size) < sample_size
+        sample_values, sample_group = values[keep], narrow_group[keep]
+        by_value = np.argsort(sample_values)
+        sample = sample_values[by_value[np.argsort(sample_group[by_value], kind='stable')]]
+        sample_count = np.bincount(sample_group, minlength=group_count)[present]
+        sample_first = np.concatenate(([0], np.cumsum(sample_count)[:-1]))
+        quartile_source = (sample, sample_first, np.maximum(sample_count, 1))
+        by_group = np.argsort(narrow_group, kind='stable')  # Small integer keys use a radix sort
+    else:
+        by_value = np.argsort(values)
+        by_group = by_value[np.argsort(narrow_group[by_value], kind='stable')]
+        quartile_source = (values[by_group], first, sizes)
+
+    for key, q in (('q1', 0.25), ('med', 0.5), ('q3', 0.75)):
+        stats[key][present] = sorted_quantile(*quartile_source, q)
+
+    ordered = values[by_group]
+    stats['min'][present] = np.minimum.reduceat(ordered, first)
+    stats['max'][present] = np.maximum.reduceat(ordered, first)
+
+    spread = whis * (stats['q3'] - stats['q1'])
+    low_fence = (stats['q1'] - spread)[group[by_group]]
+    high_fence = (stats['q3'] + spread)[group[by_group]]
+    inside = (ordered >= low_fence) & (ordered <= high_fence)
+    # Like matplotlib.cbook.boxplot_stats, whiskers never end inside the box
+    whislo = np.minimum.reduceat(np.where(inside, ordered, np.inf), first)
+    whishi = np.maximum.reduceat(np.where(inside, ordered, -np.inf), first)
+    stats['whislo'][present] = np.minimum(whislo, stats['q1'][present])
+    stats['whishi'][present] = np.maximum(whishi, stats['q3'][present])
+
+    outside = ~inside
+    stats['outliers'] = np.bincount(group[by_group][outside], minlength=group_count)
+    outlier_groups = np.split(ordered[outside], np.cumsum(stats['outliers'])[:-1])
+    stats['fliers'] = outlier_groups
+    return stats
+
+
+class AggregationEngine:
+    """Grouped aggregations for charts, memoized per (dataset version, X column, Y column).
+
+    Every method of a Y column is computed together, so switching between mean,
+    sum, median, min, max and count is a cache hit. Results are only memoized when
+    the caller passes a version; frames a chart has already reshaped pass None.
+    With a category_cube.CubeCache, versioned aggregations under category filters
+    are read from its cube instead of grouping the filtered rows.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, cubes=None):
+        self.max_entries = max_entries
+        self.cubes = cubes
+        self._summaries = OrderedDict()
+        self._codes = OrderedDict()
+
+    def _group_codes(self, data, x_col, version):
+        key = (version, x_col)
+        if version is not None and key in self._codes:
+            self._codes.move_to_end(key)
+            return self._codes[key]
+        result = group_codes(data[x_col])
+        if version is not None:
+            self._codes[key] = result
+            while len(self._codes) > self.max_entries:
+                self._codes.popitem(last=False)
+        return result
+
+    def summary(self, data, x_col, y_col, version=None):
+        key = (version, x_col, y_col)
+        if version is not None and key in self._summaries:
+            self._summaries.move_to_end(key)
+            return self._summaries[key]
+        codes, uniques = self._group_codes(data, x_col, version)
+        values = pd.to_numeric(data[y_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        result = (uniques, summarize_column(codes, len(uniques), values))
+        if version is not None:
+            self._summaries[key] = result
+            while len(self._summaries) > self.max_entries:
+                self._summaries.popitem(last=False)
+        return result
+
+    def aggregate(self, data, x_col, y_cols, method, version=None):
+        """Frame with x_col and one column per Y, like groupby(x_col, as_index=False)[y_cols].agg(method)."""
+        if method not in AGGREGATION_METHODS:
+            raise ValueError(f"Unknown aggregation method: {method}")
+        if isinstance(y_cols, str):
+            y_cols = [y_cols]
+        answered = self.cubes.aggregate(x_col, y_cols, method, version) if self.cubes is not None and version is not None else None
+        if answered is not None:
+            uniques, columns = answered
+        else:
+            columns = {}
+            uniques = None
+            for y_col in y_cols:
+                uniques, methods = self.summary(data, x_col, y_col, version)
+                columns[y_col] = methods[method]
+            if uniques is None:
+                uniques, _ = self._group_codes(data, x_col, version)
+        result = pd.DataFrame(columns, index=pd.RangeIndex(len(uniques)))
+        result.insert(0, x_col, uniques)
+        return result
+
+    def box_stats(self, data, x_col, y_col, version=None, approximate=False):
+        """(groups, box_statistics) of y_col per x_col value, memoized like summary()."""
+        key = (version, x_col, y_col, 'box', approximate)
+        if version is not None and key in self._summaries:
+            self._summaries.move_to_end(key)
+            return self._summaries[key]
+        codes, uniques = self._group_codes(data, x_col, version)
+        values = pd.to_numeric(data[y_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        result = (uniques, box_statistics(codes, len(uniques), values, approximate=approximate))
+        if version is not None:
+            self._summaries[key] = result
+            while len(self._summaries) > self.max_entries:
+                self._summaries.popitem(last=False)
+        return result
+
+    def clear(self):
+        self._summaries.clear()
+        self._codes.clear()
+        if self.cubes is not None:
+            self.cubes.clear()
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from filter_engine import CategoryIndex
+
+# Methods a cube answers; the median cannot be derived from per-combination totals
+CUBE_METHODS = ('mean', 'sum', 'min', 'max', 'count')
+# Cubes kept per loaded dataset; each holds one row order of the full dataset
+CACHE_SIZE = 4
+# Combination keys are int64, so the product of the dimension sizes must stay below this
+MAX_COMBINATIONS = 2 ** 62
+
+
+class CategoryCube:
+    """count/sum/min/max of value columns per combination of the values of some category columns.
+
+    The first dimension is the chart's X column, the others are the columns
+    filtered by category. The rows of the full dataset are sorted by their
+    combined category codes once, when the cube is built, and each value column
+    is reduced from that order with reduceat. A filtered aggregation then only
+    reads the combinations whose categories are selected and merges them per X
+    value, so changing the selection never rescans the rows. Missing categories
+    have their own code (the last of each dimension) and never match a filter.
+    """
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.sizes = tuple(len(index.uniques) + 1 for index in indexes)
+        codes = [np.where(index.codes >= 0, index.codes, size - 1) for index, size in zip(indexes, self.sizes)]
+        keys = np.ravel_multi_index(codes, self.sizes)
+        self.order = np.argsort(keys, kind='stable')
+        keys = keys[self.order]
+        self.starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else np.empty(0, dtype=np.int64)
+        self.cells = np.unravel_index(keys[self.starts], self.sizes)  # Category code of every combination, per dimension
+        self.rows = np.diff(np.append(self.starts, len(keys)))
+        self._stats = {}
+
+    def add_column(self, name, values):
+        """Reduce a numeric column aligned with the dataset; missing values are skipped like pandas does."""
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)[self.order]
+        present = ~np.isnan(values)
+        if len(self.starts):
+            stats = {'count': np.add.reduceat(present.astype(np.int64), self.starts),
+                     'sum': np.add.reduceat(np.where(present, values, 0.0), self.starts),
+                     # fmin/fmax skip NaN, so a combination is only NaN when all its values are
+                     'min': np.fmin.reduceat(values, self.starts),
+                     'max': np.fmax.reduceat(values, self.starts)}
+        else:
+            stats = {key: np.empty(0) for key in ('count', 'sum', 'min', 'max')}
+        self._stats[name] = stats
+        return stats
+
+    def has_column(self, name):
+        return name in self._stats
+
+    def aggregate(self, names, method, selections):
+        """(X values, {name: method per X value}) over the combinations matching selections.
+
+        selections holds one lookup table per dimension (CategoryIndex.lookup),
+        or None for a dimension that is not filtered. X values come out sorted,
+        like groupby(sort=True), and only those with at least one matching row.
+        """
+        if method not in CUBE_METHODS:
+            raise ValueError(f"Category cubes cannot compute the {method}.")
+        keep = np.ones(len(self.rows), dtype=bool)
+        for cells, lookup in zip(self.cells, selections):
+            if lookup is not None:
+                keep &= lookup[cells]
+        group = self.cells[0][keep]
+        group_count = self.sizes[0]
+        rows = np.bincount(group, weights=self.rows[keep], minlength=group_count)
+        present = np.flatnonzero(rows[:-1] > 0)  # The last code holds rows with a missing X value
+        uniques = self.indexes[0].uniques.take(present)
+        by_value = uniques.argsort()
+        uniques = uniques.take(by_value)
+        present = present[by_value]
+
+        columns = {}
+        for name in names:
+            stats = self._stats[name]
+            if method in ('min', 'max'):
+                values = np.full(group_count, np.nan)
+                (np.fmin if method == 'min' else np.fmax).at(values, group, stats[method][keep])
+            else:
+                count = np.bincount(group, weights=stats['count'][keep], minlength=group_count)
+                total = np.bincount(group, weights=stats['sum'][keep], minlength=group_count)
+                if method == 'count':
+                    values = count.astype(np.int64)
+                elif method == 'sum':
+                    values = total
+                else:
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        values = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+            columns[name] = values[present]
+        return uniques, columns
+
+
+class CubeCache:
+    """Category cubes over the full dataset of one FilterEngine, keyed by their dimensions.
+
+    A cube is built the first time a chart groups by an X column under a given
+    set of category-filtered columns; picking other categories of those columns
+    is then answered from it. Unfiltered views are left to the caller, whose
+    plain grouping is cheaper than building a cube over every row; so are filters
+    that are not category selections (ranges, masks), which a cube cannot slice.
+    """
+
+    def __init__(self, filters, max_entries=CACHE_SIZE):
+        self.filters = filters
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def _cube(self, dimensions):
+        cube = self._entries.get(dimensions)
+        if cube is not None:
+            self._entries.move_to_end(dimensions)
+            return cube
+        indexes = [self.filters.index_for(column, CategoryIndex) for column in dimensions]
+        if np.prod([len(index.uniques) + 1.0 for index in indexes]) >= MAX_COMBINATIONS:
+            return None
+        cube = CategoryCube(indexes)
+        self._entries[dimensions] = cube
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return cube
+
+    def aggregate(self, x_col, y_cols, method, version):
+        """(X values, {y: method per X value}) of the filtered view at version, or None when a cube cannot answer."""
+        filters = self.filters
+        if version != filters.version or method not in CUBE_METHODS or not filters.only_categories:
+            return None
+        dimensions = (x_col,) + tuple(sorted((column for column in filters.categories if column != x_col), key=str))
+        cube = self._cube(dimensions)
+        if cube is None:
+            return None
+        for y_col in y_cols:
+            if not cube.has_column(y_col):
+                cube.add_column(y_col, filters.original[y_col])
+        selections = [filters.index_for(column, CategoryIndex).lookup(filters.categories[column]) if column in filters.categories else None
+                      for column in dimensions]
+        return cube.aggregate(y_cols, method, selections)
+
+    def clear(self):
+        self._entries.clear()
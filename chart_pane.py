@@ -0,0 +1,171 @@
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from dashboard import draw_failure, draw_panel, draw_regression, draw_title, regression_label, regression_points, regression_summary
+from plot_helpers import STAIRS_MIN_BINS
+
+# Chart types whose artists can take new data in place; the others are redrawn
+IN_PLACE_CHARTS = ("Line", "Dual Axes", "Scatter Plot", "Histogram", "Bar", "Column")
+
+
+class ChartPane:
+    """One embedded figure that charts are drawn into and updated in place.
+
+    show() draws a prepared dashboard panel. When the next panel has the same
+    key (same chart type and fields, so only filters or aggregation changed) and
+    still fits the existing artists, they get the new data through set_data,
+    set_offsets or set_height instead of the figure being rebuilt. The
+    regression line is an animated overlay blitted onto a cached background, so
+    toggling it does not re-render the chart.
+    """
+
+    def __init__(self, master, figsize=(7, 5), dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.key = None
+        self.panel = None
+        self.artists = {}
+        self.overlay = []
+        self.overlay_visible = False
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def show(self, panel, key):
+        """Draw panel, updating the current chart in place when key matches; returns True if it was updated."""
+        updated = key == self.key and self._update(panel)
+        if updated:
+            self.panel = panel
+        else:
+            self._redraw(panel)
+            self.key = key
+        self.canvas.draw_idle()
+        return updated
+
+    def show_error(self, title, error):
+        self.clear(draw=False)
+        draw_failure(self.figure.add_subplot(), title, error)
+        self.canvas.draw_idle()
+
+    def clear(self, draw=True):
+        self.figure.clear()
+        self.key = None
+        self.panel = None
+        self.artists = {}
+        self.overlay = []
+        self.background = None
+        if draw:
+            self.canvas.draw_idle()
+
+    def set_overlay_visible(self, visible):
+        """Show or hide the regression overlay by blitting, without redrawing the chart."""
+        self.overlay_visible = visible
+        if not self.overlay or self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        if visible:
+            for artist in self.overlay:
+                artist.axes.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def _on_draw(self, event):
+        # Animated overlay artists are skipped by normal draws; keep the clean chart and paint them on top
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        if self.overlay and self.overlay_visible:
+            for artist in self.overlay:
+                artist.axes.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+
+    def _redraw(self, panel):
+        self.clear(draw=False)
+        ax = self.figure.add_subplot()
+        self.artists = draw_panel(ax, dict(panel, show_regression=False))
+        if panel.get('regression') is not None:
+            self.overlay = list(draw_regression(ax, panel['regression'], animated=True))
+        self.figure.tight_layout()
+        self.panel = panel
+
+    def _update(self, panel):
+        """Put panel's data into the existing artists; False when the chart has to be rebuilt instead."""
+        chart_type = panel['chart']
+        old = self.panel
+        if chart_type not in IN_PLACE_CHARTS or old is None or panel.get('error') or old.get('error'):
+            return False
+        # Seaborn draws its own artists and value labels are laid out once, so those charts are rebuilt, as are new settings
+        if panel['style'] != old['style'] or panel['style']['seaborn'] or panel['style']['value_labels']:
+            return False
+        if (panel.get('regression') is None) != (old.get('regression') is None):
+            return False
+        # Zoom handlers hold the rollup they were connected with, so lines that follow zoom are rebuilt
+        if panel.get('zoom') is not None or old.get('zoom') is not None:
+            return False
+        artists = self.artists
+
+        if chart_type in ("Line", "Dual Axes"):
+            # Line series each have their own X values; the two Dual Axes series share one
+            if chart_type == "Line":
+                new_lines = [(np.asarray(x), values) for _, x, values in panel['series']]
+                old_xs = [np.asarray(x) for _, x, _ in old['series']]
+            else:
+                new_lines = [(np.asarray(panel['x']), values) for _, values in panel['series']]
+                old_xs = [np.asarray(old['x'])] * len(old['series'])
+            if len(new_lines) != len(artists['lines']) or len(old_xs) != len(new_lines):
+                return False
+            for (x, _), old_x in zip(new_lines, old_xs):
+                if x.dtype != old_x.dtype:
+                    return False
+                # Text X values are positions on a categorical axis; new categories would leave stale ticks
+                if x.dtype == object and not np.array_equal(x, old_x):
+                    return False
+            for line, (x, values) in zip(artists['lines'], new_lines):
+                line.set_data(x, values)
+        elif chart_type == "Scatter Plot":
+            if ('counts' in panel) != ('image' in artists):
+                return False
+            if 'image' in artists:
+                image = artists['image']
+                image.set_data(np.ma.masked_equal(panel['counts'], 0))
+                image.set_extent(panel['extent'])
+                image.norm.vmax = max(int(panel['counts'].max()), 1)
+            else:
+                offsets = np.column_stack((panel['x'], panel['y']))
+                artists['points'].set_offsets(offsets)
+                # relim() ignores collections, so the data limits are rebuilt from the new points
+                ax = artists['axes'][0]
+                ax.ignore_existing_data_limits = True
+                ax.update_datalim(offsets)
+        elif chart_type == "Histogram":
+            if 'stairs' in artists:
+                if len(panel['counts']) < STAIRS_MIN_BINS:
+                    return False
+                artists['stairs'].set_data(panel['counts'], panel['edges'])
+            else:
+                bars = artists['bars']
+                if len(bars) != len(panel['counts']):
+                    return False
+                for rect, left, width, count in zip(bars, panel['edges'][:-1], np.diff(panel['edges']), panel['counts']):
+                    rect.set_x(left)
+                    rect.set_width(width)
+                    rect.set_height(count)
+        else:  # Bar and Column
+            if panel['labels'] != old['labels']:
+                return False
+            for rect, value in zip(artists['bars'], panel['values']):
+                if chart_type == "Bar":
+                    rect.set_height(value)
+                else:
+                    rect.set_width(value)
+
+        if panel.get('regression') is not None:
+            line, text = self.overlay
+            line.set_data(*regression_points(panel['regression']))
+            line.set_label(regression_label(panel['regression']))
+            text.set_text(regression_summary(panel['regression']))
+        ax = artists['axes'][0]
+        draw_title(ax, panel)
+        for axes in artists['axes']:
+            if chart_type != "Scatter Plot":
+                axes.relim()
+            axes.autoscale_view()
+        return True
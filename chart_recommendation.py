@@ -0,0 +1,172 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from column_stats import ColumnStats, is_categorical_like
+
+# Rows a recommendation looks at; larger datasets are profiled from a uniform sample of this size
+SAMPLE_SIZE = 50_000
+# Interleaved parts of the sample that each repeat a sampled recommendation; their agreement is its confidence
+CONFIDENCE_PARTS = 4
+# Recommendations kept per loaded dataset
+CACHE_SIZE = 64
+
+
+def recommend_chart_type(x_columns, y_columns, dataset, column_stats=None, row_count=None):
+    """Suggest a chart type for the selected fields from their dtypes, cardinality and correlation.
+
+    column_stats(column) returns an object with `nunique` (e.g. a ColumnStats);
+    pass a cached lookup to avoid recounting, otherwise statistics are computed
+    from dataset. When dataset is a sample, row_count is the size of the data it
+    was drawn from.
+    """
+    if column_stats is None:
+        column_stats = lambda column: ColumnStats(dataset[column])
+    if not x_columns or not y_columns:
+        return "Select appropriate data fields"
+
+    x_dtype = dataset[x_columns[0]].dtype
+    y_dtype = dataset[y_columns[0]].dtype
+    x_unique_count = column_stats(x_columns[0]).nunique
+    y_unique_count = column_stats(y_columns[0]).nunique
+    total_entries = len(dataset) if row_count is None else row_count
+
+    # Checking for single variable usage
+    if len(x_columns) == 1 and x_columns == y_columns:
+        if pd.api.types.is_numeric_dtype(x_dtype):
+            return "Histogram"
+        else:
+            return "Pie Chart" if x_unique_count < 20 else "Bar"
+
+    # Multi-variable interactions
+    if len(x_columns) > 1 or len(y_columns) > 1:
+        if all(dataset[col].dtype.kind in 'fi' for col in x_columns + y_columns):
+            correlation = dataset[x_columns + y_columns].corr()
+            # Check if high correlation exists
+            if (correlation.abs() > 0.75).any().any():
+                return "Line"  # Strong linear relationship
+            else:
+                return "Scatter Plot"  # To explore potential relationships and distributions
+
+    # Single X, multiple Y or vice versa
+    if len(x_columns) == 1 and len(y_columns) > 1:
+        if pd.api.types.is_numeric_dtype(x_dtype) and all(dataset[y].dtype.kind in 'fi' for y in y_columns):
+            return "Line"  # Time series or continuous relationships
+        else:
+            return "Stacked Bar"  # Categorical comparison across multiple Y variables
+
+    # Categorical X, Numeric Y
+    if is_categorical_like(x_dtype):
+        if y_unique_count <= 10:
+            return "Bar"
+        elif total_entries > 50:
+            return "Box Plot"
+        return "Bar"
+
+    # Numeric X, Categorical Y
+    if pd.api.types.is_numeric_dtype(x_dtype) and is_categorical_like(y_dtype):
+        if x_unique_count <= 10 and total_entries <= 20:
+            return "Pie Chart"
+        return "Line"  # To explore trends across categories
+
+    # Default for numeric types or mixed usage
+    return "Scatter Plot" if total_entries > 1000 else "Line"
+
+
+def sample_positions(length, size, seed=0):
+    """Sorted positions of a uniform sample of size rows out of length, without replacement."""
+    if length <= size:
+        return np.arange(length)
+    return np.sort(np.random.default_rng(seed).choice(length, size, replace=False))
+
+
+def estimate_nunique(values, total):
+    """Distinct values of a column of total rows, estimated from a uniform sample of it.
+
+    Values seen twice or more are counted once; each value seen only once stands
+    for sqrt(total / sample size) values, as in the GEE estimator of Charikar et
+    al. A sample holding every row gives the exact count.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    if len(values) >= total:
+        return len(uniques)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    singletons = np.count_nonzero(counts == 1)
+    estimate = np.sqrt(total / max(len(values), 1)) * singletons + np.count_nonzero(counts > 1)
+    return int(min(round(estimate), total))
+
+
+class SampledStats:
+    """Column statistics recommend_chart_type needs, estimated from a sample."""
+
+    def __init__(self, values, total):
+        self.nunique = estimate_nunique(values, total)
+
+
+class ChartRecommender:
+    """Chart recommendations for the filtered rows of a FilterEngine, from a bounded sample.
+
+    The rows are sampled once per filter version, so a recommendation reads at
+    most SAMPLE_SIZE rows of the selected columns and never computes a full
+    correlation or distinct count. Statistics a StatsCache already holds for the
+    current filters are used as they are. Each verdict is cached per (X fields,
+    Y fields, filter version) with its confidence: 1.0 when every row was read,
+    otherwise the share of CONFIDENCE_PARTS smaller samples that agree with it.
+    """
+
+    def __init__(self, filters, stats=None, sample_size=SAMPLE_SIZE, max_entries=CACHE_SIZE, seed=0):
+        self.filters = filters
+        self.stats = stats
+        self.sample_size = sample_size
+        self.max_entries = max_entries
+        self.seed = seed
+        self._rows = (None, None)
+        self._verdicts = OrderedDict()
+
+    def sample_rows(self):
+        """Positions in the loaded data of the sampled filtered rows, drawn once per filter version."""
+        version, rows = self._rows
+        if version != self.filters.version:
+            mask = self.filters.mask()
+            rows = sample_positions(self.filters.row_count(), self.sample_size, self.seed)
+            if mask is not None:
+                rows = np.flatnonzero(mask)[rows]
+            self._rows = (self.filters.version, rows)
+        return rows
+
+    def _column_stats(self, sample, total):
+        def lookup(column):
+            cached = self.stats.cached(column) if self.stats is not None else None
+            return cached if cached is not None else SampledStats(sample[column], total)
+        return lookup
+
+    def recommend(self, x_columns, y_columns):
+        """(chart type, confidence from 0 to 1, rows read) for the fields over the current filtered rows."""
+        key = (tuple(x_columns), tuple(y_columns), self.filters.version)
+        if key in self._verdicts:
+            self._verdicts.move_to_end(key)
+            return self._verdicts[key]
+
+        total = self.filters.row_count()
+        rows = self.sample_rows()
+        columns = list(dict.fromkeys(list(x_columns) + list(y_columns)))
+        # Column by column, so only the sampled rows are ever copied
+        sample = pd.DataFrame({column: self.filters.original[column].iloc[rows] for column in columns})
+        chart = recommend_chart_type(x_columns, y_columns, sample, self._column_stats(sample, total), row_count=total)
+        if len(rows) >= total:
+            confidence = 1.0
+        else:
+            parts = [sample.iloc[start::CONFIDENCE_PARTS] for start in range(CONFIDENCE_PARTS)]
+            agree = sum(recommend_chart_type(x_columns, y_columns, part, self._column_stats(part, total), row_count=total) == chart
+                        for part in parts)
+            confidence = agree / CONFIDENCE_PARTS
+        verdict = (chart, confidence, len(rows))
+        self._verdicts[key] = verdict
+        while len(self._verdicts) > self.max_entries:
+            self._verdicts.popitem(last=False)
+        return verdict
+
+    def clear(self):
+        self._rows = (None, None)
+        self._verdicts.clear()
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+NAT_VALUE = np.iinfo(np.int64).min
+# Distinct values kept for numeric and datetime columns; text columns keep all of them
+TOP_K = 20
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def dtype_class(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'boolean'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return 'categorical'
+    return 'other'
+
+
+def is_categorical_like(values):
+    """True for text-like columns: object, category or (Arrow) string dtypes."""
+    dtype = getattr(values, 'dtype', values)
+    return isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+class ColumnStats:
+    """Summary of one column, computed from a single factorization of its values."""
+
+    def __init__(self, series):
+        self.dtype = series.dtype
+        self.kind = dtype_class(series.dtype)
+        self.length = len(series)
+        self.min = None
+        self.max = None
+        self.quantiles = {}
+
+        if self.kind == 'numeric':
+            if isinstance(series.dtype, np.dtype):
+                values = series.to_numpy()
+                if values.dtype.kind == 'f':
+                    values = values[~np.isnan(values)]
+            else:  # Nullable extension types
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                values = values[~np.isnan(values)]
+            if len(values):
+                self.min, self.max = values.min().item(), values.max().item()
+                self.quantiles = dict(zip(QUANTILES, np.quantile(values, QUANTILES).tolist()))
+            codes, uniques = pd.factorize(values)
+        elif self.kind == 'datetime':
+            keys = np.asarray(series.array.asi8)
+            valid_rows = np.flatnonzero(keys != NAT_VALUE)
+            keys = keys[valid_rows]
+            codes, _ = pd.factorize(keys)
+            # Codes follow first appearance, so each unique is read back from the series to keep its unit and timezone
+            first_seen = np.unique(codes, return_index=True)[1]
+            uniques = pd.Index(series.take(valid_rows[first_seen]))
+            if len(keys):
+                self.min = series.iloc[valid_rows[np.argmin(keys)]]
+                self.max = series.iloc[valid_rows[np.argmax(keys)]]
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            codes = codes[codes >= 0]
+
+        self.count = len(codes)
+        self.null_count = self.length - self.count
+        counts = np.bincount(codes, minlength=len(uniques)) if len(uniques) else np.zeros(0, dtype=np.intp)
+        self.nunique = len(uniques)
+
+        if self.kind in ('numeric', 'datetime') and len(counts) > TOP_K:
+            top = np.argpartition(-counts, TOP_K - 1)[:TOP_K]
+        else:
+            top = np.arange(len(counts))
+        # Stable sort keeps first-seen order between ties, like value_counts()
+        top = top[np.argsort(-counts[top], kind='stable')]
+        self.value_counts = pd.Series(counts[top], index=pd.Index(uniques).take(top), name='count')
+
+    def top_values(self, k):
+        return self.value_counts.index[:k]
+
+
+class StatsCache:
+    """Column statistics for the loaded data, recomputed only when the filters change.
+
+    `get(column)` describes the currently filtered rows and is keyed by the
+    filter engine's version; `get(column, filtered=False)` describes the file as
+    loaded and never goes stale.
+    """
+
+    def __init__(self, filters):
+        self.filters = filters
+        self._stats = {}
+
+    def cached(self, column, filtered=True):
+        """Statistics of column if they were already computed, otherwise None; never scans the column."""
+        version = self.filters.version if filtered and self.filters.active else None
+        return self._stats.get((column, version))
+
+    def get(self, column, filtered=True):
+        version = self.filters.version if filtered and self.filters.active else None
+        key = (column, version)
+        stats = self._stats.get(key)
+        if stats is None:
+            values = self.filters.original[column]
+            if version is not None:
+                values = values[self.filters.mask()]
+            stats = ColumnStats(values)
+            # Entries for older filter versions can never be asked for again
+            self._stats = {k: v for k, v in self._stats.items() if k[1] is None or k[1] == version}
+            self._stats[key] = stats
+        return stats
+
+    def matches(self, data):
+        """True when data holds the current filtered rows, so its columns can be answered from the cache."""
+        return data.attrs.get("filter_version") == self.filters.version and len(data) == self.filters.row_count()
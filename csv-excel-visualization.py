@@ -1,35 +1,103 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
-import matplotlib.dates as mdates
 import seaborn as sns
 from tkinter import filedialog, messagebox, simpledialog, ttk, Listbox, MULTIPLE, IntVar, StringVar, Checkbutton, Scale, Toplevel
 import tkinter as tk
 import numpy as np
-from scipy.stats import norm, skew, linregress
 from PIL import Image, ImageTk
-from dateutil.parser import parse
-import itertools
+import functools
+import io
 import os
-
-# GUI components
-root = tk.Tk()
-root.title("CSV/Excel Data Visualizer V1.5.4.0519.3")
-
-global x_selected_fields, y_selected_fields, dataset, original_dataset, last_file_path
+import queue
+import threading
+from data_loading import read_dataset, read_folder, open_lazy_dataset, list_sheets, LazyDataset, LoadCancelled, FOLDER_PATTERN
+from filter_engine import CategoryIndex, FilterEngine
+from column_stats import ColumnStats, StatsCache, is_categorical_like
+from chart_recommendation import ChartRecommender
+from aggregation_engine import AggregationEngine
+from category_cube import CubeCache
+from plot_helpers import DEFAULT_POINT_BUDGET
+from histogram_engine import HistogramCache
+from top_k import CategoryCounts
+from time_rollups import TIME_LEVELS, RollupCache, suggest_level
+from dashboard import (ALL_CHART_TYPES, DASHBOARD_PANELS, DEFAULT_OPTIONS, OUTPUT_FORMATS, THUMBNAIL_WIDTH, draw_panel, prepare_panel,
+                       prepare_panels, render_panels, render_charts_to_folder, format_report)
+from chart_pane import ChartPane
+from session import SESSION_SUFFIX, SessionError, filter_state, load_snapshot, read_session, restore_filters, save_session
+
+global x_selected_fields, y_selected_fields, original_dataset, dataset_filters, last_file_path, last_source_options
 x_selected_fields = []
 y_selected_fields = []
-dataset = pd.DataFrame()
-display_skew = IntVar()
-display_aggression = IntVar()
-original_dataset = dataset.copy()
+original_dataset = pd.DataFrame()  # As loaded from disk; filters never modify it
+dataset_filters = FilterEngine(original_dataset)
+column_stats = StatsCache(dataset_filters)
+recommender = ChartRecommender(dataset_filters, column_stats)
+aggregations = AggregationEngine(cubes=CubeCache(dataset_filters))
+histograms = HistogramCache()
+time_rollups = RollupCache()
 last_file_path = None
+# Reader keywords the last dataset was loaded with (folder pattern, workbook sheets), saved with sessions
+last_source_options = {}
+active_load = None  # (thread, cancel_event) of the load currently running in the background
+active_render = None  # Thread rendering a dashboard or a chart batch, if any
+# (chart type, X fields, Y fields, dialog answers) of the chart in the embedded pane, redrawn when the filters change
+embedded_chart = None
+
+def current_dataset(columns=None):
+    """Filtered view of the loaded data, only materialized when a chart asks for it."""
+    # Shallow copy: chart functions reassign columns and must not alter the cached view
+    data = dataset_filters.view(columns).copy(deep=False)
+    data.attrs["filter_version"] = dataset_filters.version
+    return data
 
-def ask_for_histogram_customization(data):
-    # Determine the default values based on the data
-    data_min, data_max = data.min(), data.max()
-    bin_width = 2 * (np.percentile(data, 75) - np.percentile(data, 25)) * len(data) ** (-1/3)
-    default_bins = max(1, int((data_max - data_min) / bin_width))
+def view_version(data, columns):
+    """Filter version when data holds the untouched current filtered view of columns, else None."""
+    if not column_stats.matches(data):
+        return None
+    for column in columns:
+        # A chart that re-bucketed a column (e.g. datetimes to periods) changes its dtype and falls through
+        if column not in original_dataset.columns or data[column].dtype != original_dataset.dtypes[column]:
+            return None
+    return dataset_filters.version
+
+def chart_column_stats(data, column):
+    """Statistics for a chart column, from the shared cache when data is the current filtered view."""
+    if view_version(data, [column]) is not None:
+        return column_stats.get(column)
+    return ColumnStats(data[column])
+
+def selected_columns():
+    return list(dict.fromkeys(x_selected_fields + y_selected_fields))
+
+def line_point_budget():
+    """Points per line before Line/Area/Dual Axes charts are downsampled, or None when switched off."""
+    if not downsample_var.get():
+        return None
+    try:
+        return max(3, int(point_budget_var.get()))
+    except ValueError:
+        return DEFAULT_POINT_BUDGET
+
+def should_stream_histogram(column):
+    """True when a histogram can be read from disk in chunks instead of loading the column."""
+    return (isinstance(original_dataset, LazyDataset) and original_dataset.is_csv
+            and not dataset_filters.active and column not in original_dataset.loaded)
+
+def histogram_summary(plot_data, column):
+    """Histogram statistics of a column, cached per filter version.
+
+    plot_data is None when the column should be streamed from disk (see should_stream_histogram).
+    """
+    if plot_data is None:
+        return histograms.get((column, "stream"), lambda: original_dataset.column_chunks(column))
+    values = plot_data[column]
+    version = view_version(plot_data, [column])
+    return histograms.get(None if version is None else (column, version), lambda: [values.to_numpy(dtype=np.float64, na_value=np.nan)])
+
+def ask_for_histogram_customization(summary):
+    # Determine the default values based on the precomputed summary
+    data_min, data_max = summary.min, summary.max
+    default_bins = summary.default_bin_count()
 
     if enable_customization.get():
         while True:
@@ -71,14 +139,32 @@ def ask_for_bar_customization():
             if order is None:
                 return None, None  # User cancelled
 
-            max_items = simpledialog.askinteger("Bar - Number of Items", "Enter the number of top items to display (Max is {}):".format(len(dataset)), parent=root)
-            if max_items is None or max_items < 1 or max_items > len(dataset):
+            row_count = dataset_filters.row_count()
+            max_items = simpledialog.askinteger("Bar - Number of Items", "Enter the number of top items to display (Max is {}):".format(row_count), parent=root)
+            if max_items is None or max_items < 1 or max_items > row_count:
                 messagebox.showerror("Bar - Error", "Invalid number of items. Please enter a valid number.", parent=root)
                 continue
 
             return order, max_items
     else:
-        return 'desc', min(len(dataset), 10)  # Default order and number of items
+        return 'desc', min(dataset_filters.row_count(), 10)  # Default order and number of items
+
+def suggest_time_level(data, x_col):
+    """Level to suggest for a datetime X axis, from the span of its values; no rollup is built just to ask."""
+    values = data[x_col]
+    return suggest_level(values.min(), values.max(), line_point_budget() or DEFAULT_POINT_BUDGET)
+
+def ask_for_time_granularity(suggested, levels=TIME_LEVELS):
+    """Ask which time bucket to group a datetime X axis by; None plots every timestamp."""
+    while True:
+        answer = simpledialog.askstring("Datetime Aggregation", f"Group by {', '.join(levels)}, or leave blank to use every timestamp:",
+                                        initialvalue=suggested, parent=root)
+        if not answer or not answer.strip():
+            return None
+        level = answer.strip().capitalize()
+        if level in levels:
+            return level
+        messagebox.showerror("Datetime Aggregation", f"Please enter one of: {', '.join(levels)}.", parent=root)
 
 def filter_data():
     selected_indices = x_axis_listbox.curselection()
@@ -92,7 +178,7 @@ def filter_data():
 
     for index in selected_indices:
         field = x_axis_listbox.get(index)
-        dtype = dataset[field].dtype
+        dtype = original_dataset[field].dtype
 
         frame = ttk.LabelFrame(filter_window, text=f"Filter {field} - {dtype}")
         frame.pack(padx=10, pady=5, fill='x', expand=True)
@@ -100,11 +186,12 @@ def filter_data():
         if dtype.kind in 'O':  # Object (treat as categorical)
             lb = Listbox(frame, selectmode=MULTIPLE, width=50, height=4, exportselection=False)
             lb.pack(side="top", fill="x", expand=True)
-            for value in sorted(dataset[field].unique()):
+            for value in sorted(column_stats.get(field, filtered=False).value_counts.index):
                 lb.insert(tk.END, value)
             entries[field] = lb
         elif dtype.kind in 'iuf' or dtype.kind == 'M':  # Numeric or Datetime
-            current_min, current_max = dataset[field].min(), dataset[field].max()
+            stats = column_stats.get(field, filtered=False)
+            current_min, current_max = stats.min, stats.max
             min_label = ttk.Label(frame, text="Min value:")
             min_label.pack(side="top")
             min_entry = ttk.Entry(frame, width=15)
@@ -120,43 +207,36 @@ def filter_data():
             entries[field] = (min_entry, max_entry)
 
     def apply_filters():
-        global dataset
-        conditions = []
-        active_filters = []
-
+        # Only the columns shown in this window are recomputed; other filters keep their cached masks
         for field, entry in entries.items():
-            dtype = dataset[field].dtype
             if isinstance(entry, Listbox):  # Categorical
                 selected = [entry.get(idx) for idx in entry.curselection()]
                 if selected:
-                    conditions.append(dataset[field].isin(selected))
-                    active_filters.append(f"{field} in ({', '.join(selected)})")
+                    dataset_filters.set_categories(field, selected)
+                else:
+                    dataset_filters.clear(field)
             else:  # Numeric or Datetime
-                min_val, max_val = float(entry[0].get()), float(entry[1].get())
-                conditions.append((dataset[field] >= min_val) & (dataset[field] <= max_val))
-                active_filters.append(f"{field} between {min_val} and {max_val}")
-
-        if conditions:
-            combined_condition = conditions[0]
-            for cond in conditions[1:]:
-                combined_condition &= cond
-            dataset = dataset.loc[combined_condition]
-
-        update_dropdowns(dataset)
-        filter_label.config(text="Active Filters: " + "; ".join(active_filters) if active_filters else "No active filters")
+                try:
+                    if original_dataset[field].dtype.kind == 'M':
+                        min_val, max_val = pd.Timestamp(entry[0].get()), pd.Timestamp(entry[1].get())
+                    else:
+                        min_val, max_val = float(entry[0].get()), float(entry[1].get())
+                except ValueError:
+                    messagebox.showerror("Filter Error", f"Please enter valid min/max values for {field}.", parent=filter_window)
+                    return
+                dataset_filters.set_range(field, min_val, max_val)
+
+        refresh_filter_label()
+        refresh_embedded_chart()
+        if dataset_filters.row_count() == 0:
+            messagebox.showinfo("Update", "The dataset is empty after filtering.", parent=filter_window)
 
     def reset_filters():
         if last_file_path:
-            try:
-                if last_file_path.endswith('.csv'):
-                    dataset = pd.read_csv(last_file_path)
-                else:
-                    dataset = pd.read_excel(last_file_path)
-                update_dropdowns(dataset)
-                filter_label.config(text="No active filters")
-                filter_window.destroy()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to reload file: {str(e)}")
+            dataset_filters.reset()
+            refresh_filter_label()
+            refresh_embedded_chart()
+            filter_window.destroy()
         else:
             messagebox.showinfo("Reset Info", "No file has been loaded yet.")
 
@@ -166,19 +246,287 @@ def filter_data():
     reset_button = ttk.Button(filter_window, text="Reset Filters", command=reset_filters)
     reset_button.pack(side="right", padx=5, pady=10)
 
-def load_file():
-    global last_file_path, dataset  # Include dataset if you modify it globally
-    file_path = filedialog.askopenfilename(filetypes=[("CSV and Excel Files", "*.csv;*.xlsx")])
-    if file_path:
-        last_file_path = file_path  # Update last_file_path
+def set_file_buttons(state):
+    """Enable or disable every button that starts a background load or save."""
+    for button in (load_button, load_folder_button, save_session_button, open_session_button):
+        button.config(state=state)
+
+def start_background_load(file_path, on_loaded, title="Loading File", reader=read_dataset, action="read", failure="Failed to load file"):
+    """Run reader(file_path) on a worker thread and hand its result to on_loaded on the Tk thread.
+
+    Loads and session saves share this path; action names what the progress
+    counts ("read", "written") and failure starts the error message.
+    """
+    global active_load
+    if active_load is not None:
+        messagebox.showinfo("Load Info", "A file is already being loaded or saved. Cancel it first or wait for it to finish.")
+        return
+
+    cancel_event = threading.Event()
+    messages = queue.Queue()
+
+    progress_window = tk.Toplevel(root)
+    progress_window.title(title)
+    progress_window.transient(root)
+    progress_window.resizable(False, False)
+    ttk.Label(progress_window, text=os.path.basename(file_path)).pack(padx=10, pady=(10, 2))
+    progress_bar = ttk.Progressbar(progress_window, orient="horizontal", length=320, mode="determinate", maximum=100)
+    progress_bar.pack(padx=10, pady=5)
+    status_label = ttk.Label(progress_window, text="Starting...")
+    status_label.pack(padx=10, pady=2)
+
+    def cancel_load():
+        cancel_event.set()
+        status_label.config(text="Cancelling...")
+        cancel_button.config(state=tk.DISABLED)
+
+    cancel_button = ttk.Button(progress_window, text="Cancel", command=cancel_load)
+    cancel_button.pack(pady=(5, 10))
+    progress_window.protocol("WM_DELETE_WINDOW", cancel_load)
+
+    def report_progress(bytes_read, total_bytes, rows_read):
+        messages.put(("progress", bytes_read, total_bytes, rows_read))
+
+    def worker():
         try:
-            if file_path.endswith(".csv"):
-                data = pd.read_csv(file_path)
-            else:
-                data = pd.read_excel(file_path)
-            update_dropdowns(data)
+            data = reader(file_path, progress_callback=report_progress, cancel_event=cancel_event)
+            messages.put(("done", data))
+        except LoadCancelled:
+            messages.put(("cancelled",))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file: {str(e)}")
+            messages.put(("error", e))
+
+    def finish():
+        global active_load
+        active_load = None
+        set_file_buttons(tk.NORMAL)
+        progress_window.destroy()
+
+    def poll_messages():
+        try:
+            while True:
+                message = messages.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, bytes_read, total_bytes, rows_read = message
+                    if total_bytes:
+                        if str(progress_bar["mode"]) != "determinate":
+                            progress_bar.stop()
+                            progress_bar.config(mode="determinate")
+                        progress_bar["value"] = 100.0 * bytes_read / total_bytes
+                        status_label.config(text=f"{bytes_read / 1e6:,.1f} of {total_bytes / 1e6:,.1f} MB {action}, {rows_read:,} rows")
+                    else:
+                        progress_bar.config(mode="indeterminate")
+                        progress_bar.start(20)
+                        status_label.config(text="Reading file..." if action == "read" else "Working...")
+                elif kind == "done":
+                    finish()
+                    on_loaded(message[1])
+                    return
+                elif kind == "cancelled":
+                    finish()
+                    return
+                elif kind == "error":
+                    finish()
+                    messagebox.showerror("Error", f"{failure}: {str(message[1])}")
+                    return
+        except queue.Empty:
+            pass
+        root.after(100, poll_messages)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    active_load = (thread, cancel_event)
+    set_file_buttons(tk.DISABLED)
+    thread.start()
+    root.after(100, poll_messages)
+
+def refresh_filter_label():
+    if dataset_filters.active:
+        rows = f" ({dataset_filters.row_count():,} of {len(original_dataset):,} rows)"
+        filter_label.config(text="Active Filters: " + "; ".join(dataset_filters.descriptions.values()) + rows)
+    else:
+        filter_label.config(text="No active filters")
+
+def show_dataset_info(file_path, data):
+    if isinstance(data, LazyDataset):
+        dataset_info_label.config(text=f"{os.path.basename(file_path)}: {len(data.columns)} columns, loaded on demand")
+        return
+    info = f"{os.path.basename(file_path)}: {len(data):,} rows, {len(data.columns)} columns"
+    if data.attrs.get("source_files"):
+        info += f" from {data.attrs['source_files']:,} files"
+    memory = data.attrs.get("memory_usage")
+    if memory:
+        info += f", {memory['after'] / 1e6:,.1f} MB in memory"
+        if memory["before"] > memory["after"]:
+            info += f" (was {memory['before'] / 1e6:,.1f} MB before dtype optimization)"
+    dataset_info_label.config(text=info)
+
+def ask_for_sheets(file_path, sheets, multiple):
+    """Let the user pick the workbook sheets to load; returns their names, or None when cancelled."""
+    dialog = tk.Toplevel(root)
+    dialog.title("Select Sheets" if multiple else "Select Sheet")
+    dialog.transient(root)
+    dialog.grab_set()
+    hint = "Select one or more sheets; they are stacked with a Sheet column." if multiple else "Select the sheet to load."
+    ttk.Label(dialog, text=f"{os.path.basename(file_path)}\n{hint}").pack(padx=10, pady=(10, 5))
+    sheet_listbox = Listbox(dialog, selectmode=MULTIPLE if multiple else tk.BROWSE, width=40, height=min(len(sheets), 12), exportselection=False)
+    sheet_listbox.pack(padx=10, pady=5, fill="both", expand=True)
+    for sheet in sheets:
+        sheet_listbox.insert(tk.END, sheet)
+    sheet_listbox.selection_set(0)
+    chosen = []
+
+    def confirm():
+        chosen.extend(sheets[idx] for idx in sheet_listbox.curselection())
+        if not chosen:
+            messagebox.showwarning("Sheet Warning", "Select at least one sheet.", parent=dialog)
+            return
+        dialog.destroy()
+
+    ttk.Button(dialog, text="Load", command=confirm).pack(side="left", padx=10, pady=10)
+    ttk.Button(dialog, text="Cancel", command=dialog.destroy).pack(side="right", padx=10, pady=10)
+    dialog.wait_window()
+    return chosen or None
+
+def dataset_loaded(file_path, data, source_options=None):
+    global last_file_path, last_source_options, embedded_chart
+    last_file_path = file_path  # Only remember files that actually loaded
+    last_source_options = source_options or {}
+    update_dropdowns(data)
+    show_dataset_info(file_path, data)
+    embedded_chart = None
+    chart_pane.clear()
+
+def load_file():
+    file_path = filedialog.askopenfilename(filetypes=[("CSV and Excel Files", "*.csv;*.xlsx;*.xls")])
+    if file_path:
+        on_loaded = functools.partial(dataset_loaded, file_path)
+
+        lazy = lazy_loading_var.get()
+        reader = open_lazy_dataset if lazy else read_dataset
+        if not file_path.lower().endswith(".csv"):
+            try:
+                sheets = list_sheets(file_path)  # Only reads the workbook's index, not the sheets
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to open workbook: {str(e)}")
+                return
+            if len(sheets) > 1:
+                chosen = ask_for_sheets(file_path, sheets, multiple=not lazy)
+                if chosen is None:
+                    return
+                if chosen != sheets[:1]:  # The first sheet alone is the default and shares its cache entry
+                    reader = functools.partial(open_lazy_dataset, sheet=chosen[0]) if lazy else functools.partial(read_dataset, sheets=chosen)
+                    if not lazy:
+                        on_loaded = functools.partial(dataset_loaded, file_path, source_options={"sheets": chosen})
+
+        start_background_load(file_path, on_loaded, reader=reader)
+
+def load_folder():
+    folder = filedialog.askdirectory(title="Select a Folder of CSV/Excel Files")
+    if not folder:
+        return
+    pattern = simpledialog.askstring("Load Folder", "Files to load (patterns separated by ';'):", initialvalue=FOLDER_PATTERN, parent=root)
+    if pattern:
+        # Every matching file is parsed in parallel and stacked, with a column naming each row's file
+        start_background_load(folder, functools.partial(dataset_loaded, folder, source_options={"pattern": pattern}), title="Loading Folder",
+                              reader=functools.partial(read_folder, pattern=pattern))
+
+def session_variables():
+    """Tk variables saved with a session, by name."""
+    return {"use_seaborn": use_seaborn, "title_font_size": title_font_size_var, "x_axis_font_size": x_axis_font_size_var,
+            "y_axis_font_size": y_axis_font_size_var, "value_label_font_size": value_label_font_size_var,
+            "x_tick_label_rotation": x_tick_label_rotation_var, "y_tick_label_rotation": y_tick_label_rotation_var,
+            "chart_size": chart_size, "generate_all": generate_all_var, "display_aggression": display_aggression,
+            "display_skew": display_skew, "display_values": display_values, "enable_customization": enable_customization,
+            "aggregation_method": aggregation_method_var, "downsample": downsample_var, "point_budget": point_budget_var,
+            "approximate_quantiles": approximate_quantiles_var, "embed_chart": embed_chart_var, "lazy_loading": lazy_loading_var}
+
+def save_session_file():
+    if not last_file_path:
+        messagebox.showinfo("Session Info", "Load a file before saving a session.")
+        return
+    session_path = filedialog.asksaveasfilename(defaultextension=SESSION_SUFFIX, filetypes=[("Visualizer Sessions", f"*{SESSION_SUFFIX}")])
+    if not session_path:
+        return
+    ui_state = {"x_fields": x_selected_fields, "y_fields": y_selected_fields, "chart_type": chart_type_dropdown.get(),
+                "settings": {name: variable.get() for name, variable in session_variables().items()},
+                "source_options": last_source_options}
+    # Datasets loaded on demand are reopened from their source; anything else is snapshotted for a memory-mapped restore
+    lazy = (original_dataset.file_path, original_dataset.sheet) if isinstance(original_dataset, LazyDataset) else None
+    # The filters are read here, on the Tk thread; the snapshot is written by a worker with progress and Cancel
+    writer = functools.partial(save_session, data=original_dataset, filters=filter_state(dataset_filters), ui_state=ui_state,
+                               source=last_file_path, lazy=lazy)
+
+    def saved(written):
+        messagebox.showinfo("Session Saved", "Saved " + ", ".join(os.path.basename(path) for path in written))
+
+    start_background_load(session_path, saved, title="Saving Session", reader=writer, action="written", failure="Failed to save the session")
+
+def open_session_file():
+    session_path = filedialog.askopenfilename(filetypes=[("Visualizer Sessions", f"*{SESSION_SUFFIX}")])
+    if not session_path:
+        return
+    try:
+        session = read_session(session_path)
+    except SessionError as e:
+        messagebox.showerror("Session Error", str(e))
+        return
+    if session.get("snapshot"):
+        # Converting the mapped snapshot still reads every column, so it runs on the worker like a load
+        def read_snapshot(path, progress_callback, cancel_event):
+            progress_callback(0, None, 0)
+            return load_snapshot(path, session)
+
+        start_background_load(session_path, functools.partial(session_loaded, session_path, session), title="Restoring Session",
+                              reader=read_snapshot, failure="Failed to restore the session")
+        return
+
+    # No snapshot: the dataset was loaded on demand, or pyarrow was missing when the session was saved
+    lazy = session.get("lazy")
+    source = lazy["path"] if lazy else session.get("source")
+    if not source or not os.path.exists(source):
+        messagebox.showerror("Session Error", f"The session's source {source} no longer exists.")
+        return
+    if lazy:
+        reader = functools.partial(open_lazy_dataset, sheet=lazy["sheet"])
+    else:
+        # Reread with the folder pattern or workbook sheets the dataset was first loaded with
+        options = (session.get("ui") or {}).get("source_options") or {}
+        reader = functools.partial(read_folder if os.path.isdir(source) else read_dataset, **options)
+    start_background_load(source, functools.partial(session_loaded, session_path, session), title="Restoring Session", reader=reader,
+                          failure="Failed to restore the session")
+
+def session_loaded(session_path, session, data):
+    dataset_loaded(session.get("source") or session_path, data, (session.get("ui") or {}).get("source_options"))
+    try:
+        restore_filters(session_path, session, dataset_filters)
+    except SessionError as e:
+        messagebox.showwarning("Session Warning", f"{e}\nThe dataset was restored without filters.")
+    refresh_filter_label()
+    restore_ui_state(session.get("ui") or {})
+
+def restore_ui_state(state):
+    global x_selected_fields, y_selected_fields
+    variables = session_variables()
+    for name, value in (state.get("settings") or {}).items():
+        if name in variables:
+            try:
+                variables[name].set(value)
+            except tk.TclError:  # A value the variable's type no longer accepts keeps the default
+                pass
+
+    columns = [str(column) for column in original_dataset.columns]
+    x_selected_fields = [field for field in state.get("x_fields", []) if field in columns]
+    y_selected_fields = [field for field in state.get("y_fields", []) if field in columns]
+    for listbox, fields in ((x_axis_listbox, x_selected_fields), (y_axis_listbox, y_selected_fields)):
+        listbox.selection_clear(0, tk.END)
+        for field in fields:
+            listbox.selection_set(columns.index(field))
+    x_axis_label["text"] = f"X Axis (Selected: {', '.join(x_selected_fields)}):" if x_selected_fields else "X Axis:"
+    y_axis_label["text"] = f"Y Axis (Selected: {', '.join(y_selected_fields)}):" if y_selected_fields else "Y Axis:"
+    chart_type_dropdown.set(state.get("chart_type", ""))
+    update_aggression_options_based_on_selection()
+    update_aggression_options_based_on_chart_type()
 
 def get_chart_size():
     sizes = {
@@ -189,9 +537,16 @@ def get_chart_size():
     return sizes[chart_size.get()]
 
 def update_dropdowns(data):
-    """Update listboxes with new data after loading or applying filters."""
-    global dataset
-    dataset = data
+    """Update listboxes with new data after loading a file."""
+    global original_dataset, dataset_filters, column_stats, recommender, aggregations, histograms, time_rollups
+    original_dataset = data
+    dataset_filters = FilterEngine(data)
+    column_stats = StatsCache(dataset_filters)
+    recommender = ChartRecommender(dataset_filters, column_stats)
+    aggregations = AggregationEngine(cubes=CubeCache(dataset_filters))
+    histograms = HistogramCache()
+    time_rollups = RollupCache()
+    filter_label.config(text="")
 
     # Retrieve current selections to reapply after updating the list
     selected_x_indices = list(x_axis_listbox.curselection())
@@ -202,9 +557,9 @@ def update_dropdowns(data):
     x_axis_listbox.delete(0, tk.END)
     y_axis_listbox.delete(0, tk.END)
 
-    if dataset.empty:
-        # Notify the user that the dataset is empty after filtering
-        messagebox.showinfo("Update", "The dataset is empty after filtering.")
+    if data.empty:
+        # Notify the user that there is nothing to plot
+        messagebox.showinfo("Update", "The loaded dataset is empty.")
         x_axis_listbox.config(state='disabled')
         y_axis_listbox.config(state='disabled')
     else:
@@ -226,84 +581,133 @@ def update_dropdowns(data):
         for idx in new_y_indices:
             y_axis_listbox.selection_set(idx)
 
+def chart_options():
+    """Settings from the window that headless chart rendering honours."""
+    return {'aggregation': aggregation_method_var.get(), 'point_budget': line_point_budget(),
+            'approximate_quantiles': approximate_quantiles_var.get()}
+
+def prepare_selected_panels(panels):
+    """Prepare (chart type, title) panels for the current selection from the shared caches."""
+    columns = selected_columns()
+    plot_data = current_dataset(columns)
+    return prepare_panels(plot_data, x_selected_fields, y_selected_fields, panels, options=chart_options(),
+                          aggregations=aggregations, histograms=histograms, version=view_version(plot_data, columns), rollups=time_rollups)
+
+def start_background_render(render, on_done, button, busy_text):
+    """Run render() (which fans out to worker processes) on a thread and pass its report to on_done on the Tk thread."""
+    global active_render
+    if active_render is not None:
+        messagebox.showinfo("Render Info", "Charts are already being rendered. Wait for them to finish.")
+        return
+    messages = queue.Queue()
+    idle_text = button.cget("text")
+
+    def worker():
+        try:
+            messages.put(("done", render()))
+        except Exception as e:
+            messages.put(("error", e))
+
+    def poll_messages():
+        global active_render
+        try:
+            message = messages.get_nowait()
+        except queue.Empty:
+            root.after(100, poll_messages)
+            return
+        active_render = None
+        button.config(state=tk.NORMAL, text=idle_text)
+        if message[0] == "error":
+            messagebox.showerror("Render - Error", f"Failed to save the charts: {str(message[1])}")
+        else:
+            on_done(message[1])
+
+    thread = threading.Thread(target=worker, daemon=True)
+    active_render = thread
+    button.config(state=tk.DISABLED, text=busy_text)
+    thread.start()
+    root.after(100, poll_messages)
+
 def generate_dashboard_and_save():
-    try:
-        # Create the figure
-        fig = plt.figure(figsize=(20, 15))
-        gs = GridSpec(3, 3, figure=fig)
+    """Render every chart type for the current selection into one image (or a multi-page PDF).
 
-        # List of subplots to use
-        subplots = []
-        subplot_titles = []
-        failed_charts = []
+    Panel data is prepared here from the shared caches; drawing and saving happen
+    in a process pool driven from a background thread so the window stays responsive.
+    """
+    if original_dataset.empty:
+        messagebox.showerror("Dashboard - Error", "Load a file before generating a dashboard.")
+        return
+    if active_render is not None:
+        messagebox.showinfo("Dashboard Info", "Charts are already being rendered. Wait for them to finish.")
+        return
 
-        # Create subplots for each type of chart without causing errors
-        def safe_plot(ax, plot_func, plot_data, title):
-            try:
-                plot_func(ax, plot_data)
-                ax.set_title(title)
-                subplots.append(ax)
-                subplot_titles.append(title)
-            except Exception:
-                failed_charts.append(title)
-
-        plot_data = dataset[list(set(x_selected_fields + y_selected_fields))]
-
-        # Line Plot
-        if "Line" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[0, 0]), plot_line, plot_data, "Line Plot")
-
-        # Bar Chart
-        if "Bar" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[0, 1]), plot_bar, plot_data, "Bar Chart")
-
-        # Column Chart
-        if "Column" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[0, 2]), plot_column, plot_data, "Column Chart")
-
-        # Stacked Bar Chart
-        if "Stacked Bar" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[1, 0]), plot_stacked_bar, plot_data, "Stacked Bar Chart")
-
-        # Scatter Plot
-        if "Scatter Plot" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[1, 1]), plot_scatter, plot_data, "Scatter Plot")
-
-        # Dual Axes Plot
-        if "Dual Axes" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[1, 2]), plot_dual_axes, plot_data, "Dual Axes Plot")
-
-        # Histogram
-        if "Histogram" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[2, 0]), plot_histogram, plot_data, "Histogram")
-
-        # Box Plot
-        if "Box Plot" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[2, 1]), plot_box, plot_data, "Box Plot")
-
-        # Pie Chart
-        if "Pie Chart" in chart_type_dropdown["values"]:
-            safe_plot(fig.add_subplot(gs[2, 2]), plot_pie, plot_data, "Pie Chart")
-
-        # Adjust layout and save the dashboard
-        if subplots:
-            plt.tight_layout()
-
-            # Ask user where to save the dashboard
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".png",
-                filetypes=[("PNG files", "*.png"), ("All files", "*.*")],
-                title="Save Dashboard as PNG"
-            )
-            if file_path:
-                fig.savefig(file_path, dpi=600)
-                success_message = f"Dashboard saved successfully at {file_path}"
-                if failed_charts:
-                    success_message += f"\n\nThe following charts could not be generated:\n" + "\n".join(failed_charts)
-            plt.close(fig)
+    # Ask user where to save the dashboard
+    file_path = filedialog.asksaveasfilename(
+        defaultextension=".png",
+        filetypes=[("PNG files", "*.png"), ("PDF files (one page per chart)", "*.pdf"), ("All files", "*.*")],
+        title="Save Dashboard"
+    )
+    if not file_path:
+        return
 
-    except Exception as e:
+    prepared = prepare_selected_panels(DASHBOARD_PANELS)
+
+    def show_report(report):
+        summary = f"Dashboard saved successfully at {file_path}\n\n" + format_report(report)
+        if any(entry['error'] for entry in report):
+            messagebox.showwarning("Dashboard", summary)
+        else:
+            messagebox.showinfo("Dashboard", summary)
+
+    start_background_render(lambda: render_panels(prepared, file_path), show_report, dashboard_button, "Rendering Dashboard...")
+
+def generate_all_charts():
+    """Batch mode of "Generate All Charts": every chart type saved to a folder in parallel, then a thumbnail summary."""
+    if original_dataset.empty:
+        messagebox.showerror("Generating - Error", "Load a file before generating charts.")
         return
+    if not x_selected_fields:
+        messagebox.showerror("Generating - Error", "Select at least one field for the X axis.")
+        return
+    if active_render is not None:
+        messagebox.showinfo("Generating Info", "Charts are already being rendered. Wait for them to finish.")
+        return
+
+    folder = filedialog.askdirectory(title="Choose a Folder for the Charts")
+    if not folder:
+        return
+    fmt = simpledialog.askstring("Output Format", f"Enter the file format ({', '.join(OUTPUT_FORMATS)}):", initialvalue="png", parent=root)
+    if fmt is None:
+        return
+    fmt = fmt.strip().lower().lstrip(".")
+    if fmt not in OUTPUT_FORMATS:
+        messagebox.showerror("Generating - Error", f"Unsupported format '{fmt}'. Choose one of: {', '.join(OUTPUT_FORMATS)}.")
+        return
+
+    # Shared aggregations are computed once here; the workers only draw
+    prepared = prepare_selected_panels([(chart_type, chart_type) for chart_type in ALL_CHART_TYPES])
+    size = get_chart_size()
+    start_background_render(lambda: render_charts_to_folder(prepared, folder, fmt, size=size),
+                            lambda report: show_thumbnail_summary(folder, report), visualize_button, "Rendering Charts...")
+
+def show_thumbnail_summary(folder, report):
+    """Grid of chart thumbnails with their timing, or the reason a chart could not be drawn."""
+    window = tk.Toplevel(root)
+    saved = sum(entry['path'] is not None for entry in report)
+    window.title(f"{saved} of {len(report)} charts saved to {folder}")
+    window.thumbnails = []  # Tk only shows images that are still referenced
+    for position, entry in enumerate(report):
+        row, column = divmod(position, 5)
+        cell = ttk.Frame(window, padding=5)
+        cell.grid(row=row, column=column, sticky=tk.N)
+        thumbnail = ImageTk.PhotoImage(Image.open(io.BytesIO(entry['thumbnail'])))
+        window.thumbnails.append(thumbnail)
+        ttk.Label(cell, image=thumbnail).pack()
+        if entry['error'] is None:
+            caption = f"{os.path.basename(entry['path'])} ({entry['prepare_seconds'] + entry['render_seconds']:.1f}s)"
+        else:
+            caption = f"{entry['title']} failed: {entry['error']}"
+        ttk.Label(cell, text=caption, wraplength=THUMBNAIL_WIDTH).pack()
 
 def update_aggression_options_based_on_chart_type():
     chart_type = chart_type_dropdown.get()
@@ -335,15 +739,6 @@ def update_aggression_options_based_on_chart_type():
     else:
         aggregation_method_dropdown.config(state=tk.DISABLED)
 
-def display_values_on_bars(ax, bars, font_size=4):
-    for bar in bars:
-        if isinstance(bar, plt.Line2D):
-            for x, y in zip(bar.get_xdata(), bar.get_ydata()):
-                ax.text(x, y, f'{y:.2f}', ha='center', va='bottom', fontsize=font_size)
-        else:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2.0, height, f'{height:.2f}', ha='center', va='bottom', fontsize=font_size)
-
 def store_x_axis_selection():
     global x_selected_fields
     selected_indices = x_axis_listbox.curselection()
@@ -361,720 +756,116 @@ def store_y_axis_selection():
     update_aggression_options_based_on_selection()
 
 def update_aggression_options_based_on_selection():
-    if x_selected_fields and y_selected_fields and all(dataset[col].dtype.kind in 'fi' for col in x_selected_fields + y_selected_fields):
+    if x_selected_fields and y_selected_fields and all(original_dataset.dtypes[col].kind in 'fi' for col in x_selected_fields + y_selected_fields):
         aggression_checkbutton.config(state=tk.NORMAL)
     else:
         aggression_checkbutton.config(state=tk.DISABLED)
 
 def recommend_chart():
     if x_selected_fields and y_selected_fields:
-        recommendation = advanced_chart_recommendation(x_selected_fields, y_selected_fields, dataset)
-        recommendation_label["text"] = f"Recommended Chart: {recommendation}"
+        # Profiled from a sample of the filtered rows, and cached per field selection and filter state
+        recommendation, confidence, rows_read = recommender.recommend(x_selected_fields, y_selected_fields)
+        text = f"Recommended Chart: {recommendation}"
+        if rows_read < dataset_filters.row_count():
+            text += f" ({confidence:.0%} confidence, {rows_read:,} sampled rows)"
+        recommendation_label["text"] = text
         chart_type_dropdown.set(recommendation)
         update_aggression_options_based_on_chart_type()
     else:
         recommendation_label["text"] = "Select fields for X and Y axes."
 
-def advanced_chart_recommendation(x_columns, y_columns, dataset):
-    if not x_columns or not y_columns:
-        return "Select appropriate data fields"
-
-    x_dtype = dataset[x_columns[0]].dtype
-    y_dtype = dataset[y_columns[0]].dtype
-    x_unique_count = dataset[x_columns[0]].nunique()
-    y_unique_count = dataset[y_columns[0]].nunique()
-    total_entries = len(dataset)
-
-    # Checking for single variable usage
-    if len(x_columns) == 1 and x_columns == y_columns:
-        if pd.api.types.is_numeric_dtype(x_dtype):
-            return "Histogram"
-        else:
-            return "Pie Chart" if x_unique_count < 20 else "Bar"
-
-    # Multi-variable interactions
-    if len(x_columns) > 1 or len(y_columns) > 1:
-        if all(dataset[col].dtype.kind in 'fi' for col in x_columns + y_columns):
-            correlation = dataset[x_columns + y_columns].corr()
-            # Check if high correlation exists
-            if (correlation.abs() > 0.75).any().any():
-                return "Line"  # Strong linear relationship
-            else:
-                return "Scatter Plot"  # To explore potential relationships and distributions
-
-    # Single X, multiple Y or vice versa
-    if len(x_columns) == 1 and len(y_columns) > 1:
-        if pd.api.types.is_numeric_dtype(x_dtype) and all(dataset[y].dtype.kind in 'fi' for y in y_columns):
-            return "Line"  # Time series or continuous relationships
-        else:
-            return "Stacked Bar"  # Categorical comparison across multiple Y variables
-
-    # Categorical X, Numeric Y
-    if pd.api.types.is_categorical_dtype(x_dtype) or pd.api.types.is_object_dtype(x_dtype):
-        if y_unique_count <= 10:
-            return "Bar"
-        elif total_entries > 50:
-            return "Box Plot"
-        return "Bar"
-
-    # Numeric X, Categorical Y
-    if pd.api.types.is_numeric_dtype(x_dtype) and (pd.api.types.is_categorical_dtype(y_dtype) or pd.api.types.is_object_dtype(y_dtype)):
-        if x_unique_count <= 10 and total_entries <= 20:
-            return "Pie Chart"
-        return "Line"  # To explore trends across categories
-
-    # Default for numeric types or mixed usage
-    return "Scatter Plot" if total_entries > 1000 else "Line"
-
-# Line Plot Package
-def aggregate_data(data, x_col, y_col, aggregation_method):
-    if aggregation_method == 'mean':
-        return data.groupby(x_col, as_index=False)[y_col].mean()
-    elif aggregation_method == 'sum':
-        return data.groupby(x_col, as_index=False)[y_col].sum()
-    elif aggregation_method == 'median':
-        return data.groupby(x_col, as_index=False)[y_col].median()
-    elif aggregation_method == 'max':
-        return data.groupby(x_col, as_index=False)[y_col].max()
-    elif aggregation_method == 'min':
-        return data.groupby(x_col, as_index=False)[y_col].min()
-    else:
-        raise ValueError(f"Unknown aggregation method: {aggregation_method}")
-
-def reduce_categories(data, x_col, max_categories):
-    top_categories = data[x_col].value_counts().nlargest(max_categories).index
-    data = data[data[x_col].isin(top_categories)]
-    return data
-
-def plot_line(ax, data, x_selected_fields, y_selected_fields, aggregation_method='mean', use_seaborn=False, display_values=False, value_label_font_size=8, dual_y_axis=False):
-    if len(x_selected_fields) != 1 or not y_selected_fields:
-        messagebox.showerror("Line - Error", "Line plot requires exactly one X field and at least one Y field.")
-        return
-    
-    x_col = x_selected_fields[0]
-    colors = ['#66c2a5', '#fc8d62', '#8da0cb', '#e78ac3', '#a6d854', '#ffd92f', '#e5c494', '#b3b3b3']
-
-    if pd.api.types.is_datetime64_any_dtype(data[x_col]):
-        sorting_option = messagebox.askquestion("Datetime Aggregation", "Would you like to group by Year, Month, Day, Hour, or Minute?")
-        if sorting_option == "Year":
-            data[x_col] = data[x_col].dt.to_period("Y").dt.to_timestamp()
-        elif sorting_option == "Month":
-            data[x_col] = data[x_col].dt.to_period("M").dt.to_timestamp()
-        elif sorting_option == "Day":
-            data[x_col] = data[x_col].dt.date
-        elif sorting_option == "Hour":
-            data[x_col] = data[x_col].dt.floor("H")
-        elif sorting_option == "Minute":
-            data[x_col] = data[x_col].dt.floor("T")
-        sorted_data = data.sort_values(by=[x_col])
-    elif pd.api.types.is_categorical_dtype(data[x_col]) or pd.api.types.is_object_dtype(data[x_col]):
-        unique_categories = data[x_col].nunique()
-        max_categories = 10
-        if unique_categories > max_categories:
-            data = reduce_categories(data, x_col, max_categories)
-        sorted_data = data.sort_values(by=[x_col])
-    elif pd.api.types.is_numeric_dtype(data[x_col]):
-        sorted_data = data.sort_values(by=[x_col])
-    else:
-        sorted_data = data
-
-    if dual_y_axis and len(y_selected_fields) > 1:
-        ax2 = ax.twinx()
-        ax2_colors = itertools.cycle(['#8da0cb', '#66c2a5'])  # Different color cycle for the second Y axis
-    else:
-        ax2 = None
-
-    for idx, y_col in enumerate(y_selected_fields):
-        aggregated_data = aggregate_data(sorted_data, x_col, y_col, aggregation_method)
-        
-        if idx == 0 or not dual_y_axis:
-            target_ax = ax
-            color = colors[idx % len(colors)]
-        else:
-            target_ax = ax2
-            color = next(ax2_colors)
-        
-        if use_seaborn:
-            sns.lineplot(data=aggregated_data, x=x_col, y=y_col, ax=target_ax, color=color, marker='o', markersize=5, label=y_col)
-        else:
-            target_ax.plot(aggregated_data[x_col], aggregated_data[y_col], label=y_col, color=color, marker='o', markersize=5)
-        
-        if display_values:
-            for x_val, y_val in zip(aggregated_data[x_col], aggregated_data[y_col]):
-                target_ax.text(x_val, y_val, f"{y_val:.2f}", color=color, fontsize=value_label_font_size, ha='center', va='bottom')
-
-    # Setting the legend for the primary axis
-    ax.legend(title='Primary Y-axis', loc='upper left', bbox_to_anchor=(1, 1))
-    ax.grid(True)
-
-    # Formatting for x-axis labels if they're datetime
-    if pd.api.types.is_datetime64_any_dtype(data[x_col]):
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
-
-    # Additional settings for dual Y-axis mode
-    if dual_y_axis and ax2:
-        ax2.legend(title='Secondary Y-axis', loc='upper left', bbox_to_anchor=(1, 1.15))
-        # Ensure both axes are visible
-        lines_1, labels_1 = ax.get_legend_handles_labels()
-        lines_2, labels_2 = ax2.get_legend_handles_labels()
-        ax2.legend(lines_1 + lines_2, labels_1 + labels_2, loc='upper right', bbox_to_anchor=(1, 1))
-
-    ax.set_xlabel(x_col)
-    ax.set_ylabel("Primary Y Values")
-    if ax2:
-        ax2.set_ylabel("Secondary Y Values")
-
-    ax.set_title(f"Line Plot of {', '.join(y_selected_fields)} vs. {x_col}")
-
-    # Adjust plot layout to make room for legends outside the plot
-    plt.tight_layout(rect=[0, 0, 0.85, 1])
-
-def plot_bar(ax, plot_data):
-    if len(x_selected_fields) != 1 or len(y_selected_fields) != 1:
-        messagebox.showerror("Bar - Error", "Bar plot requires exactly one X field and one Y field.")
-        return
-
-    # Ensure Y-axis data is numeric
-    try:
-        plot_data[y_selected_fields[0]] = pd.to_numeric(plot_data[y_selected_fields[0]], errors='coerce')
-        if plot_data[y_selected_fields[0]].isnull().any():
-            messagebox.showerror("Bar - Error", "Non-numeric data found in Y-axis field after conversion attempt.")
-            return
-
-        # Drop rows where Y data could not be converted and resulted in NaN
-        plot_data = plot_data.dropna(subset=[y_selected_fields[0]])
-
-        # Group by X field and calculate mean for Y field
-        aggregated_data = plot_data.groupby(x_selected_fields[0])[y_selected_fields[0]].mean().reset_index()
-
-        # Customize order and number of items if enabled
+def category_counts(data, column):
+    """Category counts of a chart column, reusing the filter engine's codes when data is the current filtered view."""
+    if view_version(data, [column]) is None:
+        return CategoryCounts.from_values(data[column])
+    index = dataset_filters.index_for(column, CategoryIndex)
+    mask = dataset_filters.mask()
+    return CategoryCounts(index.codes if mask is None else index.codes[mask], index.uniques)
+
+def chart_data(chart_type, x_fields, y_fields):
+    """(filtered data, histogram summary) of a chart; a histogram streamed from disk has no data, only its summary."""
+    columns = list(dict.fromkeys(x_fields + y_fields))
+    if chart_type != "Histogram":
+        return current_dataset(columns), None
+    column = x_fields[0]
+    # Checked on the loaded dtype, so a text column is not loaded or streamed just to be refused
+    if not pd.api.types.is_numeric_dtype(original_dataset.dtypes[column]):
+        raise ValueError("Histogram requires numerical data. Please select a numeric field.")
+    plot_data = None if should_stream_histogram(column) else current_dataset(columns)
+    # Moments, range and quartiles are computed once per column and filter version; NaN/inf are skipped
+    return plot_data, histogram_summary(plot_data, column)
+
+def ask_for_pie_categories(num_categories):
+    """How many of more than 10 categories a pie chart shows; None when the user cancelled."""
+    while True:
+        user_input = simpledialog.askinteger("Input", f"More than 10 categories found. Enter the number of categories to display (max {num_categories}):",
+                                             minvalue=1, maxvalue=num_categories, parent=root)
+        if user_input is None:
+            messagebox.showinfo("Pie - Info", "Operation cancelled by user.", parent=root)
+            return None
+        if 1 <= user_input <= num_categories:
+            return user_input
+        messagebox.showerror("Invalid Input", f"Please enter a number between 1 and {num_categories}.", parent=root)
+
+def ask_chart_answers(chart_type, plot_data, summary, x_fields, y_fields):
+    """Ask the chart's own questions (time grouping, categories, sorting, bins) and return the answers as panel options.
+
+    Returns None when the user cancelled the chart. The embedded chart keeps its
+    answers, so changing the filters redraws it without asking again.
+    """
+    answers = {}
+    x_col = x_fields[0] if len(x_fields) == 1 and plot_data is not None else None
+    x_values = plot_data[x_col] if x_col is not None else None
+
+    if chart_type in ("Line", "Area") and x_values is not None and pd.api.types.is_datetime64_any_dtype(x_values):
+        # Buckets come from a rollup built once per column and filter state; the column itself is never rebucketed
+        answers['time_level'] = ask_for_time_granularity(suggest_time_level(plot_data, x_col))
+    if chart_type == "Area":
+        if x_values is not None and is_categorical_like(x_values) and chart_column_stats(plot_data, x_col).nunique > 10:
+            reduce_option = messagebox.askyesno("Reduce Categories", "Too many categories. Would you like to reduce them?")
+            answers['top_n'] = 10 if reduce_option else None
+        if len(y_fields) > 1:
+            answers['stack'] = messagebox.askyesno("Stack Areas", "You have multiple Y fields. Would you like to stack them?")
+    elif chart_type in ("Bar", "Column"):
         order, max_items = ask_for_bar_customization()
-        if order is None:  # Handle case where customization is not done
+        if order is None:
+            if chart_type == "Column":
+                messagebox.showwarning("ColumnBar - Warning", "Sorting order or max items not specified.")
+                return None
             messagebox.showinfo("Bar - Info", "Using default settings for sorting and item count.")
-            order, max_items = 'desc', min(len(aggregated_data), 10)  # Default settings
-
-        if order == 'desc':
-            aggregated_data = aggregated_data.nlargest(max_items, y_selected_fields[0])
-        else:
-            aggregated_data = aggregated_data.nsmallest(max_items, y_selected_fields[0])
-
-        x = aggregated_data[x_selected_fields[0]].astype(str)
-        y = aggregated_data[y_selected_fields[0]]
-        bar_width = 0.8
-
-        if use_seaborn.get():
-            bars = sns.barplot(data=aggregated_data, x=x_selected_fields[0], y=y_selected_fields[0], ax=ax, color='lightblue', orient='v')
-        else:
-            bars = ax.bar(x, y, width=bar_width, color='lightblue')
-
-        ax.set_xticks(range(len(x)))
-        ax.set_xticklabels(x, rotation=x_tick_label_rotation_var.get(), fontsize=int(x_axis_font_size_var.get()))
-
-        if display_values.get():
-            font_size = int(value_label_font_size_var.get())
-            display_values_on_bars(ax, bars, font_size=font_size)
-
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to plot bar chart: {str(e)}")
-
-def plot_area(ax, data, x_selected_fields, y_selected_fields, aggregation_method, use_seaborn, display_values, value_label_font_size):
-    if len(x_selected_fields) != 1:
-        messagebox.showerror("Area - Error", "Area plot requires exactly one X field.")
-        return
-
-    if not y_selected_fields:
-        messagebox.showerror("Area - Error", "Area plot requires at least one Y field.")
-        return
-    
-    x_col = x_selected_fields[0]
-    colors = ['#66c2a5', '#fc8d62', '#8da0cb', '#e78ac3', '#a6d854', '#ffd92f', '#e5c494', '#b3b3b3']
-    
-    # Check if x_col is datetime and ask for aggregation if necessary
-    if pd.api.types.is_datetime64_any_dtype(data[x_col]):
-        sorting_option = messagebox.askquestion("Datetime Aggregation", 
-                                                "Would you like to group by Year, Month, Day, Hour, or Minute?")
-        if sorting_option == "Yes":
-            aggregation_period = messagebox.askquestion("Aggregation Period", 
-                                                        "Please select one of the following: Year, Month, Day, Hour, or Minute.")
-            if aggregation_period == "Year":
-                data[x_col] = data[x_col].dt.to_period("Y").dt.to_timestamp()
-            elif aggregation_period == "Month":
-                data[x_col] = data[x_col].dt.to_period("M").dt.to_timestamp()
-            elif aggregation_period == "Day":
-                data[x_col] = data[x_col].dt.date
-            elif aggregation_period == "Hour":
-                data[x_col] = data[x_col].dt.floor("H")
-            elif aggregation_period == "Minute":
-                data[x_col] = data[x_col].dt.floor("T")
-    elif pd.api.types.is_categorical_dtype(data[x_col]) or pd.api.types.is_object_dtype(data[x_col]):
-        if data[x_col].nunique() > 10:  # Arbitrary large number of categories
-            reduce_option = messagebox.askyesno("Reduce Categories", 
-                                                "Too many categories. Would you like to reduce them?")
-            if reduce_option:
-                data = reduce_categories(data, x_col, 10)
-
-    # Ensure numeric Y fields
-    for col in y_selected_fields:
-        if not pd.api.types.is_numeric_dtype(data[col]):
-            try:
-                data[col] = pd.to_numeric(data[col], errors='coerce').fillna(0)
-            except ValueError:
-                messagebox.showerror("Area - Error", f"Y field '{col}' contains non-numeric data.")
-                return
-
-    # Sort data based on the X-axis
-    data = data.sort_values(by=x_col)
-
-    # Check if we should stack the areas
-    if len(y_selected_fields) > 1:
-        stack_option = messagebox.askyesno("Stack Areas", 
-                                           "You have multiple Y fields. Would you like to stack them?")
-    else:
-        stack_option = False
-
-    # Plotting the area chart
-    for i, y_col in enumerate(y_selected_fields):
-        if stack_option:
-            if i == 0:
-                ax.fill_between(data[x_col], 0, data[y_col], alpha=0.5, label=y_col, color=colors[i % len(colors)])
-            else:
-                ax.fill_between(data[x_col], data[y_selected_fields[:i]].sum(axis=1), 
-                                data[y_selected_fields[:i+1]].sum(axis=1), 
-                                alpha=0.5, label=y_col, color=colors[i % len(colors)])
-        else:
-            ax.fill_between(data[x_col], 0, data[y_col], alpha=0.3, label=y_col, color=colors[i % len(colors)])
-
-    # Formatting the X-axis if datetime
-    if pd.api.types.is_datetime64_any_dtype(data[x_col]):
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
-
-    ax.legend(title="Series")
-    ax.set_xlabel(x_col)
-    ax.set_ylabel("Values")
-    ax.set_title(f"Area Plot of {', '.join(y_selected_fields)} vs. {x_col}")
-    plt.tight_layout()
-
-def plot_stacked_bar(ax, plot_data):
-    if len(x_selected_fields) != 1:
-        messagebox.showerror("Stacked - Error", "Stacked Bar plot requires exactly one X field.")
-        return
-    if not y_selected_fields:
-        messagebox.showerror("Stacked - Error", "Stacked Bar plot requires at least one Y field.")
-        return
-
-    # Check if Y fields are numeric
-    if not all(pd.api.types.is_numeric_dtype(plot_data[col]) for col in y_selected_fields):
-        messagebox.showerror("Stacked - Error", "All Y fields must be numeric for stacked bar plots.")
-        return
-
-    # Preparing the data for plotting
-    crosstab_data = plot_data.groupby(x_selected_fields[0])[y_selected_fields].sum()
-    crosstab_data.fillna(0, inplace=True)  # Replace NaN with 0 for stacking
-
-    bottom = np.zeros(len(crosstab_data))
-
-    if use_seaborn.get():
-        # Use Matplotlib directly as Seaborn doesn't support stacked bars
-        palette = sns.color_palette("husl", len(y_selected_fields))
-        bars = []
-        for idx, col in enumerate(y_selected_fields):
-            bar = ax.bar(crosstab_data.index, crosstab_data[col], bottom=bottom, label=col, color=palette[idx])
-            bars.append(bar)
-            bottom += crosstab_data[col].values
-    else:
-        # Directly use Matplotlib's stacked bar functionality
-        palette = sns.color_palette("husl", len(y_selected_fields))
-        bars = []
-        bottom = np.zeros(len(crosstab_data))
-        for idx, col in enumerate(y_selected_fields):
-            bar = ax.bar(crosstab_data.index, crosstab_data[col], bottom=bottom, label=col, color=palette[idx])
-            bars.append(bar)
-            bottom += crosstab_data[col].values
-
-    ax.set_xticks(range(len(crosstab_data.index)))
-    ax.set_xticklabels(crosstab_data.index, rotation=x_tick_label_rotation_var.get(), fontsize=int(x_axis_font_size_var.get()))
-    ax.set_xlabel(x_selected_fields[0], fontsize=int(x_axis_font_size_var.get()))
-    ax.set_ylabel("Sum of Values", fontsize=int(y_axis_font_size_var.get()))
-    ax.legend(title="Categories")
-
-    # Display values on bars if enabled
-    if display_values.get():
-        font_size = int(value_label_font_size_var.get())
-        for bar_group in bars:
-            for rect in bar_group:
-                height = rect.get_height()
-                if height > 0:
-                    ax.text(
-                        rect.get_x() + rect.get_width() / 2,
-                        rect.get_y() + height,
-                        f'{int(height)}',
-                        ha='center',
-                        va='bottom',
-                        fontsize=font_size
-                    )
-
-def plot_scatter(ax, plot_data):
-    # Ensure the columns are numeric and handle NaN values
-    if plot_data[x_selected_fields[0]].dtype.kind not in 'fi' or plot_data[y_selected_fields[0]].dtype.kind not in 'fi':
-        messagebox.showerror("Scatter Error", "Scatter plot requires numeric data types for both axes.")
-        return
-
-    # Drop NaN values from the data used in the scatter plot to avoid errors in calculations
-    plot_data = plot_data.dropna(subset=[x_selected_fields[0], y_selected_fields[0]])
-
-    # Plotting the scatter plot
-    if use_seaborn.get():
-        sns.scatterplot(data=plot_data, x=x_selected_fields[0], y=y_selected_fields[0], ax=ax, color='#66c2a5')
-    else:
-        ax.scatter(plot_data[x_selected_fields[0]], plot_data[y_selected_fields[0]], color='#66c2a5')
-
-    # Checking if the aggression line should be displayed
-    if display_aggression.get():
-        try:
-            x_data = plot_data[x_selected_fields[0]].astype(float)
-            y_data = plot_data[y_selected_fields[0]].astype(float)
-            slope, intercept, r_value, p_value, std_err = linregress(x_data, y_data)
-            ax.plot(x_data, intercept + slope * x_data, color="lightpink", label=f'Aggression Line: y={intercept:.2f}+{slope:.2f}x')
-
-            textstr = f'Slope: {slope:.2f}, R-squared: {r_value**2:.2f}'
-            props = dict(boxstyle='round', facecolor='white', alpha=0.5)
-            ax.text(0.95, 0.05, textstr, transform=ax.transAxes, fontsize=8, verticalalignment='bottom', horizontalalignment='right', bbox=props)
-            ax.legend()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to compute aggression line: {str(e)}")
-
-    ax.legend()
-
-def plot_dual_axes(ax, plot_data):
-    if len(x_selected_fields) != 1 or len(y_selected_fields) != 2:
-        messagebox.showerror("Error", "Dual Axes plot requires exactly one X field and two Y fields.")
-        return
-
-    x_field = x_selected_fields[0]
-    y_field1 = y_selected_fields[0]
-    y_field2 = y_selected_fields[1]
-
-    color1 = '#66c2a5'
-    color2 = '#fc8d62'
-
-    if use_seaborn.get():
-        sns.lineplot(x=x_field, y=y_field1, data=plot_data, ax=ax, color=color1, label=f"{y_field1} (left axis)")
-        ax2 = ax.twinx()
-        sns.lineplot(x=x_field, y=y_field2, data=plot_data, ax=ax2, color=color2, label=f"{y_field2} (right axis)")
-    else:
-        ax.plot(plot_data[x_field], plot_data[y_field1], color=color1, label=f"{y_field1} (left axis)")
-        ax.set_xlabel(x_field, fontsize=int(x_axis_font_size_var.get()))
-        ax.set_ylabel(y_field1, fontsize=int(y_axis_font_size_var.get()))
-
-        ax2 = ax.twinx()
-        ax2.plot(plot_data[x_field], plot_data[y_field2], color=color2, label=f"{y_field2} (right axis)")
-        ax2.set_ylabel(y_field2, fontsize=int(y_axis_font_size_var.get()))
-
-    lines, labels = ax.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax2.legend(lines + lines2, labels + labels2, loc='upper right')
-
-    ax.figure.tight_layout()
-
-def plot_histogram(ax, plot_data, x_selected_fields):
-    # Check if a single field is selected
-    if len(x_selected_fields) != 1:
-        messagebox.showerror("Histogram - Error", "Histogram requires exactly one field to be selected for the X axis.")
-        return
-
-    data = plot_data[x_selected_fields[0]]
-
-    # Check if the selected data is numeric
-    if not pd.api.types.is_numeric_dtype(data):
-        messagebox.showerror("Histogram - Error", "Histogram requires numerical data. Please select a numeric field.")
-        return
-
-    # Remove any NaN or infinite values from the data
-    data = data[np.isfinite(data)]
-
-    # Check if there is any data left after removing NaNs and infinite values
-    if data.empty:
-        messagebox.showerror("Histogram - Error", "The selected data contains only missing or infinite values.")
-        return
-
-    # Use the improved dialog function with data to get user preferences
-    use_custom_bins, custom_bins = ask_for_histogram_customization(data)
-
-    try:
+            order, max_items = 'desc', 10
+        answers['order'], answers['top_n'] = order, max_items
+    elif chart_type == "Histogram" and not summary.empty:
+        use_custom_bins, custom_bins = ask_for_histogram_customization(summary)
         if use_custom_bins:
-            # Plot histogram with the custom bins provided by the user
-            counts, bins, patches = ax.hist(data, bins=custom_bins, color='lightblue', edgecolor='black', alpha=0.7)
-        else:
-            # Automatic bins - Freedman-Diaconis rule as a fallback
-            q25, q75 = np.percentile(data, [25, 75])
-            bin_width = 2 * (q75 - q25) * len(data) ** (-1/3)
-            if bin_width == 0:
-                bin_width = 2.7 * np.std(data) / (len(data) ** (1/3))
-
-            bin_count = int((data.max() - data.min()) / bin_width)
-            counts, bins, patches = ax.hist(data, bins=bin_count, color='lightblue', edgecolor='black', alpha=0.7)
-    except Exception as e:
-        messagebox.showerror("Histogram - Error", f"An error occurred while plotting the histogram: {str(e)}")
-        return
-
-    # Display values on bars if enabled
-    if display_values.get():
-        try:
-            font_size = int(value_label_font_size_var.get())
-            for count, rect in zip(counts, patches):
-                height = rect.get_height()
-                ax.text(rect.get_x() + rect.get_width() / 2, height, f'{int(height)}', ha='center', va='bottom', fontsize=font_size)
-        except Exception as e:
-            messagebox.showerror("Histogram - Error", f"An error occurred while displaying values on bars: {str(e)}")
-
-    # Setting labels and titles
-    ax.set_xlabel(", ".join(x_selected_fields), fontsize=12)
-    ax.set_ylabel("Frequency", fontsize=12)
-    ax.set_title(f"Histogram: {', '.join(x_selected_fields)}", fontsize=14)
-
-    # Skewness information
-    mean_value = np.mean(data)
-    std_dev = np.std(data)
-    skew_value = skew(data)
-
-    if display_skew.get():
-        skew_text = f"Mean: {mean_value:.2f}, Std Dev: {std_dev:.2f}, Skew: {skew_value:.2f}"
-        props = dict(boxstyle='round', facecolor='white', alpha=0.8)
-        ax.text(0.95, 0.95, skew_text, transform=ax.transAxes, fontsize=7, verticalalignment='top', horizontalalignment='right', bbox=props)
-
-        # Calculate the skew line using the probability density function (PDF) of the normal distribution
-        x_min, x_max = min(data), max(data)
-        x = np.linspace(x_min, x_max, 100)
-        pdf = norm.pdf(x, loc=mean_value, scale=std_dev)
-
-        # Scale the PDF to match the height of the histogram
-        pdf_scaled = pdf * np.max(counts) / np.max(pdf)
-
-        # Plot the skew line
-        ax.plot(x, pdf_scaled, color='red', linewidth=1.5, label='Skew Line')
-        ax.legend(fontsize=7)
-
-    ax.grid(axis='y', linestyle='--', alpha=0.7)
-
-def plot_box(ax, plot_data, x_selected_fields, y_selected_fields, use_seaborn, display_values):
-    if len(x_selected_fields) != 1 or len(y_selected_fields) != 1:
-        ax.clear()
-        ax.text(0.5, 0.5, "Box plot requires exactly one X field and one Y field.", ha='center', va='center')
-        return
-
-    x_field = x_selected_fields[0]
-    y_field = y_selected_fields[0]
-
-    if x_field not in plot_data.columns or y_field not in plot_data.columns:
-        ax.clear()
-        ax.text(0.5, 0.5, f"Selected fields ({x_field}, {y_field}) not found in the dataset.", ha='center', va='center')
-        return
-
-    if not np.issubdtype(plot_data[y_field].dtype, np.number):
-        ax.clear()
-        ax.text(0.5, 0.5, f"Y field ({y_field}) must be numeric for box plot.", ha='center', va='center')
-        return
-
-    # Dataset type analysis and customization
-    if pd.api.types.is_datetime64_any_dtype(plot_data[x_field]):
-        aggregation_option = messagebox.askquestion("Datetime Aggregation",
-                                                    "The X field is a datetime. Would you like to aggregate it?")
-        if aggregation_option == "yes":
-            aggregation_period = messagebox.askquestion("Aggregation Period",
-                                                        "Please select the aggregation period:",
-                                                        options=["Year", "Month", "Day"])
-            if aggregation_period == "Year":
-                plot_data[x_field] = plot_data[x_field].dt.to_period("Y")
-            elif aggregation_period == "Month":
-                plot_data[x_field] = plot_data[x_field].dt.to_period("M")
-            elif aggregation_period == "Day":
-                plot_data[x_field] = plot_data[x_field].dt.to_period("D")
-
-    if pd.api.types.is_categorical_dtype(plot_data[x_field]) or pd.api.types.is_object_dtype(plot_data[x_field]):
-        num_categories = plot_data[x_field].nunique()
+            answers['bins'] = custom_bins
+    elif chart_type == "Box Plot" and x_values is not None:
+        answers['top_n'] = None
+        if pd.api.types.is_datetime64_any_dtype(x_values):
+            answers['time_level'] = ask_for_time_granularity("Month", levels=("Day", "Month", "Year"))
+        elif is_categorical_like(x_values):
+            num_categories = chart_column_stats(plot_data, x_col).nunique
+            if num_categories > 10:
+                reduce_option = messagebox.askyesno("Reduce Categories",
+                                                    f"The X field has {num_categories} categories. Would you like to reduce them?", parent=root)
+                if reduce_option:
+                    answers['top_n'] = simpledialog.askinteger("Top N Categories", "Enter the number of top categories to keep:", parent=root) or None
+    elif chart_type == "Pie Chart" and x_values is not None and not pd.api.types.is_numeric_dtype(x_values):
+        answers['top_n'] = None
+        num_categories = category_counts(plot_data, x_col).nunique
         if num_categories > 10:
-            reduce_option = messagebox.askyesno("Reduce Categories",
-                                                f"The X field has {num_categories} categories. Would you like to reduce them?")
-            if reduce_option:
-                top_n = simpledialog.askinteger("Top N Categories", "Enter the number of top categories to keep:")
-                top_categories = plot_data[x_field].value_counts().nlargest(top_n).index
-                plot_data = plot_data[plot_data[x_field].isin(top_categories)]
-
-    try:
-        if use_seaborn.get():
-            sns.boxplot(data=plot_data, x=x_field, y=y_field, ax=ax)
-            boxes = ax.artists
-        else:
-            if plot_data[x_field].nunique() > 1:
-                grouped_data = [group[y_field].values for _, group in plot_data.groupby(x_field)]
-                labels = plot_data[x_field].unique()
-                box_plot_data = ax.boxplot(grouped_data, labels=labels)
-            else:
-                box_plot_data = ax.boxplot([plot_data[y_field].values], labels=[str(plot_data[x_field].iloc[0])])
-                labels = [str(plot_data[x_field].iloc[0])]
-            boxes = box_plot_data['boxes']
-
-        # Display values on the box plot if selected
-        if display_values.get():
-            for i, box in enumerate(boxes):
-                x = box.get_xdata()[0]
-                y_min, y_q1, y_median, y_q3, y_max = np.percentile(plot_data[plot_data[x_field] == labels[i]][y_field],
-                                                                    [0, 25, 50, 75, 100])
-                ax.text(x, y_min, f'{y_min:.2f}', fontsize=8, ha='center', va='top')
-                ax.text(x, y_q1, f'{y_q1:.2f}', fontsize=8, ha='center', va='top')
-                ax.text(x, y_median, f'{y_median:.2f}', fontsize=8, ha='center', va='bottom')
-                ax.text(x, y_q3, f'{y_q3:.2f}', fontsize=8, ha='center', va='bottom')
-                ax.text(x, y_max, f'{y_max:.2f}', fontsize=8, ha='center', va='bottom')
-
-    except Exception as e:
-        ax.clear()
-        ax.text(0.5, 0.5, str(e), ha='center', va='center')
-        return
-
-    # Customizing the plot
-    ax.set_xlabel(x_field, fontsize=x_axis_font_size_var.get())
-    ax.set_ylabel(y_field, fontsize=y_axis_font_size_var.get())
-    ax.set_title(f"Box Plot of {y_field} vs. {x_field}")
-
-    # Rotate x-axis labels if there are too many categories
-    if plot_data[x_field].nunique() > 10:
-        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
-
-    # Adjust plot layout
-    plt.tight_layout()
-
-
-def plot_pie(ax, plot_data, x_selected_fields, title_font_size, label_font_size):
-    # Check if exactly one field is selected for the pie chart
-    if not x_selected_fields or len(x_selected_fields) != 1:
-        messagebox.showerror("Pie - Error", "Pie Chart requires exactly one field selected for the X Axis.")
-        return
-    
-    x_field = x_selected_fields[0]
-    
-    # Validate the field exists in the dataframe
-    if x_field not in plot_data.columns:
-        messagebox.showerror("Pie - Error", f"Field '{x_field}' not found in data.")
-        return
-    
-    # Check if the data type is categorical
-    if pd.api.types.is_numeric_dtype(plot_data[x_field]):
-        messagebox.showerror("Error", "Pie Chart requires categorical data, not numeric data.")
-        return
-
-    # Aggregate the category counts
-    try:
-        category_counts = plot_data[x_field].value_counts()
-    except Exception as e:
-        messagebox.showerror("Pie - Error", f"An error occurred while counting categories: {e}")
-        return
-
-    num_categories = len(category_counts)
-
-    # Check if there are more than 10 categories
-    if num_categories > 10:
-        # Ask user how many categories they want to display
-        while True:
-            user_input = simpledialog.askinteger("Input", f"More than 10 categories found. Enter the number of categories to display (max {num_categories}):",
-                                                 minvalue=1, maxvalue=num_categories)
-            if user_input is None:
-                messagebox.showinfo("Pie - Info", "Operation cancelled by user.")
-                return
-            if 1 <= user_input <= num_categories:
-                break
-            else:
-                messagebox.showerror("Invalid Input", f"Please enter a number between 1 and {num_categories}.")
-
-        # Group categories beyond the user specified number into 'Other'
-        if user_input < num_categories:
-            category_counts = pd.concat([category_counts[:user_input], pd.Series([category_counts[user_input:].sum()], index=['Other'])])
-
-    # Define colors for the pie chart; use a colormap for a large number of categories
-    cmap = plt.get_cmap("tab20")
-    colors = [cmap(i) for i in range(len(category_counts))]
-
-    # Plot the pie chart
-    wedges, texts, autotexts = ax.pie(category_counts, labels=category_counts.index, autopct='%1.1f%%',
-                                      startangle=90, colors=colors, wedgeprops=dict(width=0.98, edgecolor='black', linewidth=1.5))
-
-    # Customize the title and appearance
-    ax.set_title(f"Pie Chart: {x_field}", fontsize=title_font_size, fontweight='bold', color='navy')
-    ax.axis('equal')  # Equal aspect ratio ensures the pie chart is circular.
-
-    # Customize legend and text labels
-    ax.legend(wedges, category_counts.index, title=x_field, loc="center left", bbox_to_anchor=(1, 0, 0.5, 1), fontsize=label_font_size)
-    
-    for text in autotexts:
-        text.set_color('black')
-        text.set_fontsize(label_font_size)
-        text.set_weight('bold')
-    for text in texts:
-        text.set_fontsize(label_font_size)
-        text.set_color('darkblue')
-
-    plt.setp(autotexts, size=label_font_size, weight="bold", color="white")
-
-
-def plot_column(ax, plot_data):
-    if len(x_selected_fields) != 1 or len(y_selected_fields) != 1:
-        messagebox.showerror("ColumnBar - Error", "Column plot requires exactly one X field and one Y field.")
-        return
-
-    # Ensure y-axis data is numeric
-    if not pd.api.types.is_numeric_dtype(plot_data[y_selected_fields[0]]):
-        messagebox.showerror("ColumnBar - Error", "Y-axis data must be numeric (int or float) for column plots.")
-        return
-
-    try:
-        # Convert X and Y fields to numeric types, handling non-convertible data by coercion
-        plot_data[x_selected_fields[0]] = pd.to_numeric(plot_data[x_selected_fields[0]], errors='coerce')
-        plot_data[y_selected_fields[0]] = pd.to_numeric(plot_data[y_selected_fields[0]], errors='coerce')
-
-        # Check if conversion was successful; NaNs indicate failed conversion
-        if plot_data[x_selected_fields[0]].isnull().any() or plot_data[y_selected_fields[0]].isnull().any():
-            messagebox.showerror("ColumnBar - Error", "Non-numeric data found in fields after conversion attempt.")
-            return
-
-        # Remove rows with NaN values resulting from 'coerce'
-        plot_data = plot_data.dropna(subset=[x_selected_fields[0], y_selected_fields[0]])
-
-        # Aggregating data by the X field
-        aggregated_data = plot_data.groupby(x_selected_fields[0], as_index=False)[y_selected_fields[0]].mean()
-        order, max_items = ask_for_bar_customization()
-        if order is None or max_items is None:
-            messagebox.showwarning("ColumnBar - Warning", "Sorting order or max items not specified.")
-            return
-        
-        if order and max_items:
-            aggregated_data = aggregated_data.nlargest(max_items, y_selected_fields[0]) if order == 'desc' else aggregated_data.nsmallest(max_items, y_selected_fields[0])
-
-        x = aggregated_data[x_selected_fields[0]].astype(str)
-        y = aggregated_data[y_selected_fields[0]]
-
-        if use_seaborn.get():
-            bars = sns.barplot(data=aggregated_data, x=y_selected_fields[0], y=x_selected_fields[0], ax=ax, color='lightblue', orient='h')
-        else:
-            bars = ax.barh(x, y, color='lightblue')
-
-        ax.set_yticks(range(len(x)))
-        ax.set_yticklabels(x, rotation=y_tick_label_rotation_var.get(), fontsize=int(y_axis_font_size_var.get()))
-
-        if display_values.get():
-            font_size = int(value_label_font_size_var.get())
-            display_values_on_bars(ax, bars, font_size=font_size)
-
-    except Exception as e:
-        messagebox.showerror("ColumnBar - Error", f"Failed to plot column chart: {str(e)}")
+            answers['top_n'] = ask_for_pie_categories(num_categories)
+            if answers['top_n'] is None:
+                return None
+    return answers
 
 def analyze_data_types(selected_fields):
     if not selected_fields:
         return None
-    data_types = dataset[selected_fields].dtypes
+    data_types = original_dataset.dtypes[selected_fields]
     if all(dtype.kind in 'fi' for dtype in data_types):  # Check if all are float or int
         return 'numeric'
-    elif all(dtype.kind in 'O' or dtype.name == 'category' for dtype in data_types):  # Check if all are object or category
+    elif all(is_categorical_like(dtype) for dtype in data_types):  # Check if all are object, category or string
         return 'categorical'
     else:
         return 'mixed'
@@ -1115,7 +906,51 @@ def check_chart_suitability():
         messagebox.showinfo("Chart Type Suitability", f"{chart_type} is suitable for the selected data types.")
 
 
+def display_options():
+    """The window's display settings as panel options; dashboards and chart batches are drawn without them."""
+    return {'regression': bool(display_aggression.get()), 'seaborn': bool(use_seaborn.get()), 'value_labels': bool(display_values.get()),
+            'value_label_font_size': int(value_label_font_size_var.get()), 'skew': bool(display_skew.get()),
+            'title_font_size': int(title_font_size_var.get()), 'x_axis_font_size': int(x_axis_font_size_var.get()),
+            'y_axis_font_size': int(y_axis_font_size_var.get()),
+            'x_rotation': x_tick_label_rotation_var.get(), 'y_rotation': y_tick_label_rotation_var.get()}
+
+def chart_title(chart_type, x_fields, y_fields):
+    return f"{chart_type}: {', '.join(x_fields)} vs {', '.join(y_fields)}"
+
+def prepare_chart(chart_type, x_fields, y_fields, answers, data=None):
+    """The dashboard panel of one chart of the current view, with the window's settings and the chart's dialog answers.
+
+    data is the (plot data, histogram summary) pair from chart_data when the caller already has it.
+    """
+    plot_data, summary = data if data is not None else chart_data(chart_type, x_fields, y_fields)
+    version = None if plot_data is None else view_version(plot_data, list(dict.fromkeys(x_fields + y_fields)))
+    options = dict(DEFAULT_OPTIONS, **chart_options(), **display_options(), **answers, follow_zoom=True)
+    return prepare_panel(chart_type, chart_title(chart_type, x_fields, y_fields), plot_data, x_fields, y_fields, options,
+                         aggregations, histograms, version, time_rollups, counts=category_counts, summary=summary)
+
+def show_embedded_chart(data=None):
+    """Draw embedded_chart into the pane; a repeat of the shown chart only updates its data."""
+    chart_type, x_fields, y_fields, answers = embedded_chart
+    try:
+        panel = prepare_chart(chart_type, x_fields, y_fields, answers, data)
+    except Exception as e:
+        chart_pane.show_error(chart_title(chart_type, x_fields, y_fields), f"{type(e).__name__}: {e}")
+        return
+    # The aggregation is part of the data, not the key, so switching it updates the chart in place
+    chart_pane.show(panel, (chart_type, tuple(x_fields), tuple(y_fields)))
+    chart_pane.set_overlay_visible(bool(display_aggression.get()))
+
+def refresh_embedded_chart():
+    """Redo the chart in the embedded pane after the filters or the aggregation method changed."""
+    if embedded_chart is not None:
+        show_embedded_chart()
+
 def generate_visualization():
+    global embedded_chart
+    if generate_all_var.get():
+        generate_all_charts()
+        return
+
     chart_type_errors = {}
     chart_type = chart_type_dropdown.get()
 
@@ -1129,60 +964,29 @@ def generate_visualization():
             messagebox.showerror("Generating - Error", "Select at least one field for both X and Y axes.")
             return
 
-    # Setup general plot parameters
-    title_font_size = int(title_font_size_var.get())
-    x_tick_label_font_size = int(x_axis_font_size_var.get())
-    y_tick_label_font_size = int(y_axis_font_size_var.get())
-    x_tick_label_rotation = x_tick_label_rotation_var.get()
-    y_tick_label_rotation = y_tick_label_rotation_var.get()
-
-    generate_all = generate_all_var.get()
-    chart_types = ["Histogram", "Line", "Bar", "Column", "Area", "Stacked Bar", "Scatter Plot", "Dual Axes", "Box Plot", "Pie Chart"] if generate_all else [chart_type]
+    x_fields, y_fields = list(x_selected_fields), list(y_selected_fields)
+    if use_seaborn.get():
+        sns.set(style="whitegrid")  # Before the axes are created, which take their style from it
 
-    for chart_type in chart_types:
-        try:
+    try:
+        # A streamed histogram has no plot data; its bins are counted from the file in chunks
+        data = chart_data(chart_type, x_fields, y_fields)
+        answers = ask_chart_answers(chart_type, *data, x_fields, y_fields)
+        if answers is not None and embed_chart_var.get():
+            embedded_chart = (chart_type, x_fields, y_fields, answers)
+            show_embedded_chart(data)
+            return
+        if answers is not None:
+            # The same panel the chart pane and render_charts.py draw, in its own window
+            panel = prepare_chart(chart_type, x_fields, y_fields, answers, data)
             fig, ax = plt.subplots(figsize=get_chart_size())
-            if use_seaborn.get():
-                sns.set(style="whitegrid")
-
-            plot_data = dataset[list(set(x_selected_fields + y_selected_fields))]
-
-            # Dictionary mapping chart types to their respective plotting functions
-            chart_functions = {
-                "Pie Chart": plot_pie,
-                "Bar": plot_bar,
-                "Column": plot_column,
-                "Area": plot_area,
-                "Stacked Bar": plot_stacked_bar,
-                "Scatter Plot": plot_scatter,
-                "Dual Axes": plot_dual_axes,
-                "Histogram": plot_histogram,
-                "Box Plot": plot_box,
-                "Line": plot_line
-            }
-
-            chart_function = chart_functions.get(chart_type)
-            if chart_function:
-                if chart_type == "Pie Chart":
-                    chart_function(ax, plot_data, x_selected_fields, title_font_size, int(value_label_font_size_var.get()))
-                elif chart_type == "Histogram":
-                    chart_function(ax, plot_data, x_selected_fields)
-                elif chart_type == "Box Plot":
-                    chart_function(ax, plot_data, x_selected_fields, y_selected_fields, use_seaborn, display_values)
-                else:
-                    chart_function(ax, plot_data, x_selected_fields, y_selected_fields, aggregation_method_var.get(), use_seaborn.get(), display_values.get(), int(value_label_font_size_var.get()))
-                
-            ax.set_xlabel(", ".join(x_selected_fields), fontsize=x_tick_label_font_size)
-            ax.set_ylabel(", ".join(y_selected_fields), fontsize=y_tick_label_font_size)
-            ax.set_title(f"{chart_type}: {', '.join(x_selected_fields)} vs {', '.join(y_selected_fields)}", fontsize=title_font_size)
-            ax.tick_params(axis='x', labelsize=x_tick_label_font_size, rotation=x_tick_label_rotation)
-            ax.tick_params(axis='y', labelsize=y_tick_label_font_size, rotation=y_tick_label_rotation)
-
-            plt.tight_layout()
+            draw_panel(ax, panel)
+            fig.tight_layout()
             plt.show()
+            plt.close(fig)  # pyplot keeps every figure alive until it is closed
 
-        except Exception as e:
-            chart_type_errors[chart_type] = str(e)
+    except Exception as e:
+        chart_type_errors[chart_type] = str(e)
 
     if chart_type_errors:
         error_message = "Visualizations failed - chart types:\n" + "\n".join(f"{k}: {v}" for k, v in chart_type_errors.items())
@@ -1207,162 +1011,212 @@ def clear_selections():
     y_axis_label["text"] = "Y Axis:"
     recommendation_label["text"] = ""
 
-# GUI components
-frame = ttk.Frame(root, padding="10")
-frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-
-load_button = ttk.Button(frame, text="Load File", command=load_file)
-load_button.grid(column=0, row=0, padx=10, pady=1)
-
-filter_label = ttk.Label(frame, text="")
-filter_label.grid(column=1, row=1, padx=10, pady=1)
-
-filter_button = ttk.Button(frame, text="Filter", command=filter_data)
-filter_button.grid(column=2, row=1, padx=10, pady=1)
-
-use_seaborn = tk.BooleanVar()
-use_seaborn.set(False)
-seaborn_label = ttk.Label(frame, text="Use Seaborn:")
-seaborn_label.grid(column=0, row=2, padx=10, pady=1)
-seaborn_radio_button = ttk.Radiobutton(frame, text="Yes", variable=use_seaborn, value=True)
-seaborn_radio_button.grid(column=1, row=2, padx=10, pady=1)
-matplotlib_radio_button = ttk.Radiobutton(frame, text="No", variable=use_seaborn, value=False)
-matplotlib_radio_button.grid(column=2, row=2, padx=10, pady=1)
-
-x_axis_label = ttk.Label(frame, text="X Axis Field:")
-x_axis_label.grid(column=0, row=3, padx=10, pady=10)
-x_axis_listbox = Listbox(frame, selectmode=MULTIPLE, width=30, height=5)
-x_axis_listbox.grid(column=1, row=3, padx=10, pady=10)
-
-store_x_button = ttk.Button(frame, text="Store X-Axis Selection", command=store_x_axis_selection)
-store_x_button.grid(column=2, row=3, padx=10, pady=10)
-
-y_axis_label = ttk.Label(frame, text="Y Axis Field:")
-y_axis_label.grid(column=0, row=4, padx=10, pady=10)
-y_axis_listbox = Listbox(frame, selectmode=MULTIPLE, width=30, height=5)
-y_axis_listbox.grid(column=1, row=4, padx=10, pady=10)
-
-store_y_button = ttk.Button(frame, text="Store Y-Axis Selection", command=store_y_axis_selection)
-store_y_button.grid(column=2, row=4, padx=10, pady=10)
-
-chart_type_label = ttk.Label(frame, text="Chart Type:")
-chart_type_label.grid(column=0, row=5, padx=10, pady=10)
-chart_type_dropdown = ttk.Combobox(frame)
-chart_type_dropdown.grid(column=1, row=5, padx=10, pady=10)
-chart_type_dropdown["values"] = ["Line", "Bar", "Column", "Area", "Stacked Bar", "Scatter Plot", "Dual Axes", "Histogram", "Box Plot", "Pie Chart"]
-chart_type_dropdown.bind("<<ComboboxSelected>>", lambda event: [check_chart_suitability(), update_aggression_options_based_on_chart_type()])
-
-title_font_size_label = ttk.Label(frame, text="Title Font Size:")
-title_font_size_label.grid(column=0, row=6, padx=10, pady=1)
-title_font_size_var = tk.StringVar()
-title_font_size_var.set("14")
-title_font_size_entry = ttk.Entry(frame, textvariable=title_font_size_var)
-title_font_size_entry.grid(column=1, row=6, padx=10, pady=1)
-
-x_axis_font_size_label = ttk.Label(frame, text="X-Axis Font Size:")
-x_axis_font_size_label.grid(column=0, row=7, padx=10, pady=1)
-x_axis_font_size_var = tk.StringVar()
-x_axis_font_size_var.set("10")
-x_axis_font_size_entry = ttk.Entry(frame, textvariable=x_axis_font_size_var)
-x_axis_font_size_entry.grid(column=1, row=7, padx=10, pady=1)
-
-y_axis_font_size_label = ttk.Label(frame, text="Y-Axis Font Size:")
-y_axis_font_size_label.grid(column=0, row=8, padx=10, pady=1)
-y_axis_font_size_var = tk.StringVar()
-y_axis_font_size_var.set("10")
-y_axis_font_size_entry = ttk.Entry(frame, textvariable=y_axis_font_size_var)
-y_axis_font_size_entry.grid(column=1, row=8, padx=10, pady=1)
-
-# Font size input for the value labels
-value_label_font_size_var = tk.StringVar(value="7")
-value_label_font_size_label = ttk.Label(frame, text="Bar / Line Count Label Size:")
-value_label_font_size_entry = ttk.Entry(frame, textvariable=value_label_font_size_var, width=5)
-value_label_font_size_label.grid(column=0, row=9, padx=10, pady=1)
-value_label_font_size_entry.grid(column=1, row=9, padx=10, pady=1)
-
-x_tick_label_rotation_label = ttk.Label(frame, text="X-Axis Tick Label Rotation:")
-x_tick_label_rotation_label.grid(column=0, row=10, padx=10, pady=1)
-x_tick_label_rotation_var = tk.IntVar()
-x_tick_label_rotation_var.set(45)
-x_radio_0 = ttk.Radiobutton(frame, text="0", variable=x_tick_label_rotation_var, value=0)
-x_radio_0.grid(column=1, row=10, padx=5, pady=1)
-x_radio_45 = ttk.Radiobutton(frame, text="45", variable=x_tick_label_rotation_var, value=45)
-x_radio_45.grid(column=2, row=10, padx=5, pady=1)
-x_radio_90 = ttk.Radiobutton(frame, text="90", variable=x_tick_label_rotation_var, value=90)
-x_radio_90.grid(column=3, row=10, padx=5, pady=1)
-
-y_tick_label_rotation_label = ttk.Label(frame, text="Y-Axis Tick Label Rotation:")
-y_tick_label_rotation_label.grid(column=0, row=11, padx=10, pady=1)
-y_tick_label_rotation_var = tk.IntVar()
-y_tick_label_rotation_var.set(0)
-y_radio_0 = ttk.Radiobutton(frame, text="0", variable=y_tick_label_rotation_var, value=0)
-y_radio_0.grid(column=1, row=11, padx=5, pady=1)
-y_radio_45 = ttk.Radiobutton(frame, text="45", variable=y_tick_label_rotation_var, value=45)
-y_radio_45.grid(column=2, row=11, padx=5, pady=1)
-y_radio_90 = ttk.Radiobutton(frame, text="90", variable=y_tick_label_rotation_var, value=90)
-y_radio_90.grid(column=3, row=11, padx=5, pady=1)
-
-chart_size_label = ttk.Label(frame, text="Chart Size:")
-chart_size_label.grid(column=0, row=12, padx=10, pady=1)
-chart_size = tk.StringVar()
-chart_size.set("Medium")
-chart_size_radio1 = ttk.Radiobutton(frame, text="Small", variable=chart_size, value="Small")
-chart_size_radio1.grid(column=1, row=12, padx=5, pady=1)
-chart_size_radio2 = ttk.Radiobutton(frame, text="Medium", variable=chart_size, value="Medium")
-chart_size_radio2.grid(column=2, row=12, padx=5, pady=1)
-chart_size_radio3 = ttk.Radiobutton(frame, text="Large", variable=chart_size, value="Large")
-chart_size_radio3.grid(column=3, row=12, padx=5, pady=1)
-
-recommendation_button = ttk.Button(frame, text="Update Recommendation", command=recommend_chart)
-recommendation_button.grid(column=0, row=13, padx=10, pady=1)
-
-visualize_button = ttk.Button(frame, text="Visualize", command=generate_visualization)
-visualize_button.grid(column=1, row=13, padx=5, pady=1)
-
-# Add the button for saving the dashboard
-dashboard_button = ttk.Button(frame, text="Generate Dashboard", command=generate_dashboard_and_save)
-dashboard_button.grid(column=2, row=13, pady=5, padx=1)
-
-clear_button = ttk.Button(frame, text="Clear Selection", command=clear_selections)
-clear_button.grid(column=1, row=14, padx=5, pady=1)
-
-recommendation_label = ttk.Label(frame, text="")
-recommendation_label.grid(row=14, column=0, padx=10, pady=1)
-
-generate_all_var = tk.BooleanVar()
-generate_all_checkbutton = tk.Checkbutton(frame, text="Generate All Charts", variable=generate_all_var)
-generate_all_checkbutton.grid(column=0, row=15, padx=10, pady=1)
-
-# Checkbox for Display Aggression Line in Scatter Plot
-display_aggression = tk.IntVar()
-aggression_checkbutton = tk.Checkbutton(frame, text="Display Aggression Line", variable=display_aggression)
-aggression_checkbutton.grid(column=1, row=15, padx=10, pady=1)
-
-# Checkbox for Display Skew Line in Histogram
-display_skew = tk.IntVar()
-skew_line_checkbutton = tk.Checkbutton(frame, text="Display Skew Line", variable=display_skew)
-skew_line_checkbutton.grid(column=2, row=15, padx=10, pady=1)
-
-# Checkbox for displaying values on bars/lines
-display_values = tk.IntVar(value=0)
-display_values_checkbutton = tk.Checkbutton(frame, text="Display Values", variable=display_values)
-display_values_checkbutton.grid(column=0, row=16, padx=10, pady=1)
-
-# Checkbox for customization option
-enable_customization = tk.IntVar()
-customization_checkbutton = tk.Checkbutton(frame, text="Enable Customization", variable=enable_customization)
-customization_checkbutton.grid(column=1, row=16, padx=10, pady=1)
-
-# Create a variable to store the selected aggregation method
-aggregation_method_var = tk.StringVar(value='mean')
-
-# Create a dropdown menu for selecting the aggregation method
-aggregation_method_dropdown = ttk.Combobox(frame, textvariable=aggregation_method_var, state='readonly')
-aggregation_method_dropdown['values'] = ['mean', 'sum', 'median', 'max', 'min']
-aggregation_method_dropdown.grid(column=2, row=16, padx=10, pady=1)
-
-# Initial state setup for these options
-aggression_checkbutton.config(state=tk.DISABLED)
-skew_line_checkbutton.config(state=tk.DISABLED)
-
-root.mainloop()
+if __name__ == "__main__":
+    # GUI components. Worker processes started with "spawn" re-import this script as __mp_main__, and the guard
+    # keeps them from opening a window; the widgets are still module globals that the functions above rely on,
+    # so this file is a script, not a module to import
+    root = tk.Tk()
+    root.title("CSV/Excel Data Visualizer V1.5.4.0519.3")
+
+    frame = ttk.Frame(root, padding="10")
+    frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+    load_button = ttk.Button(frame, text="Load File", command=load_file)
+    load_button.grid(column=0, row=0, padx=10, pady=1)
+
+    dataset_info_label = ttk.Label(frame, text="")
+    dataset_info_label.grid(column=1, row=0, columnspan=3, padx=10, pady=1, sticky=tk.W)
+
+    # Lazy mode only reads the header at open time and fetches columns when a chart needs them
+    lazy_loading_var = tk.BooleanVar(value=False)
+    lazy_loading_checkbutton = tk.Checkbutton(frame, text="Load Columns on Demand", variable=lazy_loading_var)
+    lazy_loading_checkbutton.grid(column=0, row=1, padx=10, pady=1)
+
+    filter_label = ttk.Label(frame, text="")
+    filter_label.grid(column=1, row=1, padx=10, pady=1)
+
+    filter_button = ttk.Button(frame, text="Filter", command=filter_data)
+    filter_button.grid(column=2, row=1, padx=10, pady=1)
+
+    load_folder_button = ttk.Button(frame, text="Load Folder", command=load_folder)
+    load_folder_button.grid(column=3, row=1, padx=10, pady=1)
+
+    use_seaborn = tk.BooleanVar()
+    use_seaborn.set(False)
+    seaborn_label = ttk.Label(frame, text="Use Seaborn:")
+    seaborn_label.grid(column=0, row=2, padx=10, pady=1)
+    seaborn_radio_button = ttk.Radiobutton(frame, text="Yes", variable=use_seaborn, value=True)
+    seaborn_radio_button.grid(column=1, row=2, padx=10, pady=1)
+    matplotlib_radio_button = ttk.Radiobutton(frame, text="No", variable=use_seaborn, value=False)
+    matplotlib_radio_button.grid(column=2, row=2, padx=10, pady=1)
+
+    x_axis_label = ttk.Label(frame, text="X Axis Field:")
+    x_axis_label.grid(column=0, row=3, padx=10, pady=10)
+    x_axis_listbox = Listbox(frame, selectmode=MULTIPLE, width=30, height=5)
+    x_axis_listbox.grid(column=1, row=3, padx=10, pady=10)
+
+    store_x_button = ttk.Button(frame, text="Store X-Axis Selection", command=store_x_axis_selection)
+    store_x_button.grid(column=2, row=3, padx=10, pady=10)
+
+    y_axis_label = ttk.Label(frame, text="Y Axis Field:")
+    y_axis_label.grid(column=0, row=4, padx=10, pady=10)
+    y_axis_listbox = Listbox(frame, selectmode=MULTIPLE, width=30, height=5)
+    y_axis_listbox.grid(column=1, row=4, padx=10, pady=10)
+
+    store_y_button = ttk.Button(frame, text="Store Y-Axis Selection", command=store_y_axis_selection)
+    store_y_button.grid(column=2, row=4, padx=10, pady=10)
+
+    chart_type_label = ttk.Label(frame, text="Chart Type:")
+    chart_type_label.grid(column=0, row=5, padx=10, pady=10)
+    chart_type_dropdown = ttk.Combobox(frame)
+    chart_type_dropdown.grid(column=1, row=5, padx=10, pady=10)
+    chart_type_dropdown["values"] = ["Line", "Bar", "Column", "Area", "Stacked Bar", "Scatter Plot", "Dual Axes", "Histogram", "Box Plot", "Pie Chart"]
+    chart_type_dropdown.bind("<<ComboboxSelected>>", lambda event: [check_chart_suitability(), update_aggression_options_based_on_chart_type()])
+
+    title_font_size_label = ttk.Label(frame, text="Title Font Size:")
+    title_font_size_label.grid(column=0, row=6, padx=10, pady=1)
+    title_font_size_var = tk.StringVar()
+    title_font_size_var.set("14")
+    title_font_size_entry = ttk.Entry(frame, textvariable=title_font_size_var)
+    title_font_size_entry.grid(column=1, row=6, padx=10, pady=1)
+
+    x_axis_font_size_label = ttk.Label(frame, text="X-Axis Font Size:")
+    x_axis_font_size_label.grid(column=0, row=7, padx=10, pady=1)
+    x_axis_font_size_var = tk.StringVar()
+    x_axis_font_size_var.set("10")
+    x_axis_font_size_entry = ttk.Entry(frame, textvariable=x_axis_font_size_var)
+    x_axis_font_size_entry.grid(column=1, row=7, padx=10, pady=1)
+
+    y_axis_font_size_label = ttk.Label(frame, text="Y-Axis Font Size:")
+    y_axis_font_size_label.grid(column=0, row=8, padx=10, pady=1)
+    y_axis_font_size_var = tk.StringVar()
+    y_axis_font_size_var.set("10")
+    y_axis_font_size_entry = ttk.Entry(frame, textvariable=y_axis_font_size_var)
+    y_axis_font_size_entry.grid(column=1, row=8, padx=10, pady=1)
+
+    # Font size input for the value labels
+    value_label_font_size_var = tk.StringVar(value="7")
+    value_label_font_size_label = ttk.Label(frame, text="Bar / Line Count Label Size:")
+    value_label_font_size_entry = ttk.Entry(frame, textvariable=value_label_font_size_var, width=5)
+    value_label_font_size_label.grid(column=0, row=9, padx=10, pady=1)
+    value_label_font_size_entry.grid(column=1, row=9, padx=10, pady=1)
+
+    x_tick_label_rotation_label = ttk.Label(frame, text="X-Axis Tick Label Rotation:")
+    x_tick_label_rotation_label.grid(column=0, row=10, padx=10, pady=1)
+    x_tick_label_rotation_var = tk.IntVar()
+    x_tick_label_rotation_var.set(45)
+    x_radio_0 = ttk.Radiobutton(frame, text="0", variable=x_tick_label_rotation_var, value=0)
+    x_radio_0.grid(column=1, row=10, padx=5, pady=1)
+    x_radio_45 = ttk.Radiobutton(frame, text="45", variable=x_tick_label_rotation_var, value=45)
+    x_radio_45.grid(column=2, row=10, padx=5, pady=1)
+    x_radio_90 = ttk.Radiobutton(frame, text="90", variable=x_tick_label_rotation_var, value=90)
+    x_radio_90.grid(column=3, row=10, padx=5, pady=1)
+
+    y_tick_label_rotation_label = ttk.Label(frame, text="Y-Axis Tick Label Rotation:")
+    y_tick_label_rotation_label.grid(column=0, row=11, padx=10, pady=1)
+    y_tick_label_rotation_var = tk.IntVar()
+    y_tick_label_rotation_var.set(0)
+    y_radio_0 = ttk.Radiobutton(frame, text="0", variable=y_tick_label_rotation_var, value=0)
+    y_radio_0.grid(column=1, row=11, padx=5, pady=1)
+    y_radio_45 = ttk.Radiobutton(frame, text="45", variable=y_tick_label_rotation_var, value=45)
+    y_radio_45.grid(column=2, row=11, padx=5, pady=1)
+    y_radio_90 = ttk.Radiobutton(frame, text="90", variable=y_tick_label_rotation_var, value=90)
+    y_radio_90.grid(column=3, row=11, padx=5, pady=1)
+
+    chart_size_label = ttk.Label(frame, text="Chart Size:")
+    chart_size_label.grid(column=0, row=12, padx=10, pady=1)
+    chart_size = tk.StringVar()
+    chart_size.set("Medium")
+    chart_size_radio1 = ttk.Radiobutton(frame, text="Small", variable=chart_size, value="Small")
+    chart_size_radio1.grid(column=1, row=12, padx=5, pady=1)
+    chart_size_radio2 = ttk.Radiobutton(frame, text="Medium", variable=chart_size, value="Medium")
+    chart_size_radio2.grid(column=2, row=12, padx=5, pady=1)
+    chart_size_radio3 = ttk.Radiobutton(frame, text="Large", variable=chart_size, value="Large")
+    chart_size_radio3.grid(column=3, row=12, padx=5, pady=1)
+
+    recommendation_button = ttk.Button(frame, text="Update Recommendation", command=recommend_chart)
+    recommendation_button.grid(column=0, row=13, padx=10, pady=1)
+
+    visualize_button = ttk.Button(frame, text="Visualize", command=generate_visualization)
+    visualize_button.grid(column=1, row=13, padx=5, pady=1)
+
+    # Add the button for saving the dashboard
+    dashboard_button = ttk.Button(frame, text="Generate Dashboard", command=generate_dashboard_and_save)
+    dashboard_button.grid(column=2, row=13, pady=5, padx=1)
+
+    clear_button = ttk.Button(frame, text="Clear Selection", command=clear_selections)
+    clear_button.grid(column=1, row=14, padx=5, pady=1)
+
+    recommendation_label = ttk.Label(frame, text="")
+    recommendation_label.grid(row=14, column=0, padx=10, pady=1)
+
+    generate_all_var = tk.BooleanVar()
+    generate_all_checkbutton = tk.Checkbutton(frame, text="Generate All Charts", variable=generate_all_var)
+    generate_all_checkbutton.grid(column=0, row=15, padx=10, pady=1)
+
+    # Checkbox for Display Aggression Line in Scatter Plot
+    display_aggression = tk.IntVar()
+    # Toggling the line on an embedded scatter plot only blits the overlay
+    aggression_checkbutton = tk.Checkbutton(frame, text="Display Aggression Line", variable=display_aggression,
+                                            command=lambda: chart_pane.set_overlay_visible(bool(display_aggression.get())))
+    aggression_checkbutton.grid(column=1, row=15, padx=10, pady=1)
+
+    # Checkbox for Display Skew Line in Histogram
+    display_skew = tk.IntVar()
+    skew_line_checkbutton = tk.Checkbutton(frame, text="Display Skew Line", variable=display_skew)
+    skew_line_checkbutton.grid(column=2, row=15, padx=10, pady=1)
+
+    # Checkbox for displaying values on bars/lines
+    display_values = tk.IntVar(value=0)
+    display_values_checkbutton = tk.Checkbutton(frame, text="Display Values", variable=display_values)
+    display_values_checkbutton.grid(column=0, row=16, padx=10, pady=1)
+
+    # Checkbox for customization option
+    enable_customization = tk.IntVar()
+    customization_checkbutton = tk.Checkbutton(frame, text="Enable Customization", variable=enable_customization)
+    customization_checkbutton.grid(column=1, row=16, padx=10, pady=1)
+
+    # Create a variable to store the selected aggregation method
+    aggregation_method_var = tk.StringVar(value='mean')
+
+    # Create a dropdown menu for selecting the aggregation method
+    aggregation_method_dropdown = ttk.Combobox(frame, textvariable=aggregation_method_var, state='readonly')
+    aggregation_method_dropdown['values'] = ['mean', 'sum', 'median', 'max', 'min', 'count']
+    aggregation_method_dropdown.grid(column=2, row=16, padx=10, pady=1)
+    aggregation_method_dropdown.bind("<<ComboboxSelected>>", lambda event: refresh_embedded_chart())
+
+    # Downsampling of Line, Area and Dual Axes charts
+    downsample_var = tk.BooleanVar(value=True)
+    downsample_checkbutton = tk.Checkbutton(frame, text="Downsample Lines", variable=downsample_var)
+    downsample_checkbutton.grid(column=0, row=17, padx=10, pady=1)
+    point_budget_label = ttk.Label(frame, text="Max Points per Line:")
+    point_budget_label.grid(column=1, row=17, padx=10, pady=1)
+    point_budget_var = tk.StringVar(value=str(DEFAULT_POINT_BUDGET))
+    point_budget_entry = ttk.Entry(frame, textvariable=point_budget_var, width=8)
+    point_budget_entry.grid(column=2, row=17, padx=10, pady=1)
+
+    # Box plots of very large groups can estimate quartiles from a sample instead of sorting every value
+    approximate_quantiles_var = tk.BooleanVar(value=False)
+    approximate_quantiles_checkbutton = tk.Checkbutton(frame, text="Approximate Quartiles", variable=approximate_quantiles_var)
+    approximate_quantiles_checkbutton.grid(column=0, row=18, padx=10, pady=1)
+
+    # Charts are drawn into one reusable figure beside the controls instead of a new window each time
+    embed_chart_var = tk.BooleanVar(value=True)
+    embed_chart_checkbutton = tk.Checkbutton(frame, text="Embed Chart in Main Window", variable=embed_chart_var)
+    embed_chart_checkbutton.grid(column=1, row=18, padx=10, pady=1)
+
+    # A session keeps the UI state, the filters and a snapshot of the data to memory-map on reopen
+    save_session_button = ttk.Button(frame, text="Save Session", command=save_session_file)
+    save_session_button.grid(column=0, row=19, padx=10, pady=1)
+    open_session_button = ttk.Button(frame, text="Open Session", command=open_session_file)
+    open_session_button.grid(column=1, row=19, padx=10, pady=1)
+    chart_pane = ChartPane(root)
+    chart_pane.widget.grid(row=0, column=1, padx=10, pady=10, sticky=(tk.W, tk.E, tk.N, tk.S))
+    root.columnconfigure(1, weight=1)
+    root.rowconfigure(0, weight=1)
+
+    # Initial state setup for these options
+    aggression_checkbutton.config(state=tk.DISABLED)
+    skew_line_checkbutton.config(state=tk.DISABLED)
+
+    root.mainloop()
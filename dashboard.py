@@ -0,0 +1,740 @@
+import io
+import math
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+from PIL import Image
+
+try:
+    import seaborn as sns
+except ImportError:  # Seaborn styling is optional; charts asking for it are drawn with plain Matplotlib
+    sns = None
+
+from aggregation_engine import APPROX_SAMPLE_SIZE, AggregationEngine
+from column_stats import is_categorical_like
+from data_loading import available_cpus
+from histogram_engine import HistogramCache
+from plot_helpers import (DEFAULT_POINT_BUDGET, DENSITY_THRESHOLD, STAIRS_MIN_BINS, add_value_labels, density_grid, downsample_frame,
+                          draw_histogram_bars, label_bars)
+from time_rollups import LEVEL_UNITS, ROLLUP_METHODS, RollupCache, bucket_column, follow_zoom, suggest_level
+from top_k import CategoryCounts, top_rows
+
+# (chart type, panel title) in dashboard order, three panels per row
+DASHBOARD_PANELS = (
+    ("Line", "Line Plot"),
+    ("Bar", "Bar Chart"),
+    ("Column", "Column Chart"),
+    ("Stacked Bar", "Stacked Bar Chart"),
+    ("Scatter Plot", "Scatter Plot"),
+    ("Dual Axes", "Dual Axes Plot"),
+    ("Histogram", "Histogram"),
+    ("Box Plot", "Box Plot"),
+    ("Pie Chart", "Pie Chart"),
+)
+# Every chart type, in the order "Generate All Charts" renders them
+ALL_CHART_TYPES = ("Histogram", "Line", "Bar", "Column", "Area", "Stacked Bar", "Scatter Plot", "Dual Axes", "Box Plot", "Pie Chart")
+OUTPUT_FORMATS = ("png", "svg", "pdf")
+CHART_DPI = 200
+THUMBNAIL_WIDTH = 240
+DASHBOARD_COLUMNS = 3
+DASHBOARD_SIZE = (20, 15)
+DASHBOARD_DPI = 600
+# Bars of Bar and Column charts, and categories kept by Area, Box Plot and Pie charts that have too many
+DEFAULT_TOP_N = 10
+# Text X axes with more categories than this are cut down: always for Line charts, by top_n for Area, Box Plot and Pie
+MAX_CATEGORIES = 10
+LINE_COLORS = ['#66c2a5', '#fc8d62', '#8da0cb', '#e78ac3', '#a6d854', '#ffd92f', '#e5c494', '#b3b3b3']
+DEFAULT_OPTIONS = {
+    'aggregation': 'mean',
+    'point_budget': DEFAULT_POINT_BUDGET,
+    'approximate_quantiles': False,
+    'regression': False,
+    # Answers to the window's chart dialogs. time_level buckets datetime X axes of Line and Area charts ('auto' picks
+    # the finest level that fits point_budget) and of Box Plots ('auto' means Month); None keeps every timestamp
+    'time_level': 'auto',
+    # None keeps every bar or category
+    'top_n': DEFAULT_TOP_N,
+    # 'desc' keeps the largest Bar and Column values, 'asc' the smallest
+    'order': 'desc',
+    'stack': False,
+    # Histogram bins: None for the Freedman-Diaconis rule, a number of bins or a list of evenly spaced edges
+    'bins': None,
+    # The window's display settings
+    'seaborn': False,
+    'value_labels': False,
+    'value_label_font_size': 7,
+    'skew': False,
+    # None keeps Matplotlib's default size
+    'title_font_size': None,
+    'x_axis_font_size': None,
+    'y_axis_font_size': None,
+    'x_rotation': 0,
+    'y_rotation': 0,
+}
+# Options that only change how a prepared panel is drawn
+STYLE_OPTIONS = ('seaborn', 'value_labels', 'value_label_font_size', 'skew', 'title_font_size', 'x_axis_font_size',
+                 'y_axis_font_size', 'x_rotation', 'y_rotation')
+
+
+def numeric_column(data, column, chart_type):
+    if not pd.api.types.is_numeric_dtype(data[column]) or pd.api.types.is_bool_dtype(data[column]):
+        raise ValueError(f"{chart_type} requires a numeric field; '{column}' is {data[column].dtype}.")
+    return data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def require_fields(chart_type, x_cols, y_cols, x_count=1, y_count=None, y_min=1):
+    if len(x_cols) != x_count:
+        raise ValueError(f"{chart_type} requires exactly {x_count} X field.")
+    if y_count is not None and len(y_cols) != y_count:
+        raise ValueError(f"{chart_type} requires exactly {y_count} Y field{'s' if y_count > 1 else ''}.")
+    if len(y_cols) < y_min:
+        raise ValueError(f"{chart_type} requires at least {y_min} Y field.")
+
+
+def category_counts(data, column):
+    return CategoryCounts.from_values(data[column])
+
+
+def time_buckets(data, x_col, y_cols, options, aggregations, rollups, version):
+    """Y columns aggregated per time bucket of a datetime x_col: (frame in time order, level, rollup or None).
+
+    Methods a rollup can answer are read from the cached rollup of x_col, so the
+    rows are only grouped once per column and filter version; the median still
+    goes through the aggregation engine over bucketed timestamps.
+    """
+    level = options['time_level']
+    method = options['aggregation']
+    if level == 'auto':
+        level = suggest_level(data[x_col].min(), data[x_col].max(), options['point_budget'] or DEFAULT_POINT_BUDGET)
+    if method in ROLLUP_METHODS:
+        rollup = rollups.get(data, x_col, y_cols, version)
+        columns = {x_col: rollup.bucket_times(level)}
+        for column in y_cols:
+            columns[column] = rollup.series(level, column, method)[1]
+        return pd.DataFrame(columns), level, rollup
+    bucketed = data.assign(**{x_col: bucket_column(data[x_col], level)})
+    return aggregations.aggregate(bucketed, x_col, list(y_cols), method), level, None
+
+
+def downsampled(panel, frame, x_col, y_cols, budget):
+    frame, total = downsample_frame(frame, x_col, y_cols, budget)
+    if len(frame) < total:
+        panel['notes'].append(f"Downsampled to {budget:,} of {total:,} points per line (LTTB)")
+    return frame
+
+
+def top_bars(means, column, options):
+    """The top_n largest (or smallest, for order 'asc') aggregated bars, best first."""
+    top_n = options['top_n'] if options['top_n'] is not None else len(means)
+    return top_rows(means, column, top_n, largest=options['order'] != 'asc')
+
+
+def prepare_panel(chart_type, title, data, x_cols, y_cols, options, aggregations, histograms, version=None, rollups=None,
+                  counts=None, summary=None):
+    """Reduce data to what one chart draws: aggregates, bin counts or box statistics.
+
+    Everything heavy happens here, in the calling process and through the shared
+    engines, so the result is small enough to send to a rendering worker. options
+    (see DEFAULT_OPTIONS) carries the answers to the window's chart dialogs and
+    its display settings, so the window, its chart pane, dashboards and
+    render_charts.py all draw the same chart for the same fields. counts(data,
+    column) may return the CategoryCounts of a column from codes the caller
+    already has; summary is a precomputed HistogramSummary (e.g. streamed from
+    disk, with data None). Raises ValueError when the selected fields do not
+    suit the chart type.
+    """
+    counts = counts or category_counts
+    panel = {'chart': chart_type, 'title': title, 'notes': [],
+             'x_label': ", ".join(x_cols), 'y_label': ", ".join(y_cols),
+             'style': {key: options[key] for key in STYLE_OPTIONS}}
+    budget = options['point_budget']
+
+    if chart_type == "Line":
+        require_fields(chart_type, x_cols, y_cols)
+        x_col = x_cols[0]
+        rollup = None
+        if pd.api.types.is_datetime64_any_dtype(data[x_col]):
+            panel['dates'] = True
+        elif is_categorical_like(data[x_col]):
+            category = counts(data, x_col)
+            if category.nunique > MAX_CATEGORIES:
+                data = data[category.mask(category.top(MAX_CATEGORIES))]
+                version = None
+        if panel.get('dates') and options['time_level']:
+            # One point per time bucket, read from the column's cached rollup rather than regrouping the rows
+            rollups = rollups if rollups is not None else RollupCache()
+            series, level, rollup = time_buckets(data, x_col, list(y_cols), options, aggregations, rollups, version)
+        else:
+            series = aggregations.aggregate(data, x_col, list(y_cols), options['aggregation'], version=version)
+        # Each line is downsampled on its own, so every line keeps its own X values
+        panel['series'] = []
+        for column in y_cols:
+            line = downsampled(panel, series[[x_col, column]], x_col, [column], budget)
+            panel['series'].append((column, line[x_col].to_numpy(), line[column].to_numpy(dtype=np.float64, na_value=np.nan)))
+        if rollup is not None and options.get('follow_zoom') and not options['seaborn']:
+            # Only for live views: panels sent to workers have no zoom to follow and stay small
+            panel['zoom'] = {'rollup': rollup, 'level': level, 'method': options['aggregation'],
+                             'max_points': budget or DEFAULT_POINT_BUDGET}
+
+    elif chart_type == "Area":
+        require_fields(chart_type, x_cols, y_cols)
+        x_col = x_cols[0]
+        # Like the window, text Y fields are read as numbers, with 0 where a value is not one
+        text = [column for column in y_cols if not pd.api.types.is_numeric_dtype(data[column])]
+        if text:
+            data = data.assign(**{column: pd.to_numeric(data[column], errors='coerce').fillna(0) for column in text})
+            version = None
+        if pd.api.types.is_datetime64_any_dtype(data[x_col]):
+            panel['dates'] = True
+            if options['time_level']:
+                rollups = rollups if rollups is not None else RollupCache()
+                data = time_buckets(data, x_col, list(y_cols), options, aggregations, rollups, version)[0]
+        elif is_categorical_like(data[x_col]) and options['top_n']:
+            category = counts(data, x_col)
+            if category.nunique > MAX_CATEGORIES:
+                data = data[category.mask(category.top(options['top_n']))]
+        frame = downsampled(panel, data[[x_col] + list(y_cols)].sort_values(by=x_col), x_col, y_cols, budget)
+        panel['x'] = frame[x_col].to_numpy()
+        panel['series'] = [(column, frame[column].to_numpy(dtype=np.float64, na_value=np.nan)) for column in y_cols]
+        panel['stack'] = bool(options['stack']) and len(y_cols) > 1
+
+    elif chart_type == "Dual Axes":
+        require_fields(chart_type, x_cols, y_cols, y_count=2)
+        x_col = x_cols[0]
+        frame = data[[x_col] + list(y_cols)]
+        if budget and len(frame) > budget:
+            # Downsampling needs the points in X order; smaller frames are drawn in row order, like the window does
+            frame = downsampled(panel, frame.sort_values(by=x_col), x_col, y_cols, budget)
+        panel['x'] = frame[x_col].to_numpy()
+        panel['series'] = [(column, frame[column].to_numpy()) for column in y_cols]
+
+    elif chart_type == "Bar":
+        require_fields(chart_type, x_cols, y_cols, y_count=1)
+        x_col, y_col = x_cols[0], y_cols[0]
+        if not pd.api.types.is_numeric_dtype(data[y_col]):
+            data = data.assign(**{y_col: pd.to_numeric(data[y_col], errors='coerce')})
+            version = None
+        if data[y_col].isnull().any():
+            raise ValueError("Non-numeric data found in Y-axis field after conversion attempt.")
+        top = top_bars(aggregations.aggregate(data, x_col, [y_col], 'mean', version=version), y_col, options)
+        panel['labels'] = top[x_col].astype(str).tolist()
+        panel['values'] = top[y_col].to_numpy(dtype=np.float64)
+
+    elif chart_type == "Column":
+        require_fields(chart_type, x_cols, y_cols, y_count=1)
+        x_col, y_col = x_cols[0], y_cols[0]
+        if not pd.api.types.is_numeric_dtype(data[y_col]):
+            raise ValueError("Y-axis data must be numeric (int or float) for column plots.")
+        if not pd.api.types.is_numeric_dtype(data[x_col]):
+            data = data.assign(**{x_col: pd.to_numeric(data[x_col], errors='coerce')})
+            version = None
+        if data[x_col].isnull().any() or data[y_col].isnull().any():
+            raise ValueError("Non-numeric data found in fields after conversion attempt.")
+        top = top_bars(aggregations.aggregate(data, x_col, [y_col], 'mean', version=version), y_col, options)
+        panel['labels'] = top[x_col].astype(str).tolist()
+        panel['values'] = top[y_col].to_numpy(dtype=np.float64)
+
+    elif chart_type == "Stacked Bar":
+        require_fields(chart_type, x_cols, y_cols)
+        if not all(pd.api.types.is_numeric_dtype(data[column]) for column in y_cols):
+            raise ValueError("All Y fields must be numeric for stacked bar plots.")
+        sums = aggregations.aggregate(data, x_cols[0], list(y_cols), 'sum', version=version).fillna(0)
+        panel['labels'] = sums[x_cols[0]].astype(str).tolist()
+        panel['series'] = [(column, sums[column].to_numpy(dtype=np.float64)) for column in y_cols]
+
+    elif chart_type == "Scatter Plot":
+        require_fields(chart_type, x_cols[:1], y_cols)
+        x_col, y_col = x_cols[0], y_cols[0]
+        if data[x_col].dtype.kind not in 'fi' or data[y_col].dtype.kind not in 'fi':
+            raise ValueError("Scatter plot requires numeric data types for both axes.")
+        x = data[x_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        y = data[y_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        finite = np.isfinite(x) & np.isfinite(y)
+        points = int(np.count_nonzero(finite))
+        if points > DENSITY_THRESHOLD:
+            panel['counts'], panel['extent'] = density_grid(x[finite], y[finite])
+            panel['notes'].append(f"Density of {points:,} points (log color scale)")
+        else:
+            panel['x'], panel['y'] = x[finite], y[finite]
+        panel['regression'] = least_squares(x[finite], y[finite])
+        panel['show_regression'] = options['regression'] and panel['regression'] is not None
+
+    elif chart_type == "Histogram":
+        if len(x_cols) != 1:
+            raise ValueError("Histogram requires exactly one field to be selected for the X axis.")
+        column = x_cols[0]
+        if summary is None:
+            if not pd.api.types.is_numeric_dtype(data[column]):
+                raise ValueError("Histogram requires numerical data. Please select a numeric field.")
+            key = None if version is None else (column, version)
+            summary = histograms.get(key, lambda: [data[column].to_numpy(dtype=np.float64, na_value=np.nan)])
+        if summary.empty:
+            raise ValueError("The selected data contains only missing or infinite values.")
+        bins = options['bins']
+        if bins is None:
+            panel['edges'] = summary.default_edges()
+        elif np.ndim(bins) == 0:
+            panel['edges'] = np.linspace(summary.min, summary.max, int(bins) + 1)
+        else:
+            panel['edges'] = np.asarray(bins, dtype=np.float64)
+        panel['counts'] = summary.counts(panel['edges'])
+        panel['stats'] = {'mean': summary.mean, 'std': summary.std, 'skew': summary.skew, 'min': summary.min, 'max': summary.max}
+
+    elif chart_type == "Box Plot":
+        if len(x_cols) != 1 or len(y_cols) != 1:
+            raise ValueError("Box plot requires exactly one X field and one Y field.")
+        x_col, y_col = x_cols[0], y_cols[0]
+        if not np.issubdtype(data[y_col].dtype, np.number):
+            raise ValueError(f"Y field ({y_col}) must be numeric for box plot.")
+        if pd.api.types.is_datetime64_any_dtype(data[x_col]) and options['time_level']:
+            level = 'Month' if options['time_level'] == 'auto' else options['time_level']
+            data = data.assign(**{x_col: bucket_column(data[x_col], level).dt.to_period(LEVEL_UNITS[level])})
+            version = None
+        if is_categorical_like(data[x_col]) and options['top_n']:
+            category = counts(data, x_col)
+            if category.nunique > MAX_CATEGORIES:
+                data = data[category.mask(category.top(options['top_n']))]
+                version = None
+        # Quartiles, whiskers and outliers of every group in one pass, shared by the boxes and the value labels
+        groups, stats = aggregations.box_stats(data, x_col, y_col, version, approximate=options['approximate_quantiles'])
+        shown = np.flatnonzero(stats['count'] > 0)
+        if not len(shown):
+            raise ValueError(f"Y field ({y_col}) has no values to plot.")
+        if options['approximate_quantiles'] and stats['count'][shown].max() > APPROX_SAMPLE_SIZE:
+            panel['notes'].append(f"Quartiles of groups over {APPROX_SAMPLE_SIZE:,} values are estimated from a sample")
+        panel['boxes'] = [{'label': str(groups[i]), 'med': stats['med'][i], 'q1': stats['q1'][i], 'q3': stats['q3'][i],
+                           'whislo': stats['whislo'][i], 'whishi': stats['whishi'][i], 'fliers': stats['fliers'][i],
+                           'min': stats['min'][i], 'max': stats['max'][i]}
+                          for i in shown]
+        if options['seaborn']:
+            # Seaborn computes its own boxes, so it gets the rows, in the order of the precomputed statistics
+            panel['rows'] = (data[x_col].to_numpy(), data[y_col].to_numpy(dtype=np.float64, na_value=np.nan))
+            panel['order'] = list(groups[shown])
+
+    elif chart_type == "Pie Chart":
+        if len(x_cols) != 1:
+            raise ValueError("Pie Chart requires exactly one field selected for the X Axis.")
+        if pd.api.types.is_numeric_dtype(data[x_cols[0]]):
+            raise ValueError("Pie Chart requires categorical data, not numeric data.")
+        category = counts(data, x_cols[0])
+        shown = category.nunique
+        if shown > MAX_CATEGORIES and options['top_n']:
+            shown = options['top_n']
+        # Categories beyond the shown number are grouped into 'Other'
+        pie = category.with_other(shown)
+        if not len(pie):
+            raise ValueError(f"'{x_cols[0]}' has no values to plot.")
+        panel['labels'] = [str(value) for value in pie.index]
+        panel['values'] = pie.to_numpy(dtype=np.float64)
+
+    else:
+        raise ValueError(f"Unknown chart type: {chart_type}")
+    return panel
+
+
+def least_squares(x, y):
+    """Slope, intercept, R-squared and X range of the regression line through finite points, or None."""
+    if len(x) < 2:
+        return None
+    x_centered = x - x.mean()
+    y_centered = y - y.mean()
+    sxx = np.dot(x_centered, x_centered)
+    if sxx == 0:
+        return None
+    sxy = np.dot(x_centered, y_centered)
+    syy = np.dot(y_centered, y_centered)
+    slope = sxy / sxx
+    return {'slope': slope, 'intercept': y.mean() - slope * x.mean(),
+            'r_squared': sxy * sxy / (sxx * syy) if syy > 0 else 1.0, 'x_range': (x.min(), x.max())}
+
+
+def regression_points(regression):
+    """End points of the regression line; a straight line needs no more."""
+    x_ends = np.array(regression['x_range'], dtype=np.float64)
+    return x_ends, regression['intercept'] + regression['slope'] * x_ends
+
+
+def regression_label(regression):
+    return f"Aggression Line: y={regression['intercept']:.2f}+{regression['slope']:.2f}x"
+
+
+def regression_summary(regression):
+    return f"Slope: {regression['slope']:.2f}, R-squared: {regression['r_squared']:.2f}"
+
+
+def draw_regression(ax, regression, **kwargs):
+    """The regression line and its slope and R-squared box."""
+    line, = ax.plot(*regression_points(regression), color="lightpink", label=regression_label(regression), **kwargs)
+    text = ax.text(0.95, 0.05, regression_summary(regression), transform=ax.transAxes, fontsize=8, ha='right', va='bottom',
+                   bbox=dict(boxstyle='round', facecolor='white', alpha=0.5), **kwargs)
+    return line, text
+
+
+def draw_title(ax, panel):
+    """The panel title with its notes (such as downsampling) as a subtitle underneath."""
+    kwargs = {'color': 'navy'} if panel['chart'] == "Pie Chart" else {}
+    ax.set_title("\n".join([panel['title']] + panel['notes']), fontsize=panel['style']['title_font_size'], **kwargs)
+
+
+def palette(count, name=None):
+    """count colors: a Seaborn palette when one is named and Seaborn is installed, else LINE_COLORS in turn."""
+    if name is not None and sns is not None:
+        return sns.color_palette(name, count)
+    return [LINE_COLORS[idx % len(LINE_COLORS)] for idx in range(count)]
+
+
+def draw_panel(ax, panel):
+    """Draw a prepared panel onto ax; only Matplotlib (and optionally Seaborn) calls, no data processing.
+
+    Returns the artists holding the panel's data ('lines', 'bars', 'stairs',
+    'points', 'image', 'regression' and 'axes'), so a live view can update them
+    in place when the data changes.
+    """
+    chart_type = panel['chart']
+    style = panel['style']
+    seaborn = style['seaborn'] and sns is not None
+    label_size = int(style['value_label_font_size'])
+    artists = {'axes': [ax]}
+    bars = None
+    if chart_type == "Line":
+        colors = palette(len(panel['series']))
+        artists['lines'] = []
+        for color, (name, x, values) in zip(colors, panel['series']):
+            if seaborn:
+                sns.lineplot(x=x, y=values, ax=ax, color=color, marker='o', markersize=5, label=name)
+                artists['lines'].append(ax.get_lines()[-1])
+            else:
+                artists['lines'].append(ax.plot(x, values, label=name, color=color, marker='o', markersize=5)[0])
+        zoom = panel.get('zoom')
+        if zoom is not None:
+            for line, (name, _, _) in zip(artists['lines'], panel['series']):
+                follow_zoom(ax, line, zoom['rollup'], name, zoom['method'], zoom['level'], zoom['max_points'])
+        if style['value_labels']:
+            # One labels artist for every line, each value in its line's color
+            xs = np.concatenate([x for _, x, _ in panel['series']])
+            ys = np.concatenate([values for _, _, values in panel['series']])
+            label_colors = [color for color, (_, x, _) in zip(colors, panel['series']) for _ in range(len(x))]
+            artists['labels'] = add_value_labels(ax, xs, ys, [f"{value:.2f}" for value in ys], font_size=label_size, color=label_colors)
+        ax.legend(title='Primary Y-axis', loc='upper left', bbox_to_anchor=(1, 1))
+        ax.grid(True)
+    elif chart_type == "Area":
+        x = panel['x']
+        bottom = np.zeros(len(x))
+        for color, (name, values) in zip(palette(len(panel['series'])), panel['series']):
+            if panel['stack']:
+                top = bottom + np.nan_to_num(values)
+                ax.fill_between(x, bottom, top, alpha=0.5, label=name, color=color)
+                bottom = top
+            else:
+                ax.fill_between(x, 0, values, alpha=0.3, label=name, color=color)
+        ax.legend(title="Series")
+    elif chart_type == "Dual Axes":
+        (name1, values1), (name2, values2) = panel['series']
+        color1, color2 = LINE_COLORS[:2]
+        ax2 = ax.twinx()
+        if seaborn:
+            sns.lineplot(x=panel['x'], y=values1, ax=ax, color=color1, label=f"{name1} (left axis)")
+            sns.lineplot(x=panel['x'], y=values2, ax=ax2, color=color2, label=f"{name2} (right axis)")
+            line1, line2 = ax.get_lines()[-1], ax2.get_lines()[-1]
+        else:
+            line1, = ax.plot(panel['x'], values1, color=color1, label=f"{name1} (left axis)")
+            line2, = ax2.plot(panel['x'], values2, color=color2, label=f"{name2} (right axis)")
+        ax2.set_ylabel(name2, fontsize=style['y_axis_font_size'])
+        artists['lines'], artists['axes'] = [line1, line2], [ax, ax2]
+        lines, labels = ax.get_legend_handles_labels()
+        lines2, labels2 = ax2.get_legend_handles_labels()
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()  # Seaborn gives each axes its own legend; one combined legend replaces them
+        ax2.legend(lines + lines2, labels + labels2, loc='upper right')
+    elif chart_type in ("Bar", "Column"):
+        horizontal = chart_type == "Column"
+        if seaborn:
+            if horizontal:
+                sns.barplot(x=panel['values'], y=panel['labels'], ax=ax, color='lightblue', orient='h')
+            else:
+                sns.barplot(x=panel['labels'], y=panel['values'], ax=ax, color='lightblue', orient='v')
+            bars = list(ax.patches)
+        elif horizontal:
+            bars = ax.barh(panel['labels'], panel['values'], color='lightblue')
+        else:
+            bars = ax.bar(panel['labels'], panel['values'], width=0.8, color='lightblue')
+        artists['bars'] = bars
+        if style['value_labels']:
+            artists['labels'] = label_bars(ax, bars, font_size=label_size, horizontal=horizontal)
+    elif chart_type == "Stacked Bar":
+        bottom = np.zeros(len(panel['labels']))
+        groups = []
+        for color, (name, values) in zip(palette(len(panel['series']), "husl"), panel['series']):
+            groups.append(ax.bar(panel['labels'], values, bottom=bottom, label=name, color=color))
+            bottom += values
+        ax.legend(title="Categories")
+        if style['value_labels']:
+            artists['labels'] = label_bars(ax, [rect for group in groups for rect in group if rect.get_height() > 0],
+                                           font_size=label_size, fmt='{:.0f}')
+    elif chart_type == "Scatter Plot":
+        if 'counts' in panel:
+            counts = panel['counts']
+            artists['image'] = ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', extent=panel['extent'], aspect='auto',
+                                         interpolation='nearest', norm=LogNorm(vmin=1, vmax=max(int(counts.max()), 1)))
+            ax.figure.colorbar(artists['image'], ax=ax, label='Points per cell')
+        elif seaborn:
+            sns.scatterplot(x=panel['x'], y=panel['y'], ax=ax, color='#66c2a5')
+            artists['points'] = ax.collections[-1]
+        else:
+            artists['points'] = ax.scatter(panel['x'], panel['y'], color='#66c2a5')
+        if panel.get('show_regression'):
+            artists['regression'] = draw_regression(ax, panel['regression'])
+            ax.legend()
+    elif chart_type == "Histogram":
+        counts, edges = panel['counts'], panel['edges']
+        bars = draw_histogram_bars(ax, counts, edges)
+        artists['stairs' if len(counts) >= STAIRS_MIN_BINS else 'bars'] = bars
+        if style['value_labels']:
+            artists['labels'] = add_value_labels(ax, edges[:-1] + np.diff(edges) / 2, counts, [f'{int(count)}' for count in counts],
+                                                 font_size=label_size)
+        if style['skew']:
+            stats = panel['stats']
+            ax.text(0.95, 0.95, f"Mean: {stats['mean']:.2f}, Std Dev: {stats['std']:.2f}, Skew: {stats['skew']:.2f}",
+                    transform=ax.transAxes, fontsize=7, va='top', ha='right', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+            if stats['std'] > 0:
+                # The normal curve of the same mean and spread, scaled to the tallest bar
+                x = np.linspace(stats['min'], stats['max'], 100)
+                pdf = np.exp(-0.5 * ((x - stats['mean']) / stats['std']) ** 2)
+                ax.plot(x, pdf * np.max(counts) / np.max(pdf), color='red', linewidth=1.5, label='Skew Line')
+                ax.legend(fontsize=7)
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+    elif chart_type == "Box Plot":
+        boxes = panel['boxes']
+        if seaborn and 'rows' in panel:
+            x, y = panel['rows']
+            sns.boxplot(x=x, y=y, order=panel['order'], ax=ax)
+            positions = np.arange(len(boxes))
+        else:
+            positions = np.arange(1, len(boxes) + 1)
+            ax.bxp(boxes, positions=positions)
+        if style['value_labels']:
+            # Five labels per box, all drawn by one artist: min and Q1 below their value, the rest above
+            keys = ('min', 'q1', 'med', 'q3', 'max')
+            values = np.array([[box[key] for box in boxes] for key in keys], dtype=np.float64).ravel()
+            artists['labels'] = add_value_labels(ax, np.tile(positions, len(keys)), values, [f"{value:.2f}" for value in values],
+                                                 font_size=8, va=np.repeat(['top', 'top', 'bottom', 'bottom', 'bottom'], len(boxes)).tolist())
+        if len(boxes) > MAX_CATEGORIES:
+            for label in ax.get_xticklabels():
+                label.set_horizontalalignment('right')
+    elif chart_type == "Pie Chart":
+        cmap = colormaps["tab20"]
+        wedges, texts, autotexts = ax.pie(panel['values'], labels=panel['labels'], autopct='%1.1f%%', startangle=90,
+                                          colors=[cmap(i % cmap.N) for i in range(len(panel['values']))],
+                                          wedgeprops=dict(width=0.98, edgecolor='black', linewidth=1.5))
+        ax.axis('equal')
+        ax.legend(wedges, panel['labels'], title=panel['x_label'], loc="center left", bbox_to_anchor=(1, 0, 0.5, 1), fontsize=label_size)
+        for text in texts:
+            text.set_fontsize(label_size)
+            text.set_color('darkblue')
+        for text in autotexts:
+            text.set_fontsize(label_size)
+            text.set_weight('bold')
+            text.set_color('white')
+
+    if panel.get('dates'):
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment('right')
+    ax.set_xlabel(panel['x_label'], fontsize=style['x_axis_font_size'])
+    ax.set_ylabel(panel['y_label'], fontsize=style['y_axis_font_size'])
+    draw_title(ax, panel)
+    ax.tick_params(axis='x', rotation=style['x_rotation'], **font_size(style['x_axis_font_size']))
+    ax.tick_params(axis='y', rotation=style['y_rotation'], **font_size(style['y_axis_font_size']))
+    return artists
+
+
+def font_size(size):
+    """labelsize for tick_params, left out so Matplotlib keeps its default when size is None."""
+    return {} if size is None else {'labelsize': size}
+
+
+def draw_failure(ax, title, error):
+    ax.set_axis_off()
+    ax.set_title(title)
+    ax.text(0.5, 0.5, f"Could not be generated:\n{error}", ha='center', va='center', wrap=True, color='firebrick')
+
+
+def render_panel(panel, figsize, dpi, vector=False, output_path=None):
+    """Render one prepared panel on the Agg backend; runs in a worker process.
+
+    Returns a dict with the panel title, render time and error (None on success)
+    plus, depending on the target:
+      - output_path given: the chart is saved there (format from the extension)
+        and 'path' and a small PNG 'thumbnail' are returned; failed charts are
+        not saved and get path None.
+      - vector=True: 'figure', a pickled Figure for the PDF writer.
+      - otherwise: 'image', PNG bytes for the dashboard grid.
+    A failed panel is still drawn, as a message, so grids keep their layout.
+    """
+    start = time.perf_counter()
+    result = {'title': panel['title'], 'chart': panel['chart'], 'error': panel.get('error')}
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    if result['error'] is None:
+        try:
+            draw_panel(ax, panel)
+            fig.tight_layout()
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            fig.clear()
+            ax = fig.add_subplot()
+    if result['error'] is not None:
+        draw_failure(ax, panel['title'], result['error'])
+
+    if output_path is not None:
+        result['path'] = None
+        if result['error'] is None:
+            fig.savefig(output_path, dpi=dpi)
+            result['path'] = output_path
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=THUMBNAIL_WIDTH / figsize[0])
+        result['thumbnail'] = buffer.getvalue()
+    elif vector:
+        result['figure'] = pickle.dumps(fig)
+    else:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi)
+        result['image'] = buffer.getvalue()
+    result['render_seconds'] = time.perf_counter() - start
+    return result
+
+
+def run_renders(jobs, workers=None):
+    """render_panel(*job) for every job, in a process pool unless workers is 1; results keep job order."""
+    workers = workers or min(len(jobs), available_cpus())
+    if workers <= 1:
+        return [render_panel(*job) for job in jobs]
+    results = []
+    # Spawned workers start clean instead of forking a process that may hold a GUI
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(render_panel, *job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:  # The worker itself died; draw the failure here
+                panel, *rest = job
+                results.append(render_panel(dict(panel, error=f"{type(e).__name__}: {e}"), *rest))
+    return results
+
+
+def panel_report(prepared, results):
+    """One entry per panel: title, chart, error (None when it worked), prepare_seconds and render_seconds."""
+    return [{'title': result['title'], 'chart': result['chart'], 'error': result['error'],
+             'prepare_seconds': panel['prepare_seconds'], 'render_seconds': result['render_seconds']}
+            for panel, result in zip(prepared, results)]
+
+
+def composite_images(results, output_path, columns=DASHBOARD_COLUMNS, dpi=DASHBOARD_DPI):
+    """Paste rendered panel images into one grid image, in panel order."""
+    images = [Image.open(io.BytesIO(result['image'])).convert('RGB') for result in results]
+    width = max(image.width for image in images)
+    height = max(image.height for image in images)
+    rows = math.ceil(len(images) / columns)
+    sheet = Image.new('RGB', (width * min(columns, len(images)), height * rows), 'white')
+    for position, image in enumerate(images):
+        row, column = divmod(position, columns)
+        sheet.paste(image, (column * width, row * height))
+    sheet.save(output_path, dpi=(dpi, dpi))
+
+
+def write_pdf(results, output_path):
+    """Multi-page PDF with one vector page per panel."""
+    with PdfPages(output_path) as pdf:
+        for result in results:
+            pdf.savefig(pickle.loads(result['figure']))
+
+
+def prepare_panels(data, x_cols, y_cols, panels=DASHBOARD_PANELS, options=None, aggregations=None, histograms=None, version=None,
+                   rollups=None):
+    """prepare_panel for every (chart type, title), recording failures and timing instead of raising.
+
+    Pass the GUI's engines and filter version so panels reuse cached aggregates.
+    """
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    aggregations = aggregations if aggregations is not None else AggregationEngine()
+    histograms = histograms if histograms is not None else HistogramCache()
+    rollups = rollups if rollups is not None else RollupCache()
+    prepared = []
+    for chart_type, title in panels:
+        start = time.perf_counter()
+        try:
+            panel = prepare_panel(chart_type, title, data, x_cols, y_cols, options, aggregations, histograms, version, rollups)
+        except Exception as e:
+            panel = {'chart': chart_type, 'title': title, 'error': f"{type(e).__name__}: {e}"}
+        panel['prepare_seconds'] = time.perf_counter() - start
+        prepared.append(panel)
+    return prepared
+
+
+def render_panels(prepared, output_path, workers=None, size=DASHBOARD_SIZE, dpi=DASHBOARD_DPI):
+    """Render prepared panels in a process pool and write one image or a multi-page PDF.
+
+    A .pdf output_path gets one vector page per panel; anything else is a raster
+    grid of DASHBOARD_COLUMNS panels per row. workers=1 renders in this process.
+    Returns one report per panel: title, chart, error (None when it worked),
+    prepare_seconds and render_seconds.
+    """
+    vector = output_path.lower().endswith('.pdf')
+    rows = math.ceil(len(prepared) / DASHBOARD_COLUMNS)
+    panel_size = (size[0] / min(DASHBOARD_COLUMNS, len(prepared)), size[1] / rows)
+
+    results = run_renders([(panel, panel_size, dpi, vector) for panel in prepared], workers)
+    if vector:
+        write_pdf(results, output_path)
+    else:
+        composite_images(results, output_path, dpi=dpi)
+    return panel_report(prepared, results)
+
+
+def chart_file_name(position, chart_type, fmt):
+    return f"{position + 1:02d}_{chart_type.lower().replace(' ', '_')}.{fmt}"
+
+
+def render_charts_to_folder(prepared, folder, fmt="png", workers=None, size=(12, 8), dpi=CHART_DPI):
+    """Render each prepared panel to its own file in folder, in parallel.
+
+    Returns panel_report entries extended with 'path' (None for charts that
+    failed) and 'thumbnail' (small PNG bytes for a summary grid).
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'; choose one of {', '.join(OUTPUT_FORMATS)}.")
+    os.makedirs(folder, exist_ok=True)
+    jobs = [(panel, size, dpi, False, os.path.join(folder, chart_file_name(position, panel['chart'], fmt)))
+            for position, panel in enumerate(prepared)]
+    results = run_renders(jobs, workers)
+    report = panel_report(prepared, results)
+    for entry, result in zip(report, results):
+        entry['path'] = result['path']
+        entry['thumbnail'] = result['thumbnail']
+    return report
+
+
+def render_dashboard(data, x_cols, y_cols, output_path, panels=DASHBOARD_PANELS, options=None, workers=None,
+                     size=DASHBOARD_SIZE, dpi=DASHBOARD_DPI, aggregations=None, histograms=None, version=None, rollups=None):
+    """prepare_panels followed by render_panels; returns the per-panel report."""
+    prepared = prepare_panels(data, x_cols, y_cols, panels, options, aggregations, histograms, version, rollups)
+    return render_panels(prepared, output_path, workers, size, dpi)
+
+
+def format_report(report):
+    """One line per panel with its timing, failures last with their reason."""
+    lines = [f"{entry['title']}: {entry['prepare_seconds'] + entry['render_seconds']:.2f}s" for entry in report if entry['error'] is None]
+    lines += [f"{entry['title']}: FAILED - {entry['error']}" for entry in report if entry['error'] is not None]
+    return "\n".join(lines)
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # The cache is an optimisation only; without pyarrow every load parses the source file
+    pa = None
+    feather = None
+
+# Bump when the way parsed frames are produced changes, so stale entries are never reused
+CACHE_VERSION = 5
+CACHE_DIR = os.environ.get("CSV_VISUALIZER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "csv-excel-visualizer"))
+CACHE_MAX_BYTES = int(os.environ.get("CSV_VISUALIZER_CACHE_MB", "4096")) * 1024 * 1024
+
+
+def cache_available():
+    return feather is not None
+
+
+def cache_key(file_path, variant=""):
+    """Key a source file by absolute path, size and modification time."""
+    stat = os.stat(file_path)
+    raw = f"{CACHE_VERSION}|{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{variant}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def cache_path(file_path, variant=""):
+    return os.path.join(CACHE_DIR, cache_key(file_path, variant) + ".arrow")
+
+
+def meta_path(file_path, name):
+    """Sidecar for facts about a file that outlive edits to it, so it is keyed by path only."""
+    raw = f"{os.path.abspath(file_path)}|{name}"
+    return os.path.join(CACHE_DIR, hashlib.sha1(raw.encode("utf-8")).hexdigest() + ".json")
+
+
+def load_meta(file_path, name):
+    """JSON value stored with store_meta for file_path, or None."""
+    try:
+        with open(meta_path(file_path, name), encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def store_meta(file_path, name, value):
+    """Remember a small JSON value for file_path; failures are ignored like the rest of the cache."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = meta_path(file_path, name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(value, handle)
+        os.replace(temp_path, path)
+        return True
+    except (OSError, TypeError, ValueError):
+        return False
+
+
+def load_cached(file_path, variant="", columns=None):
+    """Return the cached DataFrame for file_path (optionally only `columns`), or None on a miss."""
+    if not cache_available():
+        return None
+    try:
+        path = cache_path(file_path, variant)
+        if not os.path.exists(path):
+            return None
+        # Uncompressed Arrow IPC is memory-mapped and only `columns` are read; to_pandas still converts each of those in full
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        os.utime(path)  # Mark as recently used for LRU eviction
+        return table.to_pandas(split_blocks=True)
+    except (OSError, KeyError, pa.ArrowException):
+        return None
+
+
+def store(file_path, data, variant=""):
+    """Write data to the cache for file_path; failures are ignored because the cache is best-effort."""
+    if not cache_available():
+        return False
+    temp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = cache_path(file_path, variant)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        feather.write_feather(table, temp_path, compression="uncompressed")
+        os.replace(temp_path, path)
+    except (OSError, ValueError, TypeError, pa.ArrowException):
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    evict(CACHE_MAX_BYTES)
+    return True
+
+
+def evict(max_bytes=CACHE_MAX_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    try:
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith((".arrow", ".json")):
+                path = os.path.join(CACHE_DIR, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def clear():
+    evict(0)
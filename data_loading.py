@@ -0,0 +1,483 @@
+import fnmatch
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+from date_parsing import convert_dates
+
+try:
+    import python_calamine  # noqa: F401  Rust workbook parser, used through pandas >= 2.2
+except ImportError:  # Fall back to pandas' default engine (openpyxl in read-only mode for .xlsx)
+    python_calamine = None
+
+# Number of CSV rows parsed per chunk while reporting progress
+CSV_CHUNK_ROWS = 200_000
+# Text columns with fewer distinct values than this share of rows, and than CATEGORY_MAX_VALUES, become categoricals;
+# near-unique text takes more memory as a category (codes plus every value) than as strings
+CATEGORY_RATIO = 0.05
+CATEGORY_MAX_VALUES = 50_000
+# Rows read at open time in lazy mode to learn the column types
+LAZY_SAMPLE_ROWS = 1000
+# Memory budget for the columns a lazy dataset keeps loaded
+LAZY_CACHE_BYTES = 1024 * 1024 * 1024
+# Column added when several workbook sheets are loaded together, naming each row's sheet
+SHEET_COLUMN = "Sheet"
+# Column added to folder loads, naming the file each row came from
+SOURCE_COLUMN = "Source File"
+# File patterns a folder load picks up, separated by semicolons
+FOLDER_PATTERN = "*.csv;*.xlsx;*.xls"
+
+
+class LoadCancelled(Exception):
+    """Raised when a load is cancelled through its cancel event."""
+
+
+def arrow_string_dtype():
+    """Arrow-backed string dtype that keeps NaN as the missing value, or None without pyarrow."""
+    if not data_cache.cache_available():
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:  # pandas < 2.3 has no na_value argument
+        return pd.StringDtype("pyarrow")
+
+
+def available_cpus():
+    """CPUs this process may run on, which can be fewer than os.cpu_count() in containers."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def excel_engine():
+    """Fastest installed pandas engine for workbooks, or None for pandas' default."""
+    major, minor = (int(part) for part in pd.__version__.split(".")[:2])
+    if python_calamine is not None and (major, minor) >= (2, 2):
+        return "calamine"
+    return None
+
+
+def list_sheets(file_path):
+    """Sheet names of a workbook, read from its index without parsing any sheet."""
+    with pd.ExcelFile(file_path, engine=excel_engine()) as workbook:
+        return list(workbook.sheet_names)
+
+
+def sheet_variant(sheets):
+    """Cache variant for a sheet selection; the default first sheet keeps the plain file entry."""
+    return "" if not sheets else "sheets:" + "\x1f".join(str(sheet) for sheet in sheets)
+
+
+def detect_dates(file_path, data, variant=""):
+    """convert_dates() with the formats remembered for file_path, remembering any newly inferred ones."""
+    name = f"date_formats:{variant}"
+    formats = data_cache.load_meta(file_path, name) or {}
+    data, found = convert_dates(data, formats)
+    if any(formats.get(column) != fmt for column, fmt in found.items()):
+        data_cache.store_meta(file_path, name, dict(formats, **found))
+    return data
+
+
+def parse_sheet(file_path, sheet):
+    """Parse and optimize one sheet; runs in a worker process. Returns (frame, bytes before optimization)."""
+    data = pd.read_excel(file_path, sheet_name=sheet, engine=excel_engine())
+    return optimize_dtypes(detect_dates(file_path, data, sheet_variant([sheet]))), memory_usage(data)
+
+
+def parallel_parse(function, jobs, on_result, cancel_event=None, cancel_name=None, workers=None):
+    """function(*job) for every job in a spawn process pool, or inline when workers is 1.
+
+    on_result(position, result) runs in the calling thread as each job finishes.
+    Setting cancel_event raises LoadCancelled(cancel_name) without waiting for
+    the jobs still running, which finish in the background.
+    """
+    workers = workers or min(len(jobs), available_cpus())
+    if workers <= 1:
+        for position, job in enumerate(jobs):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled(cancel_name)
+            on_result(position, function(*job))
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    pending = {}
+    try:
+        pending = {pool.submit(function, *job): position for position, job in enumerate(jobs)}
+        while pending:
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled(cancel_name)
+            for future in done:
+                on_result(pending.pop(future), future.result())
+    finally:
+        pool.shutdown(wait=not pending, cancel_futures=True)
+
+
+def read_excel_sheets(file_path, sheets, progress_callback=None, cancel_event=None, workers=None):
+    """parse_sheet() for every sheet, in a process pool when there are several; results keep sheet order.
+
+    Progress is reported as each sheet finishes, as the share of sheets done
+    scaled to the file size.
+    """
+    total_bytes = os.path.getsize(file_path)
+    results = [None] * len(sheets)
+    rows_read = 0
+
+    def finished(position, result):
+        nonlocal rows_read
+        results[position] = result
+        rows_read += len(result[0])
+        if progress_callback:
+            done = sum(result is not None for result in results)
+            progress_callback(total_bytes * done // len(sheets), total_bytes, rows_read)
+
+    parallel_parse(parse_sheet, [(file_path, sheet) for sheet in sheets], finished, cancel_event, file_path, workers)
+    return results
+
+
+def memory_usage(data):
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+def optimize_dtypes(data, category_ratio=CATEGORY_RATIO, category_max=CATEGORY_MAX_VALUES):
+    """Shrink a freshly parsed frame: downcast numbers, encode repetitive text as categories.
+
+    Integers are downcast to the smallest signed type that holds them, floats only
+    when float32 round-trips every value exactly, low-cardinality text becomes
+    `category` and other text becomes Arrow-backed strings. Columns holding
+    mixed Python objects are left alone so no value changes type.
+    """
+    string_dtype = arrow_string_dtype()
+    optimized = {}
+    for column in data.columns:
+        values = data[column]
+        kind = values.dtype.kind
+        if kind == 'i' and isinstance(values.dtype, np.dtype):
+            optimized[column] = pd.to_numeric(values, downcast='integer')
+        elif kind == 'f' and values.dtype == np.float64:
+            as_float32 = values.to_numpy().astype(np.float32)
+            if np.array_equal(as_float32.astype(np.float64), values.to_numpy(), equal_nan=True):
+                optimized[column] = pd.Series(as_float32, index=values.index, name=column)
+        # pandas 3 parses text as its own `str` dtype rather than object, so the dtype kind alone would miss it
+        elif ((pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values))
+              and not isinstance(values.dtype, pd.CategoricalDtype)):
+            if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+                continue
+            if values.nunique(dropna=True) < min(category_ratio * len(values), category_max):
+                optimized[column] = values.astype('category')
+            elif string_dtype is not None and values.dtype != string_dtype:
+                optimized[column] = values.astype(string_dtype)
+
+    if not optimized:
+        return data
+    result = data.copy(deep=False)
+    for column, values in optimized.items():
+        result[column] = values
+    return result
+
+
+def read_dataset(file_path, progress_callback=None, cancel_event=None, use_cache=True, sheets=None):
+    """Read a CSV or Excel file, reporting (bytes_read, total_bytes, rows_read) as it goes.
+
+    Safe to call from a worker thread: it never touches Tk. Setting cancel_event
+    stops the read at the next chunk boundary and raises LoadCancelled. Parsed
+    frames go through optimize_dtypes() and are kept in the columnar cache so
+    reopening an unchanged file skips parsing. The returned frame carries
+    `attrs["memory_usage"]` with its size in bytes before and after optimization.
+
+    For workbooks, `sheets` picks the sheets to read (the first one by default).
+    Several sheets are parsed in parallel and stacked, with SHEET_COLUMN naming
+    the sheet each row came from.
+    """
+    total_bytes = os.path.getsize(file_path)
+    variant = sheet_variant(sheets)
+
+    if use_cache:
+        data = data_cache.load_cached(file_path, variant)
+        if data is not None:
+            size = memory_usage(data)
+            data.attrs["memory_usage"] = {"before": size, "after": size}
+            if progress_callback:
+                progress_callback(total_bytes, total_bytes, len(data))
+            return data
+
+    if file_path.lower().endswith(".csv"):
+        chunks = []
+        rows_read = 0
+        with open(file_path, "rb") as handle:
+            for chunk in pd.read_csv(handle, chunksize=CSV_CHUNK_ROWS):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise LoadCancelled(file_path)
+                chunks.append(chunk)
+                rows_read += len(chunk)
+                if progress_callback:
+                    progress_callback(min(handle.tell(), total_bytes), total_bytes, rows_read)
+        if not chunks:
+            return pd.read_csv(file_path)
+        data = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+        before = memory_usage(data)
+        data = optimize_dtypes(detect_dates(file_path, data))
+    else:
+        # Sheets cannot be streamed, so progress is only known as whole sheets finish
+        if progress_callback:
+            progress_callback(0, None, 0)
+        parsed = read_excel_sheets(file_path, sheets or [0], progress_callback, cancel_event)
+        before = sum(size for _, size in parsed)
+        if len(parsed) == 1:
+            data = parsed[0][0]
+        else:
+            frames = [frame for frame, _ in parsed]
+            data = pd.concat(frames, ignore_index=True)
+            codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+            data[SHEET_COLUMN] = pd.Categorical.from_codes(codes, categories=[str(sheet) for sheet in sheets])
+            # Categories that differ between sheets come back as object columns from concat
+            data = optimize_dtypes(data)
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelled(file_path)
+
+    data.attrs["memory_usage"] = {"before": before, "after": memory_usage(data)}
+
+    if use_cache:
+        data_cache.store(file_path, data, variant)
+    if progress_callback:
+        progress_callback(total_bytes, total_bytes, len(data))
+    return data
+
+
+def folder_files(folder, pattern=FOLDER_PATTERN):
+    """Files directly inside folder matching any of the semicolon-separated patterns, in name order."""
+    patterns = [part.strip().lower() for part in pattern.split(";") if part.strip()]
+    names = sorted(name for name in os.listdir(folder)
+                   if os.path.isfile(os.path.join(folder, name)) and any(fnmatch.fnmatch(name.lower(), part) for part in patterns))
+    return [os.path.join(folder, name) for name in names]
+
+
+def read_source(file_path, use_cache=True):
+    """read_dataset() for one file of a folder load; runs in a worker process."""
+    return read_dataset(file_path, use_cache=use_cache)
+
+
+def unified_dtype(dtypes, complete):
+    """One dtype that holds every column in dtypes; complete is False when some files lack the column."""
+    first = dtypes[0]
+    if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+        categories = pd.Index([])
+        for dtype in dtypes:
+            categories = categories.append(dtype.categories[~dtype.categories.isin(categories)])
+        return pd.CategoricalDtype(categories)
+    if all(isinstance(dtype, np.dtype) for dtype in dtypes):
+        if all(dtype.kind in 'iuf' for dtype in dtypes):
+            dtype = np.result_type(*dtypes)
+            # Rows from files without the column are NaN, which integers cannot hold
+            return dtype if complete or dtype.kind == 'f' else np.dtype(np.float64)
+        if all(dtype.kind == 'M' for dtype in dtypes):
+            return np.dtype('datetime64[ns]')
+        if all(dtype == first for dtype in dtypes) and (complete or first.kind == 'O'):
+            return first
+    return np.dtype(object)
+
+
+def concat_unified(frames):
+    """Stack frames with the union of their columns, each output column written once into a preallocated array.
+
+    Unlike pd.concat there is no intermediate reindexed copy per frame, and
+    categoricals with different categories are recoded into one category set
+    instead of falling back to object.
+    """
+    columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+    lengths = [len(frame) for frame in frames]
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    total = int(bounds[-1])
+    result = {}
+    for column in columns:
+        present = [(position, frame[column]) for position, frame in enumerate(frames) if column in frame.columns]
+        dtype = unified_dtype([values.dtype for _, values in present], len(present) == len(frames))
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes = np.full(total, -1, dtype=np.int32)
+            for position, values in present:
+                lookup = dtype.categories.get_indexer(values.cat.categories)
+                source = values.cat.codes.to_numpy()
+                codes[bounds[position]:bounds[position + 1]] = np.where(source >= 0, lookup[source], -1)
+            result[column] = pd.Categorical.from_codes(codes, dtype=dtype)
+            continue
+        if dtype.kind == 'M':
+            out = np.full(total, np.datetime64('NaT'), dtype=dtype)
+        elif dtype.kind == 'f' or dtype == object:
+            out = np.full(total, np.nan, dtype=dtype)
+        else:
+            out = np.empty(total, dtype=dtype)
+        for position, values in present:
+            out[bounds[position]:bounds[position + 1]] = values.to_numpy(dtype=dtype)
+        result[column] = out
+    return pd.DataFrame(result, columns=columns)
+
+
+def read_folder(folder, progress_callback=None, cancel_event=None, pattern=FOLDER_PATTERN, use_cache=True, workers=None):
+    """Read every matching file in folder in parallel and stack them into one frame.
+
+    Each file goes through read_dataset() (and so the columnar cache) in a worker
+    process. Columns are the union over all files with reconciled dtypes, and
+    SOURCE_COLUMN names the file each row came from. Progress is reported as
+    files finish, in bytes of the files done.
+    """
+    file_paths = folder_files(folder, pattern)
+    if not file_paths:
+        raise ValueError(f"No files matching {pattern} in {folder}.")
+    sizes = [os.path.getsize(file_path) for file_path in file_paths]
+    total_bytes = sum(sizes)
+    frames = [None] * len(file_paths)
+    progress = {'bytes': 0, 'rows': 0}
+
+    def finished(position, data):
+        frames[position] = data
+        progress['bytes'] += sizes[position]
+        progress['rows'] += len(data)
+        if progress_callback:
+            progress_callback(progress['bytes'], total_bytes, progress['rows'])
+
+    if progress_callback:
+        progress_callback(0, total_bytes, 0)
+    parallel_parse(read_source, [(file_path, use_cache) for file_path in file_paths], finished, cancel_event, folder, workers)
+
+    before = sum(frame.attrs.get("memory_usage", {}).get("before", memory_usage(frame)) for frame in frames)
+    data = concat_unified(frames)
+    codes = np.repeat(np.arange(len(frames), dtype=np.int32), [len(frame) for frame in frames])
+    data[SOURCE_COLUMN] = pd.Categorical.from_codes(codes, categories=[os.path.basename(file_path) for file_path in file_paths])
+    # Columns that had to become object to hold every file's values are compacted again
+    data = optimize_dtypes(data)
+    data.attrs["memory_usage"] = {"before": before, "after": memory_usage(data)}
+    data.attrs["source_files"] = len(file_paths)
+    return data
+
+
+class LazyDataset:
+    """Wide file opened by header and type sample only; columns are read when first used.
+
+    Supports the small part of the DataFrame interface the visualizer relies on
+    (`columns`, `dtypes`, `len()`, `data[column]`, `data[[columns]]`). Columns come
+    from the in-memory LRU, the columnar cache or a `usecols` parse, in that order,
+    and are evicted least recently used once LAZY_CACHE_BYTES is exceeded.
+    """
+
+    def __init__(self, file_path, sample_rows=LAZY_SAMPLE_ROWS, max_bytes=LAZY_CACHE_BYTES, sheet=None):
+        self.file_path = file_path
+        self.is_csv = file_path.lower().endswith(".csv")
+        self.sheet = sheet
+        self.variant = sheet_variant(None if sheet is None else [sheet])
+        sample = pd.read_csv(file_path, nrows=sample_rows) if self.is_csv else self._read_excel(nrows=sample_rows)
+        # Formats inferred from the sample are remembered, so columns fetched later convert without inference
+        self.sample = detect_dates(file_path, sample, self.variant)
+        self.columns = self.sample.columns
+        self.max_bytes = max_bytes
+        self.loaded = OrderedDict()
+        self.loaded_bytes = 0
+        self.row_count = None
+        self.attrs = {}
+
+    def _read_excel(self, **kwargs):
+        return pd.read_excel(self.file_path, sheet_name=0 if self.sheet is None else self.sheet, engine=excel_engine(), **kwargs)
+
+    @property
+    def empty(self):
+        return self.sample.empty
+
+    @property
+    def dtypes(self):
+        """Types of loaded columns, falling back to the sample's types for the rest."""
+        return pd.Series({column: self.loaded[column].dtype if column in self.loaded else self.sample[column].dtype for column in self.columns}, dtype=object)
+
+    def __len__(self):
+        if self.row_count is None:
+            self.load_columns([self.columns[0]])
+        return self.row_count
+
+    def __getitem__(self, key):
+        if isinstance(key, (list, tuple, pd.Index)):
+            columns = list(key)
+            self.load_columns(columns)
+            return pd.DataFrame({column: self.loaded[column] for column in columns}, columns=columns)
+        self.load_columns([key])
+        return self.loaded[key]
+
+    def _remember(self, column, values):
+        if column in self.loaded:
+            self.loaded_bytes -= self.loaded[column].memory_usage(index=False, deep=True)
+        self.loaded[column] = values
+        self.loaded_bytes += values.memory_usage(index=False, deep=True)
+        if self.row_count is None:
+            self.row_count = len(values)
+
+    def load_columns(self, columns):
+        missing = [column for column in columns if column not in self.loaded]
+        for column in columns:
+            if column in self.loaded:
+                self.loaded.move_to_end(column)
+        if missing:
+            self._fetch(missing)
+        self._evict(keep=set(columns))
+
+    def _fetch(self, columns):
+        unknown = [column for column in columns if column not in self.columns]
+        if unknown:
+            raise KeyError(unknown)
+
+        # A full cached copy from an earlier non-lazy load answers every column at once
+        data = data_cache.load_cached(self.file_path, self.variant, columns=[str(column) for column in columns])
+        if data is not None:
+            for column, name in zip(columns, data.columns):
+                self._remember(column, data[name])
+            return
+
+        remaining = []
+        for column in columns:
+            cached = data_cache.load_cached(self.file_path, variant=f"{self.variant}column:{column}")
+            if cached is not None:
+                self._remember(column, cached.iloc[:, 0].rename(column))
+            else:
+                remaining.append(column)
+        if not remaining:
+            return
+
+        if self.is_csv:
+            data = pd.read_csv(self.file_path, usecols=remaining)
+        else:
+            data = self._read_excel(usecols=remaining)
+        data = optimize_dtypes(detect_dates(self.file_path, data, self.variant))
+        for column in remaining:
+            values = data[column]
+            self._remember(column, values)
+            data_cache.store(self.file_path, values.to_frame(), variant=f"{self.variant}column:{column}")
+
+    def column_chunks(self, column, chunk_rows=CSV_CHUNK_ROWS):
+        """Yield a numeric column as float arrays chunk by chunk, without keeping it loaded.
+
+        Lets histograms of files larger than memory be computed from disk. Columns
+        already in memory, and workbooks (which cannot be streamed), come as one chunk.
+        """
+        if column in self.loaded or not self.is_csv:
+            yield pd.to_numeric(self[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            return
+        for chunk in pd.read_csv(self.file_path, usecols=[column], chunksize=chunk_rows):
+            yield pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _evict(self, keep):
+        for column in list(self.loaded):
+            if self.loaded_bytes <= self.max_bytes:
+                break
+            if column not in keep:
+                self.loaded_bytes -= self.loaded.pop(column).memory_usage(index=False, deep=True)
+
+
+def open_lazy_dataset(file_path, progress_callback=None, cancel_event=None, sheet=None):
+    """Reader with the same signature as read_dataset() that only reads the header and a sample."""
+    if progress_callback:
+        progress_callback(0, None, 0)
+    data = LazyDataset(file_path, sheet=sheet)
+    if cancel_event is not None and cancel_event.is_set():
+        raise LoadCancelled(file_path)
+    return data
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2 only has the candidate list below
+    guess_datetime_format = None
+
+# Distinct values sampled from a text column to decide whether it holds dates
+DATE_SAMPLE_SIZE = 1000
+# Rows per sampled value read from the head of a column, so repetitive columns still yield distinct values
+DATE_SCAN_FACTOR = 20
+# Share of the sample one format must parse for the column to count as dates
+DATE_MATCH_RATIO = 0.9
+# Formats tried in order; where day and month are ambiguous the first match wins
+DATE_FORMATS = (
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S.%f", "%Y/%m/%d", "%Y/%m/%d %H:%M:%S",
+    "%d/%m/%Y", "%m/%d/%Y", "%d/%m/%Y %H:%M", "%m/%d/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%m/%d/%Y %H:%M:%S",
+    "%d-%m-%Y", "%d.%m.%Y", "%d %b %Y", "%d %B %Y", "%b %d, %Y", "%B %d, %Y", "%d-%b-%Y",
+)
+# Marks a column that was checked and is not a date, so the check is not repeated on reload
+NOT_A_DATE = ""
+
+
+def date_sample(values, size=DATE_SAMPLE_SIZE):
+    """Up to size distinct non-empty strings from the head of a text column, or None when that head is not all text."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.cat.categories
+    # Only the head is typed and deduplicated; parse_dates still checks every value before a column is converted
+    head = pd.Series(values).iloc[:size * DATE_SCAN_FACTOR]
+    if pd.api.types.infer_dtype(head, skipna=True) != 'string':
+        return None
+    sample = head.dropna().drop_duplicates()
+    sample = sample.iloc[:size].astype(str).str.strip()
+    sample = sample[sample != ""]
+    # Plain numbers (IDs, years, amounts) are not dates even when a format like %Y%m%d would parse them
+    if sample.empty or not sample.str.contains(r"\D", regex=True).all():
+        return None
+    return sample
+
+
+def infer_date_format(sample):
+    """The strptime format that parses the most of sample, or None when none parses DATE_MATCH_RATIO of it."""
+    candidates = list(DATE_FORMATS)
+    if guess_datetime_format is not None:
+        guessed = guess_datetime_format(sample.iloc[0])
+        if guessed and guessed not in candidates:
+            candidates.insert(0, guessed)
+    head = sample.iloc[:20]
+    best, best_count = None, 0
+    for fmt in candidates:
+        # A format that parses none of the first values cannot reach the match ratio; skip the full sample
+        if pd.to_datetime(head, format=fmt, errors='coerce').isna().all():
+            continue
+        count = int(pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum())
+        if count > best_count:
+            best, best_count = fmt, count
+            if count == len(sample):
+                break
+    return best if best_count >= DATE_MATCH_RATIO * len(sample) else None
+
+
+def parse_dates(values, fmt):
+    """Parse a text column with fmt, falling back to per-value parsing for the residue fmt misses.
+
+    Returns datetime64 values, or None when any non-empty value is still not a
+    date, so a column is never converted at the cost of losing values.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Each distinct string is parsed once and spread through the codes
+        parsed_categories = parse_dates(pd.Series(values.cat.categories.astype(str)), fmt)
+        if parsed_categories is None:
+            return None
+        codes = values.cat.codes.to_numpy()
+        result = np.where(codes >= 0, parsed_categories.to_numpy()[codes], np.datetime64('NaT'))
+        return pd.Series(result.astype('datetime64[ns]'), index=values.index, name=values.name)
+
+    text = values.astype(str).str.strip().where(values.notna())
+    text = text.where(text != "")
+    parsed = pd.to_datetime(text, format=fmt, errors='coerce')
+    residue = text.notna() & parsed.isna()
+    if residue.any():
+        try:
+            parsed[residue] = pd.to_datetime(text[residue], errors='coerce', format='mixed')
+        except (TypeError, ValueError):  # pandas < 2.0 has no format='mixed'
+            parsed[residue] = pd.to_datetime(text[residue], errors='coerce')
+        if parsed.dtype.kind != 'M' or (text.notna() & parsed.isna()).any():
+            return None
+    return parsed
+
+
+def convert_dates(data, formats=None):
+    """Convert text columns that hold dates to datetime64, reusing known formats.
+
+    formats maps column names to the format found on an earlier load (or
+    NOT_A_DATE), so only new columns are sampled; a known format that no longer
+    parses the column is inferred again. Returns the converted frame and the
+    formats of every text column checked, for the caller to cache.
+    """
+    formats = dict(formats or {})
+    found = {}
+    converted = {}
+    for column in data.columns:
+        values = data[column]
+        if values.dtype.kind != 'O' and not pd.api.types.is_string_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        key = str(column)
+        fmt = formats.get(key)
+        parsed = parse_dates(values, fmt) if fmt else None
+        if parsed is None and fmt != NOT_A_DATE:
+            sample = date_sample(values)
+            fmt = infer_date_format(sample) if sample is not None else None
+            parsed = parse_dates(values, fmt) if fmt else None
+        if parsed is not None:
+            converted[column] = parsed
+        found[key] = fmt if parsed is not None else NOT_A_DATE
+
+    if not converted:
+        return data, found
+    result = data.copy(deep=False)
+    for column, values in converted.items():
+        result[column] = values
+    return result, found
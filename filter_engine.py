@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+NAT_VALUE = np.iinfo(np.int64).min
+
+
+class SortedIndex:
+    """Row order of a numeric or datetime column, so a range filter is two binary searches."""
+
+    def __init__(self, series):
+        self.dtype = series.dtype
+        self.is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+        if self.is_datetime:
+            keys = np.asarray(series.array.asi8)
+            valid = keys != NAT_VALUE
+        elif series.dtype.kind in 'iu':
+            keys = series.to_numpy()
+            valid = None
+        else:
+            keys = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(keys)
+
+        rows = np.arange(len(keys)) if valid is None else np.flatnonzero(valid)
+        valid_keys = keys if valid is None else keys[valid]
+        order = np.argsort(valid_keys, kind='stable')
+        self.row_order = rows[order]
+        self.sorted_keys = valid_keys[order]
+        self.length = len(keys)
+
+    def key(self, value):
+        if not self.is_datetime:
+            return value
+        timestamp = pd.Timestamp(value)
+        tz = getattr(self.dtype, 'tz', None)
+        if tz is not None and timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(tz)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)  # Timezone-aware keys are stored as UTC epochs
+        unit = getattr(self.dtype, 'unit', None) or np.datetime_data(self.dtype)[0]
+        return timestamp.to_datetime64().astype(f'datetime64[{unit}]').astype(np.int64)
+
+    def range_mask(self, min_val, max_val):
+        start = np.searchsorted(self.sorted_keys, self.key(min_val), side='left')
+        stop = np.searchsorted(self.sorted_keys, self.key(max_val), side='right')
+        mask = np.zeros(self.length, dtype=bool)
+        if stop > start:
+            mask[self.row_order[start:stop]] = True
+        return mask
+
+
+class CategoryIndex:
+    """Dictionary-encoded column, so membership is an integer lookup table instead of isin."""
+
+    def __init__(self, series):
+        self.codes, self.uniques = pd.factorize(series, use_na_sentinel=True)
+        self.uniques = pd.Index(self.uniques)
+        self._by_text = None
+
+    def codes_for(self, values):
+        found = self.uniques.get_indexer(values)
+        if (found < 0).any():
+            # Values coming back from Tk widgets are strings even when the column holds numbers
+            if self._by_text is None:
+                self._by_text = {str(value): code for code, value in enumerate(self.uniques)}
+            found = np.array([code if code >= 0 else self._by_text.get(str(value), -1) for code, value in zip(found, values)], dtype=np.intp)
+        return found[found >= 0]
+
+    def lookup(self, values):
+        """Boolean table indexed by code; the extra trailing slot is what the missing-value code (-1) reads, so nulls never match."""
+        lookup = np.zeros(len(self.uniques) + 1, dtype=bool)
+        lookup[self.codes_for(values)] = True
+        return lookup
+
+    def isin_mask(self, values):
+        return self.lookup(values)[self.codes]
+
+
+class FilterEngine:
+    """Per-column boolean masks over an unmodified DataFrame.
+
+    The loaded frame is never replaced: each filtered column keeps its own NumPy
+    mask, masks are combined with bitwise AND, and the filtered rows are only
+    copied out when view() is called. Every change bumps `version`, which other
+    caches use to know when filtered results are stale. Range and category
+    indexes are built the first time a column is filtered and reused afterwards.
+    """
+
+    def __init__(self, data):
+        self.original = data
+        self.indexes = {}
+        self.masks = {}
+        self.descriptions = {}
+        self.categories = {}  # Selected values of the filters set through set_categories
+        self.version = 0
+        self._combined = None
+        self._views = {}
+
+    def _changed(self):
+        self.version += 1
+        self._combined = None
+        self._views = {}
+
+    def set_mask(self, column, mask, description, categories=None):
+        """Filter column by a row mask; categories are the selected values when the mask is a category selection."""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (len(self.original),):
+            raise ValueError(f"Mask for '{column}' has {mask.shape[0]} rows, expected {len(self.original)}.")
+        self.masks[column] = mask
+        self.descriptions[column] = description
+        if categories is None:
+            self.categories.pop(column, None)
+        else:
+            self.categories[column] = list(categories)
+        self._changed()
+
+    def index_for(self, column, kind):
+        index = self.indexes.get((column, kind))
+        if index is None:
+            index = kind(self.original[column])
+            self.indexes[(column, kind)] = index
+        return index
+
+    def set_range(self, column, min_val, max_val):
+        """Keep rows with min_val <= value <= max_val; datetime bounds may be strings or Timestamps."""
+        mask = self.index_for(column, SortedIndex).range_mask(min_val, max_val)
+        self.set_mask(column, mask, f"{column} between {min_val} and {max_val}")
+
+    def set_categories(self, column, selected):
+        mask = self.index_for(column, CategoryIndex).isin_mask(selected)
+        self.set_mask(column, mask, f"{column} in ({', '.join(str(value) for value in selected)})", categories=selected)
+
+    def clear(self, column):
+        if column in self.masks:
+            del self.masks[column]
+            del self.descriptions[column]
+            self.categories.pop(column, None)
+            self._changed()
+
+    def reset(self):
+        if self.masks:
+            self.masks = {}
+            self.descriptions = {}
+            self.categories = {}
+            self._changed()
+
+    @property
+    def active(self):
+        return bool(self.masks)
+
+    @property
+    def only_categories(self):
+        """True when some filter is active and every active filter is a category selection."""
+        return self.active and len(self.categories) == len(self.masks)
+
+    def mask(self):
+        """Combined mask of all filters, or None when nothing is filtered."""
+        if not self.masks:
+            return None
+        if self._combined is None:
+            masks = iter(self.masks.values())
+            combined = next(masks).copy()
+            for mask in masks:
+                combined &= mask
+            self._combined = combined
+        return self._combined
+
+    def row_count(self):
+        mask = self.mask()
+        return len(self.original) if mask is None else int(np.count_nonzero(mask))
+
+    def view(self, columns=None):
+        """Filtered rows (optionally only `columns`), built on first use after each change."""
+        key = None if columns is None else tuple(columns)
+        if key not in self._views:
+            data = self.original if columns is None else self.original[list(columns)]
+            mask = self.mask()
+            if mask is not None:
+                data = data.loc[mask]
+            self._views = {key: data}  # Only the most recent view is kept alive
+        return self._views[key]
+
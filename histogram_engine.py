@@ -0,0 +1,142 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Values kept (uniformly at random) to estimate quartiles when the data arrives in chunks
+QUANTILE_SAMPLE_SIZE = 200_000
+# Upper bound on automatically chosen bins; heavy tails can otherwise ask for millions
+MAX_AUTO_BINS = 2000
+CACHE_SIZE = 16
+
+
+class HistogramSummary:
+    """Moments, range, quartiles and bin counts of a numeric column, computed once.
+
+    `chunk_source` is a callable returning an iterable of arrays. In-memory data
+    passes a single chunk and gets exact quartiles; its finite float values are
+    kept for later bin counts and chunk_source is dropped, so the summary holds
+    no reference to the column it came from. A chunked source (a column streamed
+    from disk) is read once for the moments and a uniform sample for the
+    quartiles, and once more per set of bin edges. Non-finite values are ignored.
+    """
+
+    def __init__(self, chunk_source, seed=0):
+        self.chunk_source = chunk_source
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._counts = {}
+
+        rng = np.random.default_rng(seed)
+        sample = np.empty(0)
+        sample_keys = np.empty(0)
+        chunks = 0
+        first_chunk = None
+        for values in chunk_source():
+            values = finite_values(values)
+            chunks += 1
+            first_chunk = values if chunks == 1 else None
+            if not len(values):
+                continue
+            self._merge(values)
+            # Bottom-k of random keys is a uniform sample of everything seen so far
+            keys = rng.random(len(values))
+            sample = np.concatenate((sample, values))
+            sample_keys = np.concatenate((sample_keys, keys))
+            if len(sample) > QUANTILE_SAMPLE_SIZE:
+                keep = np.argpartition(sample_keys, QUANTILE_SAMPLE_SIZE)[:QUANTILE_SAMPLE_SIZE]
+                sample, sample_keys = sample[keep], sample_keys[keep]
+
+        # A single in-memory chunk gets exact quartiles; streamed data uses the sample
+        self.exact_quartiles = first_chunk is not None or self.count <= len(sample)
+        quartile_source = first_chunk if first_chunk is not None else sample
+        self.q25, self.q75 = np.percentile(quartile_source, [25, 75]) if len(quartile_source) else (np.nan, np.nan)
+        self._values = first_chunk
+        if first_chunk is not None:
+            self.chunk_source = None
+
+    def _merge(self, values):
+        """Combine a chunk's central moments into the running totals (Chan et al.)."""
+        count = len(values)
+        mean = values.mean()
+        centered = values - mean
+        m2 = np.dot(centered, centered)
+        m3 = np.sum(centered ** 3)
+        total = self.count + count
+        delta = mean - self.mean
+        self.m3 += m3 + delta ** 3 * self.count * count * (self.count - count) / total ** 2 + 3 * delta * (self.count * m2 - count * self.m2) / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    @property
+    def empty(self):
+        return self.count == 0
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / self.count) if self.count else np.nan
+
+    @property
+    def skew(self):
+        """Sample skewness, matching scipy.stats.skew with its default bias=True."""
+        if not self.count or self.m2 == 0:
+            return np.nan
+        return np.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    def default_bin_count(self):
+        """Freedman-Diaconis rule, falling back to a std-based width when the IQR is zero."""
+        bin_width = 2 * (self.q75 - self.q25) * self.count ** (-1 / 3)
+        if not bin_width > 0:
+            bin_width = 2.7 * self.std / (self.count ** (1 / 3))
+        if not bin_width > 0:
+            return 1
+        return int(min(max(1, (self.max - self.min) / bin_width), MAX_AUTO_BINS))
+
+    def default_edges(self):
+        low, high = (self.min, self.max) if self.max > self.min else (self.min - 0.5, self.max + 0.5)
+        return np.linspace(low, high, self.default_bin_count() + 1)
+
+    def counts(self, edges):
+        """Bin counts for uniform `edges`, cached per (bins, low, high)."""
+        edges = np.asarray(edges, dtype=np.float64)
+        key = (len(edges) - 1, float(edges[0]), float(edges[-1]))
+        if key not in self._counts:
+            if self._values is not None:
+                counts = np.histogram(self._values, bins=key[0], range=(key[1], key[2]))[0]
+            else:
+                counts = np.zeros(len(edges) - 1, dtype=np.int64)
+                for values in self.chunk_source():
+                    counts += np.histogram(finite_values(values), bins=key[0], range=(key[1], key[2]))[0]
+            self._counts[key] = counts
+        return self._counts[key]
+
+
+def finite_values(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.isfinite(values)]
+
+
+class HistogramCache:
+    """Summaries keyed by (column, dataset version), least recently used dropped first."""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key, chunk_source):
+        if key is None:
+            return HistogramSummary(chunk_source)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        summary = HistogramSummary(chunk_source)
+        self._entries[key] = summary
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return summary
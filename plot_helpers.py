@@ -0,0 +1,257 @@
+import numpy as np
+import pandas as pd
+from matplotlib.artist import Artist
+from matplotlib.colors import LogNorm
+from matplotlib.text import Text
+from matplotlib.transforms import IdentityTransform
+
+# Points drawn per line before downsampling kicks in
+DEFAULT_POINT_BUDGET = 5000
+# Histograms with at least this many bins are drawn as one step patch instead of one bar each
+STAIRS_MIN_BINS = 200
+# Scatter plots with more rows than this are drawn as a density image
+DENSITY_THRESHOLD = 200_000
+DENSITY_BINS = 400
+# Value labels drawn per chart at most; the rest are hidden and counted in a notice
+MAX_VALUE_LABELS = 500
+# Value labels whose font would be smaller than this many pixels are not drawn
+MIN_LABEL_PIXELS = 5
+
+
+def add_subtitle(ax, text):
+    """Queue a note (e.g. downsampling info) to be shown under the chart title."""
+    notes = ax.__dict__.setdefault('chart_notes', [])
+    if text not in notes:
+        notes.append(text)
+
+
+def subtitles(ax):
+    return list(getattr(ax, 'chart_notes', []))
+
+
+def numeric_axis_values(values):
+    """Float positions for a numeric or datetime column, or None for categorical data."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        keys = np.asarray(pd.Series(values).array.asi8, dtype=np.float64)
+        # asi8 holds NaT as the int64 minimum, a finite time in 1677; it has to read as missing
+        keys[np.asarray(pd.isna(values))] = np.nan
+        known = keys[np.isfinite(keys)]
+        return keys - known[0] if len(known) else keys  # Offset keeps float precision on epoch values
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+    return None
+
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the line's shape.
+
+    x must be sorted. The first and last points are always kept; every bucket in
+    between keeps the point forming the largest triangle with the previously kept
+    point and the average of the next bucket, so peaks and troughs survive.
+    """
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+
+    # Middle points are split into threshold - 2 buckets; bucket b covers edges[b]:edges[b + 1]
+    every = (length - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = length - 1
+
+    # Average point of the bucket after each bucket, from prefix sums; after the last bucket comes the final point
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    next_starts = edges[1:]
+    next_stops = np.append(edges[2:], length)
+    sizes = next_stops - next_starts
+    avg_x = (x_sums[next_stops] - x_sums[next_starts]) / sizes
+    avg_y = (y_sums[next_stops] - y_sums[next_starts]) / sizes
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = length - 1
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        areas = np.abs((x[anchor] - avg_x[bucket]) * (y[start:stop] - y[anchor]) - (x[anchor] - x[start:stop]) * (avg_y[bucket] - y[anchor]))
+        anchor = start + int(np.argmax(areas))
+        indices[bucket + 1] = anchor
+    return indices
+
+
+def downsample_frame(data, x_col, y_cols, budget):
+    """Rows of data (sorted by x_col) that keep every Y line's shape within `budget` points per line.
+
+    Returns (frame, original_row_count). The union of each line's LTTB points is
+    kept so stacked or twin-axis series stay aligned on the same X values.
+    Categorical X axes and frames already within budget are returned unchanged.
+    """
+    total = len(data)
+    if not budget or total <= budget:
+        return data, total
+    x = numeric_axis_values(data[x_col])
+    if x is None:
+        return data, total
+
+    keep = []
+    for y_col in y_cols:
+        y = pd.to_numeric(data[y_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        if len(finite) > budget:
+            keep.append(finite[lttb_indices(x[finite], y[finite], budget)])
+        else:
+            keep.append(finite)
+    rows = np.unique(np.concatenate(keep)) if keep else np.arange(total)
+    return data.iloc[rows], total
+
+
+def density_grid(x, y, bins=DENSITY_BINS):
+    """Count finite (x, y) points on a bins x bins grid with a single bincount.
+
+    Returns (counts, extent) where counts[row, col] has rows along Y, ready for
+    imshow(origin='lower', extent=extent).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if not len(x):
+        return np.zeros((bins, bins), dtype=np.int64), (0.0, 1.0, 0.0, 1.0)
+
+    extent = []
+    cells = []
+    for values in (x, y):
+        low, high = values.min(), values.max()
+        if high == low:
+            low, high = low - 0.5, high + 0.5
+        extent += [low, high]
+        cells.append(np.minimum(((values - low) * (bins / (high - low))).astype(np.int64), bins - 1))
+    counts = np.bincount(cells[1] * bins + cells[0], minlength=bins * bins).reshape(bins, bins)
+    return counts, tuple(extent)
+
+
+def draw_density(ax, x, y, bins=DENSITY_BINS, cmap='viridis'):
+    """Draw points as one log-scaled density image instead of one marker each."""
+    counts, extent = density_grid(x, y, bins)
+    image = ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', extent=extent, aspect='auto',
+                      interpolation='nearest', cmap=cmap, norm=LogNorm(vmin=1, vmax=max(int(counts.max()), 1)))
+    ax.figure.colorbar(image, ax=ax, label='Points per cell')
+    return image
+
+
+def draw_histogram_bars(ax, counts, edges, color='lightblue', edgecolor='black', alpha=0.7):
+    """Draw precomputed histogram counts; many bins become a single filled step artist."""
+    if len(counts) >= STAIRS_MIN_BINS:
+        return ax.stairs(counts, edges, fill=True, color=color, edgecolor=edgecolor, alpha=alpha)
+    return ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color=color, edgecolor=edgecolor, alpha=alpha)
+
+
+class ValueLabels(Artist):
+    """Value labels for many bars or points, drawn by one artist.
+
+    Each label is laid out by a single reused Text at draw time, so thousands of
+    values add one artist to the axes instead of thousands, and tight_layout()
+    ignores them. Labels that would overlap an earlier label, fall outside the
+    axes or render below MIN_LABEL_PIXELS are skipped, at most max_labels are
+    drawn, and a notice in the corner says how many were left out. x, y and
+    texts are parallel sequences in data coordinates; color and va may be one
+    value or one per label.
+    """
+
+    def __init__(self, x, y, texts, font_size=8, color='black', ha='center', va='bottom', offset=(0, 2),
+                 max_labels=MAX_VALUE_LABELS):
+        super().__init__()
+        self.x = x
+        self.y = np.asarray(y, dtype=np.float64)
+        self.texts = list(texts)
+        count = len(self.texts)
+        self.colors = list(color) if isinstance(color, list) else [color] * count
+        self.vas = [va] * count if isinstance(va, str) else list(va)
+        self.ha = ha
+        self.font_size = font_size
+        self.offset = offset
+        self.max_labels = max_labels
+        self.shown = 0
+        self.set_in_layout(False)
+        self._text = Text(fontsize=font_size, ha=ha, transform=IdentityTransform(), clip_on=False)
+        self._notice = Text(0.01, 0.99, '', fontsize=7, ha='left', va='top', color='dimgray')
+
+    def set_figure(self, fig):
+        super().set_figure(fig)
+        self._text.set_figure(fig)
+        self._notice.set_figure(fig)
+
+    def _boxes(self, renderer, points):
+        """Display-space (left, bottom, right, top) of every label, estimated from the width of a digit."""
+        digit_width, height, _ = renderer.get_text_width_height_descent("0", self._text.get_fontproperties(), ismath=False)
+        widths = np.array([len(text) for text in self.texts], dtype=np.float64) * digit_width
+        left = points[:, 0] - {'center': widths / 2, 'left': 0, 'right': widths}[self.ha]
+        vas = np.array(self.vas)
+        bottom = points[:, 1] - np.select([vas == 'top', vas == 'center'], [height, height / 2], 0)
+        return np.column_stack((left, bottom, left + widths, bottom + height))
+
+    def draw(self, renderer):
+        if not self.get_visible() or not self.texts:
+            return
+        ax = self.axes
+        total = len(self.texts)
+        reason = None
+        accepted = []
+        if renderer.points_to_pixels(self.font_size) < MIN_LABEL_PIXELS:
+            reason = "too small to read"
+        else:
+            x = np.asarray(ax.convert_xunits(self.x), dtype=np.float64)
+            points = ax.transData.transform(np.column_stack((x, self.y)))
+            dx, dy = renderer.points_to_pixels(self.offset[0]), renderer.points_to_pixels(self.offset[1])
+            up = np.array([va != 'top' for va in self.vas])
+            points = points + np.column_stack((np.full(total, dx), np.where(up, dy, -dy)))
+            boxes = self._boxes(renderer, points)
+            view = ax.bbox
+            candidates = np.flatnonzero(np.isfinite(boxes).all(axis=1) & (boxes[:, 2] >= view.x0) & (boxes[:, 0] <= view.x1)
+                                        & (boxes[:, 3] >= view.y0) & (boxes[:, 1] <= view.y1))
+            taken = np.empty((min(self.max_labels, len(candidates)), 4))
+            for index in candidates:
+                if len(accepted) == len(taken):
+                    reason = f"limit {self.max_labels:,}"
+                    break
+                box = boxes[index]
+                placed = taken[:len(accepted)]
+                if ((placed[:, 0] < box[2]) & (placed[:, 2] > box[0]) & (placed[:, 1] < box[3]) & (placed[:, 3] > box[1])).any():
+                    reason = reason or "overlapping labels hidden"
+                    continue
+                taken[len(accepted)] = box
+                accepted.append(index)
+            for index in accepted:
+                self._text.set_position(points[index])
+                self._text.set_text(self.texts[index])
+                self._text.set_color(self.colors[index])
+                self._text.set_verticalalignment(self.vas[index])
+                self._text.draw(renderer)
+        self.shown = len(accepted)
+        if self.shown < total:
+            self._notice.set_transform(ax.transAxes)
+            self._notice.set_text(f"Values shown for {self.shown:,} of {total:,} points ({reason or 'outside the view'})")
+            self._notice.draw(renderer)
+        self.stale = False
+
+
+def add_value_labels(ax, x, y, texts, **kwargs):
+    """Add a ValueLabels artist for parallel x, y and texts to ax and return it."""
+    labels = ValueLabels(x, y, texts, **kwargs)
+    ax.add_artist(labels)
+    return labels
+
+
+def label_bars(ax, rects, font_size=8, fmt='{:.2f}', horizontal=False, skip_zero=False, **kwargs):
+    """Label the end of every bar in rects with its length through one ValueLabels artist."""
+    geometry = np.array([(rect.get_x(), rect.get_y(), rect.get_width(), rect.get_height()) for rect in rects],
+                        dtype=np.float64).reshape(-1, 4)
+    left, bottom, width, height = geometry.T
+    lengths = width if horizontal else height
+    keep = lengths != 0 if skip_zero else np.ones(len(lengths), dtype=bool)
+    if horizontal:
+        kwargs = dict({'ha': 'left', 'va': 'center', 'offset': (2, 0)}, **kwargs)
+        x, y = (left + width)[keep], (bottom + height / 2)[keep]
+    else:
+        x, y = (left + width / 2)[keep], (bottom + height)[keep]
+    return add_value_labels(ax, x, y, [fmt.format(value) for value in lengths[keep]], font_size=font_size, **kwargs)
@@ -0,0 +1,219 @@
+"""Render charts without the GUI, from JSON or YAML spec files.
+
+    python render_charts.py nightly.yaml [more.json ...] [--workers N] [--no-cache]
+
+A spec file holds one chart, a list of charts, or {"defaults": {...}, "charts": [...]}
+where every chart inherits the defaults. A chart spec looks like:
+
+    {"file": "sales.xlsx", "sheet": "2024", "chart": "Bar", "x": "region", "y": ["revenue"],
+     "aggregation": "mean", "time_level": "auto", "filters": {"region": ["North", "South"], "revenue": {"min": 0}},
+     "title_font_size": 14, "x_axis_font_size": 10, "y_axis_font_size": 10,
+     "size": [12, 8], "dpi": 200, "output": "out/revenue.png"}
+
+"chart" may be "auto" (the default) to use the same recommendation as the GUI.
+"time_level" buckets a datetime X axis of a Line or Area chart by "Minute",
+"Hour", "Day", "Month" or "Year"; "auto" picks the finest that fits the point
+budget and null plots every timestamp.
+"sheet" picks a workbook sheet by name or position, or a list of sheets to stack
+like the GUI does; the first sheet is read by default. Relative paths are
+resolved against the spec file's folder. Every input file (and sheet selection)
+is loaded once however many charts use it, and all charts are rendered in parallel.
+
+Charts are prepared and drawn by dashboard.prepare_panel and draw_panel, which
+the GUI uses for every chart as well, so a spec draws what the window draws for
+the same fields, filters and settings. The window's dialogs are answered by spec
+keys instead: "time_level" (see above; a Box Plot groups by "Month" on "auto"),
+"top_n" (default 10: the bars of a Bar or Column chart, and the categories an
+Area, Box Plot or Pie Chart keeps when it has more than ten; null keeps all),
+"order" ("desc" or "asc" bars), "stack" (areas of several Y fields) and "bins"
+(a count or evenly spaced edges). Its display settings are "seaborn",
+"value_labels", "value_label_font_size", "skew", "regression", the font sizes
+and "x_rotation"/"y_rotation".
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import yaml
+except ImportError:  # YAML specs are optional; JSON always works
+    yaml = None
+
+from aggregation_engine import AggregationEngine
+from category_cube import CubeCache
+from chart_recommendation import ChartRecommender
+from dashboard import ALL_CHART_TYPES, CHART_DPI, DEFAULT_OPTIONS, prepare_panel, run_renders
+from data_loading import read_dataset
+from filter_engine import FilterEngine
+from histogram_engine import HistogramCache
+from time_rollups import RollupCache
+
+DEFAULT_SIZE = (12, 8)
+
+
+def read_spec_file(path):
+    with open(path, encoding="utf-8") as handle:
+        if path.lower().endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError(f"Reading {path} requires PyYAML (pip install pyyaml).")
+            return yaml.safe_load(handle)
+        return json.load(handle)
+
+
+def load_specs(path):
+    """Chart specs from a spec file, with defaults applied and paths made absolute."""
+    content = read_spec_file(path)
+    defaults = {}
+    if isinstance(content, dict) and "charts" in content:
+        defaults = content.get("defaults") or {}
+        charts = content["charts"]
+    elif isinstance(content, list):
+        charts = content
+    else:
+        charts = [content]
+
+    base = os.path.dirname(os.path.abspath(path))
+    specs = []
+    for chart in charts:
+        spec = dict(defaults, **chart)
+        for key in ("file", "output"):
+            if spec.get(key):
+                spec[key] = os.path.join(base, os.path.expanduser(spec[key]))
+        specs.append(spec)
+    return specs
+
+
+def as_list(value):
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def apply_filters(filters, spec_filters):
+    """Make filters match a spec's {"column": [values]} / {"column": {"min": .., "max": ..}} mapping."""
+    filters.reset()
+    for column, condition in (spec_filters or {}).items():
+        if column not in filters.original.columns:
+            raise KeyError(f"Filter column '{column}' not found in data.")
+        if isinstance(condition, dict):
+            values = filters.original[column]
+            filters.set_range(column, condition.get("min", values.min()), condition.get("max", values.max()))
+        else:
+            filters.set_categories(column, as_list(condition))
+
+
+def spec_sheets(spec):
+    """The workbook sheets a spec reads, as a tuple; empty for the first sheet or a CSV file."""
+    sheet = spec.get("sheet")
+    if sheet is None:
+        return ()
+    return (sheet,) if isinstance(sheet, (str, int)) else tuple(sheet)
+
+
+def filter_signature(spec):
+    return json.dumps(spec.get("filters") or {}, sort_keys=True, default=str)
+
+
+def prepare_spec(spec, filters, aggregations, histograms, rollups, recommender):
+    """Reduce a spec's data to a dashboard panel; filters must already hold the spec's filters."""
+    if not spec.get("output"):
+        raise ValueError("Every chart spec needs an 'output' path.")
+    x_cols, y_cols = as_list(spec.get("x")), as_list(spec.get("y"))
+    missing = [column for column in x_cols + y_cols if column not in filters.original.columns]
+    if missing:
+        raise KeyError(f"Fields not found in {os.path.basename(spec['file'])}: {', '.join(missing)}")
+
+    data = filters.view(list(dict.fromkeys(x_cols + y_cols)))
+    chart_type = spec.get("chart", "auto")
+    if chart_type == "auto":
+        chart_type = recommender.recommend(x_cols, y_cols or x_cols)[0]
+    if chart_type not in ALL_CHART_TYPES:
+        raise ValueError(f"Unknown chart type '{chart_type}'; choose one of {', '.join(ALL_CHART_TYPES)} or 'auto'.")
+
+    options = {key: spec.get(key, default) for key, default in DEFAULT_OPTIONS.items()}
+    title = spec.get("title") or f"{chart_type}: {', '.join(x_cols)} vs {', '.join(y_cols)}"
+    return prepare_panel(chart_type, title, data, x_cols, y_cols, options, aggregations, histograms, filters.version, rollups)
+
+
+def run_specs(specs, workers=None, use_cache=True):
+    """Load each input file and sheet selection once, prepare every chart and render them all in parallel.
+
+    Returns one report per spec, in order: output, title, chart, error (None when
+    it worked), prepare_seconds and render_seconds.
+    """
+    report = [None] * len(specs)
+    prepared = [None] * len(specs)
+    by_source = {}
+    for position, spec in enumerate(specs):
+        by_source.setdefault((spec.get("file"), spec_sheets(spec)), []).append(position)
+
+    for (file_path, sheets), positions in by_source.items():
+        start = time.perf_counter()
+        try:
+            if not file_path:
+                raise ValueError("Every chart spec needs a 'file' to read.")
+            filters = FilterEngine(read_dataset(file_path, use_cache=use_cache, sheets=list(sheets) or None))
+        except Exception as e:
+            for position in positions:
+                report[position] = failure(specs[position], f"{type(e).__name__}: {e}", time.perf_counter() - start)
+            continue
+        aggregations = AggregationEngine(cubes=CubeCache(filters))
+        histograms = HistogramCache()
+        rollups = RollupCache()
+        recommender = ChartRecommender(filters)
+        # Charts sharing filters run back to back and share one filter version, and so its cached aggregates
+        positions.sort(key=lambda position: filter_signature(specs[position]))
+        applied = None
+        for position in positions:
+            start = time.perf_counter()
+            try:
+                if filter_signature(specs[position]) != applied:
+                    applied = None
+                    apply_filters(filters, specs[position].get("filters"))
+                    applied = filter_signature(specs[position])
+                prepared[position] = prepare_spec(specs[position], filters, aggregations, histograms, rollups, recommender)
+                prepared[position]['prepare_seconds'] = time.perf_counter() - start
+            except Exception as e:
+                report[position] = failure(specs[position], f"{type(e).__name__}: {e}", time.perf_counter() - start)
+
+    jobs = []
+    for position, panel in enumerate(prepared):
+        if panel is not None:
+            spec = specs[position]
+            os.makedirs(os.path.dirname(spec["output"]) or ".", exist_ok=True)
+            jobs.append((position, (panel, tuple(spec.get("size", DEFAULT_SIZE)), spec.get("dpi", CHART_DPI), False, spec["output"])))
+    results = run_renders([job for _, job in jobs], workers) if jobs else []
+    for (position, _), result in zip(jobs, results):
+        report[position] = {'output': result['path'] or specs[position]["output"], 'title': result['title'],
+                            'chart': result['chart'], 'error': result['error'],
+                            'prepare_seconds': prepared[position]['prepare_seconds'], 'render_seconds': result['render_seconds']}
+    return report
+
+
+def failure(spec, error, seconds):
+    return {'output': spec.get("output"), 'title': spec.get("title"), 'chart': spec.get("chart", "auto"),
+            'error': error, 'prepare_seconds': seconds, 'render_seconds': 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render charts from JSON/YAML spec files without the GUI.")
+    parser.add_argument("specs", nargs="+", help="spec files (.json, .yaml or .yml)")
+    parser.add_argument("--workers", type=int, default=None, help="rendering processes (default: one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="parse input files even when a cached copy exists")
+    args = parser.parse_args(argv)
+
+    specs = []
+    for path in args.specs:
+        specs.extend(load_specs(path))
+    report = run_specs(specs, workers=args.workers, use_cache=not args.no_cache)
+    for entry in report:
+        seconds = entry['prepare_seconds'] + entry['render_seconds']
+        status = "ok" if entry['error'] is None else f"FAILED - {entry['error']}"
+        print(f"{entry['output']}: {entry['chart']} {status} ({seconds:.2f}s)")
+    return 1 if any(entry['error'] for entry in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
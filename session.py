@@ -0,0 +1,172 @@
+import json
+import os
+
+import numpy as np
+
+from data_loading import LoadCancelled
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc
+except ImportError:  # Sessions can still be saved without pyarrow, but then restoring re-reads the source file
+    pa = None
+    feather = None
+
+# Bump when the session layout changes; older files are refused rather than half restored
+SESSION_VERSION = 1
+SESSION_SUFFIX = ".vizsession"
+# Dataset attributes worth keeping with a snapshot (the rest describe a particular load)
+SNAPSHOT_ATTRS = ("source_files", "memory_usage")
+# Rows per record batch of a snapshot; progress is reported and cancellation checked between batches
+SNAPSHOT_BATCH_ROWS = 1_000_000
+
+
+class SessionError(Exception):
+    """A session file that cannot be restored: unreadable, from another version, or missing its snapshot."""
+
+
+def sidecar_path(session_path, suffix):
+    """Path of a file stored next to the session, named after it."""
+    base = session_path[:-len(SESSION_SUFFIX)] if session_path.endswith(SESSION_SUFFIX) else session_path
+    return base + suffix
+
+
+def write_atomic(path, write):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def filter_state(filters):
+    """(column, mask, description, categories) of every active filter of a FilterEngine.
+
+    Masks are replaced rather than modified when filters change, so the result
+    can be saved from another thread while the filters keep being edited.
+    """
+    return [(column, mask, filters.descriptions[column], filters.categories.get(column)) for column, mask in filters.masks.items()]
+
+
+def write_snapshot(path, table, progress_callback=None, cancel_event=None):
+    """Write table as an uncompressed Arrow IPC file (Feather V2) in record batches, reporting (bytes, total, rows)."""
+    written_bytes = rows = 0
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=SNAPSHOT_BATCH_ROWS):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled(path)
+            writer.write_batch(batch)
+            written_bytes += batch.nbytes
+            rows += batch.num_rows
+            if progress_callback:
+                progress_callback(written_bytes, table.nbytes, rows)
+
+
+def save_session(session_path, data, filters, ui_state, source=None, lazy=None, progress_callback=None, cancel_event=None):
+    """Write the UI state, the filters and a snapshot of the loaded data next to each other.
+
+    The snapshot is the whole loaded frame as uncompressed Arrow, so restoring
+    it is a memory map rather than a parse, and the filters stay editable.
+    filters comes from filter_state(); each filter is kept as its packed row
+    mask plus its description and category selection. lazy is (file path,
+    sheet) for a dataset loaded on demand, which is reopened from its source
+    instead; so is any dataset when pyarrow is missing. Safe to call from a
+    worker thread: setting cancel_event stops the snapshot between batches and
+    raises LoadCancelled, before any file is replaced. Returns the paths written.
+    """
+    written = [session_path]
+    snapshot = None
+    if lazy is None and feather is not None:
+        snapshot_path = sidecar_path(session_path, ".arrow")
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        write_atomic(snapshot_path, lambda path: write_snapshot(path, table, progress_callback, cancel_event))
+        snapshot = os.path.basename(snapshot_path)
+        written.append(snapshot_path)
+    elif progress_callback:
+        progress_callback(0, None, 0)
+
+    masks = None
+    filter_entries = []
+    if filters:
+        masks_path = sidecar_path(session_path, ".masks.npz")
+        packed = {}
+        for position, (column, mask, description, categories) in enumerate(filters):
+            packed[f"mask{position}"] = np.packbits(mask)
+            filter_entries.append({"column": column, "description": description, "categories": categories})
+
+        def write_masks(path):
+            # np.savez adds .npz to names without it, so the temporary file is written through a handle
+            with open(path, "wb") as handle:
+                np.savez_compressed(handle, **packed)
+
+        write_atomic(masks_path, write_masks)
+        masks = os.path.basename(masks_path)
+        written.append(masks_path)
+
+    session = {
+        "version": SESSION_VERSION,
+        "source": source,
+        "lazy": None if lazy is None else {"path": lazy[0], "sheet": lazy[1]},
+        "snapshot": snapshot,
+        "rows": None if lazy is not None else len(data),
+        "attrs": {key: data.attrs[key] for key in SNAPSHOT_ATTRS if key in data.attrs},
+        "masks": masks,
+        "filters": filter_entries,
+        "ui": ui_state,
+    }
+
+    def write_json(path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(session, handle, indent=2, default=str)
+
+    write_atomic(session_path, write_json)
+    return written
+
+
+def read_session(session_path):
+    """The session dictionary saved by save_session; raises SessionError when it cannot be used."""
+    try:
+        with open(session_path, encoding="utf-8") as handle:
+            session = json.load(handle)
+    except (OSError, ValueError) as e:
+        raise SessionError(f"Cannot read session file: {e}") from e
+    if not isinstance(session, dict) or session.get("version") != SESSION_VERSION:
+        raise SessionError("The session file was written by a different version of the visualizer.")
+    return session
+
+
+def load_snapshot(session_path, session):
+    """Memory-map the session's snapshot as a DataFrame, or None when the session has none."""
+    if not session.get("snapshot"):
+        return None
+    if feather is None:
+        raise SessionError("Restoring a dataset snapshot needs pyarrow.")
+    path = os.path.join(os.path.dirname(os.path.abspath(session_path)), session["snapshot"])
+    try:
+        # Mapping uncompressed Arrow IPC skips any parse, but to_pandas still reads every column of the snapshot
+        data = feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+    except (OSError, pa.ArrowException) as e:
+        raise SessionError(f"Cannot read the dataset snapshot {session['snapshot']}: {e}") from e
+    data.attrs.update(session.get("attrs") or {})
+    return data
+
+
+def restore_filters(session_path, session, filters):
+    """Reapply the saved filter masks to a FilterEngine over the restored data; returns how many were applied."""
+    if not session.get("masks"):
+        return 0
+    path = os.path.join(os.path.dirname(os.path.abspath(session_path)), session["masks"])
+    try:
+        with np.load(path) as masks:
+            row_count = len(filters.original)
+            if session.get("rows") is not None and session["rows"] != row_count:
+                raise SessionError(f"The saved filters cover {session['rows']:,} rows, but the dataset has {row_count:,}.")
+            for position, entry in enumerate(session["filters"]):
+                mask = np.unpackbits(masks[f"mask{position}"], count=row_count).astype(bool)
+                filters.set_mask(entry["column"], mask, entry["description"], categories=entry.get("categories"))
+    except (OSError, KeyError, ValueError) as e:
+        raise SessionError(f"Cannot restore the saved filters: {e}") from e
+    return len(session["filters"])
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sales():
+    """500 rows of categories, integers, numbers with gaps and timestamps over three months."""
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    rng = np.random.default_rng(0)
+    rows = 500
+    revenue = rng.normal(100, 30, rows)
+    revenue[rng.choice(rows, 25, replace=False)] = np.nan
+    return pd.DataFrame({
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "product": rng.choice(["a", "b", "c"], rows),
+        "units": rng.integers(0, 50, rows),
+        "revenue": revenue,
+        "when": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90 * 24 * 60, rows), unit="min"),
+    })
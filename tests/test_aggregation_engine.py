@@ -0,0 +1,20 @@
+"""AggregationEngine results against DataFrame.groupby."""
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from aggregation_engine import AggregationEngine
+
+
+@pytest.mark.parametrize("method", ["mean", "sum", "median", "min", "max", "count"])
+def test_aggregate_matches_groupby(sales, method):
+    result = AggregationEngine().aggregate(sales, "region", ["revenue", "units"], method)
+    expected = sales.groupby("region", as_index=False)[["revenue", "units"]].agg(method)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_aggregate_is_memoized_per_version(sales):
+    engine = AggregationEngine()
+    first = engine.aggregate(sales, "region", ["revenue"], "mean", version=1)
+    assert engine.summary(sales, "region", "revenue", version=1) is engine.summary(sales, "region", "revenue", version=1)
+    pd.testing.assert_frame_equal(engine.aggregate(sales, "region", ["revenue"], "mean", version=1), first)
@@ -0,0 +1,32 @@
+"""Category cube answers against groupby over the filtered rows."""
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from aggregation_engine import AggregationEngine
+from category_cube import CubeCache
+from filter_engine import FilterEngine
+
+
+@pytest.mark.parametrize("method", ["mean", "sum", "min", "max", "count"])
+def test_cube_matches_groupby_under_category_filters(sales, method):
+    filters = FilterEngine(sales)
+    engine = AggregationEngine(cubes=CubeCache(filters))
+    for selection in (["a"], ["b", "c"]):
+        filters.set_categories("product", selection)
+        filters.set_categories("region", ["North", "South", "West"])
+        answered = engine.cubes.aggregate("region", ["revenue"], method, filters.version)
+        assert answered is not None
+        result = engine.aggregate(filters.view(), "region", ["revenue"], method, version=filters.version)
+        expected = filters.view().groupby("region", as_index=False)[["revenue"]].agg(method)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_cube_leaves_other_filters_to_groupby(sales):
+    filters = FilterEngine(sales)
+    cubes = CubeCache(filters)
+    assert cubes.aggregate("region", ["revenue"], "mean", filters.version) is None
+    filters.set_range("units", 0, 10)
+    assert cubes.aggregate("region", ["revenue"], "mean", filters.version) is None
+    filters.set_categories("product", ["a"])
+    assert cubes.aggregate("region", ["revenue"], "median", filters.version) is None
@@ -0,0 +1,56 @@
+"""Dashboard panels against the pandas results they draw."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+pytest.importorskip("PIL")
+
+from aggregation_engine import AggregationEngine
+from dashboard import DEFAULT_OPTIONS, prepare_panel
+from histogram_engine import HistogramCache
+from time_rollups import RollupCache
+
+
+def prepare(chart_type, data, x_cols, y_cols, version=None, rollups=None, **options):
+    return prepare_panel(chart_type, chart_type, data, x_cols, y_cols, dict(DEFAULT_OPTIONS, **options),
+                         AggregationEngine(), HistogramCache(), version, rollups)
+
+
+@pytest.mark.parametrize("method", ["sum", "median"])
+def test_line_over_dates_is_grouped_per_bucket(sales, method):
+    panel = prepare("Line", sales, ["when"], ["revenue"], version=1, rollups=RollupCache(), aggregation=method, time_level="Day")
+    expected = sales.groupby(sales["when"].dt.floor("D"))["revenue"].agg(method)
+    name, x, values = panel['series'][0]
+    np.testing.assert_array_equal(x, expected.index.to_numpy())
+    np.testing.assert_allclose(values, expected.to_numpy())
+
+
+def test_auto_time_level_fits_the_point_budget(sales):
+    panel = prepare("Line", sales, ["when"], ["revenue"], point_budget=100)
+    # 90 days fit in 100 points, 90 days of hours would not
+    times = pd.DatetimeIndex(panel['series'][0][1])
+    assert 60 < len(times) <= 90 and (times == times.normalize()).all()
+
+
+def test_bars_follow_order_and_top_n(sales):
+    means = sales.groupby("region")["units"].mean()
+    panel = prepare("Bar", sales, ["region"], ["units"], top_n=2, order="asc")
+    assert panel['labels'] == list(means.nsmallest(2).index)
+    np.testing.assert_allclose(panel['values'], means.nsmallest(2).to_numpy())
+
+
+def test_pie_keeps_every_category_up_to_the_limit(sales):
+    panel = prepare("Pie Chart", sales, ["region"], [], top_n=2)
+    assert sorted(panel['labels']) == sorted(sales["region"].unique()) and panel['values'].sum() == len(sales)
+
+
+def test_custom_histogram_bins(sales):
+    panel = prepare("Histogram", sales, ["units"], [], bins=[0, 25, 50])
+    expected, _ = np.histogram(sales["units"], bins=[0, 25, 50])
+    np.testing.assert_array_equal(panel['counts'], expected)
+
+
+def test_box_plot_buckets_dates_by_month(sales):
+    panel = prepare("Box Plot", sales, ["when"], ["revenue"])
+    assert [box['label'] for box in panel['boxes']] == ["2024-01", "2024-02", "2024-03"]
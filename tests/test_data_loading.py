@@ -0,0 +1,17 @@
+"""Dtype optimization of freshly parsed frames."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from data_loading import optimize_dtypes
+
+
+@pytest.mark.parametrize("text_dtype", [object, "string"])
+def test_repetitive_text_becomes_category(sales, text_dtype):
+    data = sales.astype({"region": text_dtype})
+    optimized = optimize_dtypes(data)
+    assert isinstance(optimized["region"].dtype, pd.CategoricalDtype)
+    assert list(optimized["region"].astype(object)) == list(sales["region"])
+    assert optimized["units"].dtype == np.int8
+    pd.testing.assert_series_equal(optimized["revenue"], sales["revenue"])
@@ -0,0 +1,30 @@
+"""FilterEngine views against plain boolean indexing."""
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from filter_engine import FilterEngine
+
+
+def test_filters_match_boolean_indexing(sales):
+    filters = FilterEngine(sales)
+    assert filters.mask() is None and not filters.only_categories
+    filters.set_categories("region", ["North", "East"])
+    filters.set_range("units", 10, 30)
+    expected = sales[sales["region"].isin(["North", "East"]) & sales["units"].between(10, 30)]
+    pd.testing.assert_frame_equal(filters.view(), expected)
+    assert filters.row_count() == len(expected)
+    assert not filters.only_categories
+
+    filters.clear("units")
+    assert filters.only_categories
+    version = filters.version
+    filters.reset()
+    assert filters.version > version and filters.row_count() == len(sales)
+
+
+def test_filters_range_over_dates(sales):
+    filters = FilterEngine(sales)
+    filters.set_range("when", "2024-02-01", "2024-02-29 23:59")
+    expected = sales[sales["when"].between(pd.Timestamp("2024-02-01"), pd.Timestamp("2024-02-29 23:59"))]
+    pd.testing.assert_frame_equal(filters.view(), expected)
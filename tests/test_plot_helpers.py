@@ -0,0 +1,23 @@
+"""Axis positions and LTTB downsampling."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+from plot_helpers import downsample_frame, numeric_axis_values
+
+
+def test_missing_times_are_not_positions():
+    times = pd.Series(pd.to_datetime([None, "2024-01-01", "2024-01-03"]))
+    positions = numeric_axis_values(times)
+    assert np.isnan(positions[0])
+    np.testing.assert_array_equal(positions[1:], [0, 2 * 86_400 * 10**9])
+
+
+def test_downsample_skips_missing_times(sales):
+    data = sales.copy()
+    data.loc[data.index[:10], "when"] = pd.NaT
+    kept, total = downsample_frame(data.sort_values("when"), "when", ["revenue"], 50)
+    assert total == len(data) and len(kept) == 50
+    assert kept["when"].notna().all()
@@ -0,0 +1,28 @@
+"""Session files written and read back."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from filter_engine import FilterEngine
+from session import filter_state, load_snapshot, read_session, restore_filters, save_session
+
+
+def test_session_round_trip(sales, tmp_path):
+    filters = FilterEngine(sales)
+    filters.set_categories("region", ["North"])
+    filters.set_range("units", 5, 20)
+    path = str(tmp_path / "work.vizsession")
+    written = save_session(path, sales, filter_state(filters), {"chart_type": "Bar"}, source="sales.csv")
+    assert len(written) == 3
+
+    session = read_session(path)
+    assert session["ui"] == {"chart_type": "Bar"}
+    restored = load_snapshot(path, session)
+    pd.testing.assert_frame_equal(restored, sales, check_dtype=False)
+
+    restored_filters = FilterEngine(restored)
+    assert restore_filters(path, session, restored_filters) == 2
+    assert restored_filters.categories == {"region": ["North"]}
+    np.testing.assert_array_equal(restored_filters.mask(), filters.mask())
@@ -0,0 +1,21 @@
+"""Time rollups against DataFrame.resample."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+from time_rollups import RollupCache, suggest_level
+
+
+def test_time_rollup_matches_resample(sales):
+    rollup = RollupCache().get(sales, "when", ["revenue"], version=1)
+    for level, rule in (("Day", "D"), ("Month", "MS")):
+        times, values = rollup.series(level, "revenue", "sum")
+        expected = sales.set_index("when")["revenue"].resample(rule).sum()
+        expected = expected[sales.set_index("when")["revenue"].resample(rule).size() > 0]
+        np.testing.assert_array_equal(times, expected.index.to_numpy())
+        np.testing.assert_allclose(values, expected.to_numpy())
+
+    assert suggest_level(pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02"), 100) == "Hour"
+    assert suggest_level(pd.Timestamp("2024-01-01"), pd.Timestamp("2024-12-31"), 100) == "Month"
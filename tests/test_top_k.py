@@ -0,0 +1,31 @@
+"""Partial-sort top K picks against nlargest and value_counts."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from top_k import OTHER_LABEL, CategoryCounts, top_positions, top_rows
+
+
+def test_top_positions_match_nlargest():
+    values = np.array([3.0, np.nan, 7.0, 7.0, 1.0, 5.0, 7.0, 2.0])
+    # nlargest would pad with the NaN once k passes the numbers; top_positions never picks it
+    series = pd.Series(values).dropna()
+    for k in range(len(values) + 1):
+        assert list(top_positions(values, k)) == list(series.nlargest(k).index)
+        assert list(top_positions(values, k, largest=False)) == list(series.nsmallest(k).index)
+
+
+def test_top_rows_and_category_counts(sales):
+    pd.testing.assert_frame_equal(top_rows(sales, "revenue", 5), sales.nlargest(5, "revenue"))
+
+    counts = CategoryCounts.from_values(sales["region"])
+    expected = sales["region"].value_counts()
+    assert counts.nunique == len(expected)
+    # Compared by count, since value_counts breaks ties in no documented order
+    assert list(counts.counts[counts.top(2)]) == list(expected.iloc[:2])
+    assert counts.mask(counts.top(1)).sum() == expected.iloc[0]
+
+    with_other = counts.with_other(2)
+    assert list(with_other.iloc[:2]) == list(expected.iloc[:2])
+    assert with_other.index[-1] == OTHER_LABEL and with_other.sum() == len(sales)
@@ -0,0 +1,199 @@
+from collections import OrderedDict
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+
+# Rollup levels from finest to coarsest, with the NumPy datetime unit of their keys
+TIME_LEVELS = ('Minute', 'Hour', 'Day', 'Month', 'Year')
+LEVEL_UNITS = {'Minute': 'm', 'Hour': 'h', 'Day': 'D', 'Month': 'M', 'Year': 'Y'}
+# Average bucket length of each level in seconds, for suggesting a level from a time span alone
+LEVEL_SECONDS = {'Minute': 60, 'Hour': 3600, 'Day': 86400, 'Month': 2629746, 'Year': 31556952}
+# Methods a rollup answers; the median cannot be derived from bucket totals
+ROLLUP_METHODS = ('mean', 'sum', 'min', 'max', 'count')
+CACHE_SIZE = 16
+
+
+def coarser_keys(level, keys):
+    """Keys of the next level up for sorted keys of level; every mapping keeps the order."""
+    if level == 'Minute':
+        return keys // 60
+    if level == 'Hour':
+        return keys // 24
+    if level == 'Day':
+        # Months have uneven lengths, so days go through NumPy's calendar
+        return keys.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    return keys // 12  # Months since 1970-01 to years since 1970
+
+
+def suggest_level(start, end, max_points):
+    """Finest level with at most max_points buckets from start to end, judged from the span without reading the rows."""
+    if pd.isna(start) or pd.isna(end):
+        return TIME_LEVELS[-1]
+    span = (pd.Timestamp(end) - pd.Timestamp(start)).total_seconds()
+    for level in TIME_LEVELS:
+        if span / LEVEL_SECONDS[level] + 1 <= max_points:
+            return level
+    return TIME_LEVELS[-1]
+
+
+def bucket_column(values, level):
+    """Start of each value's level bucket as a new datetime column; values itself is left untouched."""
+    if getattr(values.dt, 'tz', None) is not None:
+        values = values.dt.tz_localize(None)
+    unit = LEVEL_UNITS[level]
+    buckets = values.to_numpy(dtype='datetime64[ns]').astype(f'datetime64[{unit}]').astype('datetime64[ns]')
+    return pd.Series(buckets, index=values.index, name=values.name)
+
+
+class TimeRollup:
+    """count/sum/min/max of value columns per minute, hour, day, month and year of one datetime column.
+
+    The rows are sorted by minute once, when the rollup is built. Each value
+    column's minute buckets are then reduced from that order with reduceat, and
+    every coarser level merges the buckets of the level below it, so no level
+    rescans the rows. Keys are int64 counts of the level's unit since the epoch.
+    The source column is only read, never rebucketed in place.
+    """
+
+    def __init__(self, times):
+        times = pd.Series(times)
+        if getattr(times.dt, 'tz', None) is not None:
+            times = times.dt.tz_localize(None)
+        raw = times.to_numpy(dtype='datetime64[ns]')
+        valid = ~np.isnat(raw)
+        self.rows = np.flatnonzero(valid)
+        minutes = raw[valid].astype(np.int64) // (60 * 10**9)
+        order = np.argsort(minutes, kind='stable')
+        self.rows = self.rows[order]
+        minutes = minutes[order]
+
+        # Bucket boundaries of every level, each as start offsets into the level below
+        self.keys = {}
+        self.starts = {}
+        keys = minutes
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else np.empty(0, dtype=np.int64)
+        for level in TIME_LEVELS:
+            keys = keys[starts]
+            self.keys[level] = keys
+            self.starts[level] = starts
+            parent = coarser_keys(level, keys)
+            starts = np.flatnonzero(np.concatenate(([True], parent[1:] != parent[:-1]))) if len(parent) else np.empty(0, dtype=np.int64)
+            keys = parent
+        self._stats = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def bucket_times(self, level):
+        return self.keys[level].astype(f'datetime64[{LEVEL_UNITS[level]}]').astype('datetime64[ns]')
+
+    def add_column(self, name, values):
+        """Roll up a numeric column aligned with the times; missing values are skipped like pandas does."""
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)[self.rows]
+        present = ~np.isnan(values)
+        stats = {}
+        level_stats = {'count': present.astype(np.int64), 'sum': np.where(present, values, 0.0), 'min': values, 'max': values}
+        for level in TIME_LEVELS:
+            starts = self.starts[level]
+            if len(starts):
+                level_stats = {'count': np.add.reduceat(level_stats['count'], starts),
+                               'sum': np.add.reduceat(level_stats['sum'], starts),
+                               # fmin/fmax skip NaN, so a bucket is only NaN when all its values are
+                               'min': np.fmin.reduceat(level_stats['min'], starts),
+                               'max': np.fmax.reduceat(level_stats['max'], starts)}
+            else:
+                level_stats = {key: value[:0] for key, value in level_stats.items()}
+            stats[level] = level_stats
+        self._stats[name] = stats
+        return stats
+
+    def has_column(self, name):
+        return name in self._stats
+
+    def series(self, level, name, method, start=None, end=None):
+        """(bucket start times, values) of method over column name at level, optionally between two times."""
+        if method not in ROLLUP_METHODS:
+            raise ValueError(f"Time rollups cannot compute the {method}.")
+        stats = self._stats[name][level]
+        if method == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = np.where(stats['count'] > 0, stats['sum'] / np.maximum(stats['count'], 1), np.nan)
+        else:
+            values = stats[method]
+        low, high = self.bucket_range(level, start, end)
+        return self.bucket_times(level)[low:high], values[low:high]
+
+    def bucket_range(self, level, start=None, end=None):
+        """Positions of the buckets of level that overlap [start, end]."""
+        keys = self.keys[level]
+        unit = LEVEL_UNITS[level]
+        low = 0 if start is None else np.searchsorted(keys, np.datetime64(start, 'ns').astype(f'datetime64[{unit}]').astype(np.int64), side='left')
+        high = len(keys) if end is None else np.searchsorted(keys, np.datetime64(end, 'ns').astype(f'datetime64[{unit}]').astype(np.int64), side='right')
+        return int(low), int(high)
+
+    def level_for(self, max_points, start=None, end=None):
+        """Finest level with at most max_points buckets between start and end (the coarsest when none fits)."""
+        for level in TIME_LEVELS:
+            low, high = self.bucket_range(level, start, end)
+            if high - low <= max_points:
+                return level
+        return TIME_LEVELS[-1]
+
+
+class RollupCache:
+    """Time rollups keyed by (dataset version, datetime column), least recently used dropped first."""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, data, x_col, y_cols, version=None):
+        """Rollup of data[x_col] holding every column in y_cols; memoized only when a version is given."""
+        key = (version, x_col)
+        rollup = self._entries.get(key) if version is not None else None
+        if rollup is None:
+            rollup = TimeRollup(data[x_col])
+            if version is not None:
+                self._entries[key] = rollup
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        for y_col in y_cols:
+            if not rollup.has_column(y_col):
+                rollup.add_column(y_col, data[y_col])
+        return rollup
+
+    def clear(self):
+        self._entries.clear()
+
+
+def follow_zoom(ax, line, rollup, name, method, level, max_points):
+    """Redraw line from a finer level when zooming in leaves too few buckets of level in view.
+
+    The full view keeps the chosen level. Zoomed in, the line switches to the
+    coarsest level at or below it that shows as many buckets as the full view
+    did, without going over max_points.
+    """
+    base = TIME_LEVELS.index(level)
+    low, high = rollup.bucket_range(level)
+    wanted = min(high - low, max_points)
+
+    def on_xlim_changed(axes):
+        try:
+            start, end = (pd.Timestamp(mdates.num2date(value)).tz_localize(None) for value in axes.get_xlim())
+        except (ValueError, OverflowError):  # Panned past the dates NumPy can represent
+            return
+        shown = level
+        for finer in reversed(TIME_LEVELS[:base + 1]):
+            low, high = rollup.bucket_range(finer, start, end)
+            if high - low > max_points:
+                break
+            shown = finer
+            if high - low >= wanted:
+                break
+        line.set_data(*rollup.series(shown, name, method, start, end))
+        axes.figure.canvas.draw_idle()
+
+    return ax.callbacks.connect('xlim_changed', on_xlim_changed)
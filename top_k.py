@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# Label of the bucket holding every category outside the top K
+OTHER_LABEL = "Other"
+
+
+def top_positions(values, k, largest=True):
+    """Positions of the k largest (or smallest) values, best first, without sorting all of them.
+
+    Like nlargest/nsmallest(keep='first') over the non-NaN values: NaNs are never
+    picked, so fewer than k positions come back when there are fewer numbers, and
+    equal values keep their order, also across the k-th place.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    candidates = np.flatnonzero(~np.isnan(values))
+    keys = -values[candidates] if largest else values[candidates]
+    if k <= 0:
+        return candidates[:0]
+    if k < len(candidates):
+        # argpartition finds the k-th key; everything at least as good is a candidate, then ties are cut by position
+        kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+        within = keys <= kth
+        candidates, keys = candidates[within], keys[within]
+    return candidates[np.argsort(keys, kind='stable')[:k]]
+
+
+def top_rows(frame, column, k, largest=True):
+    """Rows of frame with the k largest (or smallest) values of column, like frame.nlargest(k, column)."""
+    return frame.iloc[top_positions(frame[column].to_numpy(dtype=np.float64, na_value=np.nan), k, largest)]
+
+
+class CategoryCounts:
+    """Row count of every category of one column, kept as integer codes rather than values.
+
+    Counts come from one np.bincount over the codes, top(k) picks categories with
+    argpartition instead of sorting every count, and mask() filters rows through a
+    lookup table indexed by code instead of comparing values with isin. Missing
+    values have code -1 and are never counted or kept.
+    """
+
+    def __init__(self, codes, uniques):
+        self.codes = codes
+        self.uniques = pd.Index(uniques)
+        self.counts = np.bincount(codes[codes >= 0], minlength=len(self.uniques))
+
+    @classmethod
+    def from_values(cls, values):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        return cls(codes, uniques)
+
+    @property
+    def nunique(self):
+        """Categories that occur at least once; codes shared with a larger dataset may have none."""
+        return int(np.count_nonzero(self.counts))
+
+    def top(self, k):
+        """Codes of the k most frequent categories, most frequent first."""
+        codes = top_positions(self.counts, k)
+        return codes[self.counts[codes] > 0]
+
+    def mask(self, codes):
+        """Boolean row mask of the rows whose category is one of codes."""
+        lookup = np.zeros(len(self.uniques) + 1, dtype=bool)  # The trailing slot is read by code -1
+        lookup[codes] = True
+        return lookup[self.codes]
+
+    def with_other(self, k, label=OTHER_LABEL):
+        """Counts of the k most frequent categories, plus one `label` entry for the rest when there is any."""
+        top = self.top(k)
+        labels = list(self.uniques.take(top))
+        counts = self.counts[top]
+        rest = int(self.counts.sum() - counts.sum())
+        if rest:
+            labels.append(label)
+            counts = np.append(counts, rest)
+        return pd.Series(counts, index=pd.Index(labels, dtype=object), name='count')